@@ -31,6 +31,8 @@ from src.bot.core.bot_setup import BotSetup
 from src.bot.core.cog_manager import CogManager
 from src.bot.core.database import DatabaseManager
 from src.bot.core.dashboard import DashboardTask
+from src.bot.core.settings_cache import GuildSettingsCache
+from src.bot.core.db_executor import DatabaseExecutor
 from src.bot.core.utils import print_logo
 
 # API Routes für Dashboard
@@ -107,6 +109,15 @@ if __name__ == '__main__':
     else:
         logger.success("DATABASE", "Datenbank erfolgreich initialisiert")
     
+    # Settings-Cache für die on_message Hot-Paths
+    bot.guild_cache = GuildSettingsCache(
+        ttl=bot.config['settings_cache_ttl'],
+        max_guilds=bot.config['settings_cache_max_guilds']
+    )
+    
+    # Thread-Pool für blockierende SQLite-Aufrufe der Cogs
+    bot.db_executor = DatabaseExecutor(max_workers=bot.config['db_executor_workers'])
+    
     # Dashboard-Task registrieren
     dashboard = DashboardTask(bot, BASEDIR)
     dashboard.register()
@@ -174,4 +185,12 @@ if __name__ == '__main__':
         sys.exit(1)
     except Exception as e:
         logger.critical("BOT", f"Bot-Start fehlgeschlagen: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+    finally:
+        # Cogs entladen, damit gepufferte Daten (z.B. XP) geschrieben werden
+        for extension in list(bot.extensions):
+            try:
+                bot.unload_extension(extension)
+            except Exception as e:
+                logger.error("BOT", f"Fehler beim Entladen von {extension}: {e}")
+        bot.db_executor.shutdown()
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+ManagerX - ContentScanner Regression Check
+==========================================
+
+Prüft die Kategorien, die der GlobalChat-ContentScanner meldet. Ohne
+Test-Suite im Repo als eigenständiges Skript aus dem Projekt-Root:
+
+    python scripts/check_content_scanner.py
+
+Pfad: scripts/check_content_scanner.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.bot.cogs.guild.globalchat import ContentScanner, GlobalChatConfig  # noqa: E402
+
+GUILD_ID = 1
+
+# (Text, eigene Filterwörter, erwartete Kategorien)
+CASES = [
+    ("hallo zusammen", None, set()),
+    ("komm auf discord.gg/abc123", None, {'invite'}),
+    ("schau https://example.com", None, {'url'}),
+    ("this is porn stuff", None, {'nsfw'}),
+    ("das ist spam", "porn,spam", {'custom'}),
+    # Filterwort, das auch NSFW-Keyword ist: muss als eigenes Wort UND als NSFW zählen,
+    # sonst rutscht es bei nsfw_filter=False und filter_enabled=True durch
+    ("this is porn stuff", "porn,spam", {'custom', 'nsfw'}),
+    ("THIS IS PORN", "Porn", {'custom', 'nsfw'}),
+    ("nsfw und spam", "spam", {'custom', 'nsfw'}),
+    ("spammer ist kein treffer", "spam", set()),
+    # Invite verbraucht den Text dahinter: NSFW muss trotzdem erkannt werden
+    ("discord.gg/porn", None, {'invite', 'nsfw'}),
+    ("join discord.gg/porn now", "spam", {'invite', 'nsfw'}),
+    ("https://porn.example", None, {'url', 'nsfw'}),
+]
+
+
+def main() -> int:
+    scanner = ContentScanner(GlobalChatConfig())
+    failures = 0
+
+    for content, custom_words, expected in CASES:
+        hits = scanner.scan(content, GUILD_ID, custom_words)
+        if hits != expected:
+            failures += 1
+            print(f"FAIL scan({content!r}, {custom_words!r}) = {sorted(hits)}, erwartet {sorted(expected)}")
+
+    print(f"{len(CASES) - failures}/{len(CASES)} Fälle OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
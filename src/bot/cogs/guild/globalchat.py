@@ -2,19 +2,36 @@
 import discord
 from discord.ext import commands, tasks
 from discord import slash_command, Option, SlashCommandGroup
-from DevTools.backend.database.globalchat_db import GlobalChatDatabase, db
+from DevTools.backend.database.globalchat_db import GlobalChatDatabase, db, DB_PATH
 import asyncio
+import bisect
+from abc import ABC, abstractmethod
+import heapq
 import logging
+import random
 import re
+import sqlite3
+import struct
 import time
-from typing import List, Optional, Dict, Tuple
+import uuid
+from typing import Callable, List, Optional, Dict, Tuple
 import aiohttp
 import io
 import json
+import os
+import tempfile
 from datetime import datetime, timedelta
 import ezcord
-from collections import defaultdict
+from array import array
+from collections import OrderedDict, defaultdict, deque
 from discord.ui import Container
+from src.bot.core.settings_cache import get_guild_cache
+from src.bot.core.db_executor import DatabaseExecutor, get_db_executor
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
 
 # Logger konfigurieren
 logger = logging.getLogger(__name__)
@@ -38,6 +55,41 @@ class GlobalChatConfig:
     ALLOWED_AUDIO_FORMATS = ['mp3', 'wav', 'ogg', 'm4a', 'flac']
     ALLOWED_DOCUMENT_FORMATS = ['pdf', 'txt', 'doc', 'docx', 'xls', 'xlsx', 'ppt', 'pptx', 'zip', 'rar', '7z']
     
+    # Fan-out (Zustellung an alle verbundenen Channels)
+    FANOUT_CONCURRENCY = 20  # Gleichzeitige Sende-Requests (bot-weit)
+    FANOUT_MAX_PER_SECOND = 40  # Unter Discords globalem Limit von 50 Requests/s
+    FANOUT_MAX_RETRIES = 3
+    FANOUT_BACKOFF_BASE = 1.0  # Sekunden, exponentiell mit Jitter
+    USE_WEBHOOKS = False  # Pro Channel einen gecachten Webhook nutzen (benötigt "Webhooks verwalten")
+    WEBHOOK_NAME = 'ManagerX GlobalChat'
+    WEBHOOK_RETRY_SECONDS = 3600  # Channels ohne Webhook-Rechte erst nach 1h erneut prüfen
+
+    # Attachment-Relay (große Dateien nur einmal hochladen, danach nur die URL verteilen)
+    DIRECT_UPLOAD_MAX_MB = 2  # Bis zu dieser Größe wird in jeden Channel direkt hochgeladen
+    RELAY_CHANNEL_ID: Optional[int] = None  # Relay-Channel für Dateien, deren Original gelöscht wird
+
+    # Downloads (parallel, gestreamt, mit globalem Speicherbudget)
+    DOWNLOAD_CONCURRENCY = 4
+    DOWNLOAD_MEMORY_BUDGET_MB = 64  # Summe aller Anhänge im RAM, darüber wird gespoolt
+    IN_MEMORY_MAX_MB = 4  # Größere Dateien immer in eine Temp-Datei spoolen
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+    
+    # Relay-Map (Original -> Kopien, für Edit/Delete-Weitergabe)
+    RELAY_MAP_CAPACITY = 250_000  # Kopien im Ringpuffer (~4 MB)
+    RELAY_MAP_HORIZON_HOURS = 24  # Ältere Nachrichten werden nicht mehr bearbeitet/gelöscht
+    RELAY_MAP_PATH: Optional[str] = None  # z.B. 'data/globalchat_relay_map.bin' für Persistenz
+
+    # Embed-Rendering
+    AUTHOR_CACHE_SIZE = 2048  # Vorgerenderte Author-Blöcke (LRU)
+    AUTHOR_CACHE_TTL = 300  # Sekunden
+
+    # Channel-Registry
+    REGISTRY_RESYNC_MINUTES = 10  # Abgleich mit der Datenbank im Hintergrund
+
+    # Broker für mehrere Bot-Prozesse (Sharding). None = alles in diesem Prozess
+    BROKER_URL: Optional[str] = os.getenv('GLOBALCHAT_BROKER_URL')  # z.B. 'redis://localhost:6379/0'
+    BROKER_CHANNEL = 'managerx:globalchat'
+
     # Bot Owner IDs
     BOT_OWNERS = [1093555256689959005, 1427994077332373554]
     
@@ -132,30 +184,239 @@ class MediaHandler:
         return f"{size_bytes:.1f} GB"
 
 
+class ContentScanner:
+    """Kompilierter Multi-Pattern-Scanner für Nachrichteninhalte
+
+    Invites, Links und eigene Filterwörter eines Servers werden in EINEM
+    Regex mit benannten Gruppen kombiniert und in einem Durchlauf geprüft.
+    NSFW-Wörter haben ein eigenes Pattern, da ein Treffer einer anderen
+    Gruppe (z.B. ``discord.gg/porn``) den Text sonst verdecken würde. Wortlisten werden als Trie-Regex kompiliert (gemeinsame Präfixe)
+    und der Text einmal kleingeschrieben statt mit re.IGNORECASE gesucht -
+    dadurch bleibt der Aufwand auch bei tausenden Wörtern flach.
+    Neu kompiliert wird nur, wenn sich eine Wortliste ändert.
+    """
+
+    MAX_GUILD_PATTERNS = 1000
+    MAX_WORD_LENGTH = 64
+
+    def __init__(self, config: GlobalChatConfig):
+        self.config = config
+        self._base_parts: List[str] = []
+        self._nsfw_pattern: Optional[re.Pattern] = None
+        self._base_pattern: Optional[re.Pattern] = None
+        # guild_id -> (Wortliste wie aus den Settings, kombiniertes Pattern)
+        self._guild_patterns: "OrderedDict[int, Tuple[object, re.Pattern]]" = OrderedDict()
+        self.rebuild()
+
+    def rebuild(self, nsfw_keywords: Optional[List[str]] = None):
+        """Kompiliert das Basis-Pattern neu (z.B. nach Änderung der NSFW-Liste)"""
+        if nsfw_keywords is not None:
+            self.config.NSFW_KEYWORDS = list(nsfw_keywords)
+
+        # Gescannt wird kleingeschriebener Text, (?i) wird daher nicht gebraucht
+        invite = self.config.DISCORD_INVITE_PATTERN.replace('(?i)', '')
+        self._base_parts = [
+            f"(?P<invite>{invite})",
+            # Nur das Schema markiert einen Link, damit der Rest der URL weiter gescannt wird
+            r"(?P<url>\bhttps?://)",
+        ]
+        nsfw = self._word_alternation(self.config.NSFW_KEYWORDS)
+        self._nsfw_pattern = re.compile(nsfw) if nsfw else None
+
+        self._base_pattern = re.compile('|'.join(self._base_parts))
+        self._guild_patterns.clear()
+
+    def scan(self, content: str, guild_id: Optional[int] = None, custom_words=None) -> set:
+        """Scannt einen Text in einem Durchlauf
+
+        Args:
+            content: Nachrichteninhalt
+            guild_id: Server, dessen eigene Filterwörter greifen
+            custom_words: Wortliste des Servers (kommagetrennter String oder Liste)
+
+        Returns:
+            set: Gefundene Kategorien aus ``invite``, ``url``, ``nsfw``, ``custom``
+        """
+        if not content:
+            return set()
+
+        text = content.lower()
+        pattern = self._pattern_for(guild_id, custom_words)
+        hits = {match.lastgroup for match in pattern.finditer(text)}
+        # Unabhängig von Invite-/Custom-Treffern, die Text verbrauchen
+        if self._nsfw_pattern is not None and self._nsfw_pattern.search(text):
+            hits.add('nsfw')
+        return hits
+
+    def _pattern_for(self, guild_id: Optional[int], custom_words) -> re.Pattern:
+        if guild_id is None or not custom_words:
+            return self._base_pattern
+
+        # Vergleich mit der Rohliste, damit pro Nachricht nichts normalisiert wird
+        raw_key = custom_words if isinstance(custom_words, str) else tuple(custom_words)
+        cached = self._guild_patterns.get(guild_id)
+        if cached is not None and cached[0] == raw_key:
+            self._guild_patterns.move_to_end(guild_id)
+            return cached[1]
+
+        # Wortliste neu oder geändert: einmal kompilieren und cachen
+        alternation = self._word_alternation(custom_words)
+        if alternation:
+            pattern = re.compile('|'.join(self._base_parts + [f"(?P<custom>{alternation})"]))
+        else:
+            pattern = self._base_pattern
+        self._guild_patterns[guild_id] = (raw_key, pattern)
+        self._guild_patterns.move_to_end(guild_id)
+        while len(self._guild_patterns) > self.MAX_GUILD_PATTERNS:
+            self._guild_patterns.popitem(last=False)
+        return pattern
+
+    def invalidate(self, guild_id: int):
+        """Verwirft das kompilierte Pattern eines Servers"""
+        self._guild_patterns.pop(guild_id, None)
+
+    @classmethod
+    def normalize_words(cls, words) -> Tuple[str, ...]:
+        """Normalisiert eine Wortliste (String mit Kommas oder Liste) zu einem sortierten Tupel"""
+        if not words:
+            return ()
+        if isinstance(words, str):
+            words = words.split(',')
+        normalized = {word.strip().lower() for word in words}
+        return tuple(sorted(word for word in normalized if word and len(word) <= cls.MAX_WORD_LENGTH))
+
+    @classmethod
+    def _word_alternation(cls, words) -> str:
+        """Baut aus einer Wortliste einen Trie-Regex mit Wortgrenzen"""
+        trie: Dict[str, dict] = {}
+        for word in cls.normalize_words(words):
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def build(node: dict) -> str:
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            group = branches[0] if len(branches) == 1 and '' not in node else f"(?:{'|'.join(branches)})"
+            # Wortende im Knoten: längere Fortsetzung ist optional
+            return group + '?' if '' in node else group
+
+        body = build(trie)
+        if not body:
+            return ''
+        # \b versagt bei Wörtern, die mit Sonderzeichen beginnen/enden
+        return rf"(?<!\w)(?:{body})(?!\w)"
+
+
+class GlobalChatBlacklist:
+    """In-Memory Blacklist für User und Server
+
+    Gebannte IDs liegen pro Typ in einem Set, zeitlich begrenzte Bans
+    zusätzlich in einem Min-Heap nach Ablaufzeit. Abgelaufene Einträge
+    werden beim nächsten Zugriff exakt entfernt (kein 12h-Sweep).
+    Ban/Unban aktualisieren die Sets direkt, die DB wird nur beim Start gelesen.
+    """
+
+    ENTITY_TYPES = ('user', 'guild')
+
+    def __init__(self, executor: DatabaseExecutor):
+        self.executor = executor
+        self._banned: Dict[str, set] = {entity_type: set() for entity_type in self.ENTITY_TYPES}
+        # (entity_type, entity_id) -> Ablauf als Unix-Timestamp
+        self._expires: Dict[Tuple[str, int], float] = {}
+        self._heap: List[Tuple[float, str, int]] = []
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    async def ensure_loaded(self):
+        """Lädt die Blacklist beim ersten Zugriff aus der Datenbank"""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                rows = await self.executor.run(db.get_blacklist)
+            except Exception as e:
+                logger.error(f"❌ Fehler beim Laden der Blacklist: {e}", exc_info=True)
+                return
+
+            for row in rows:
+                if row.get('is_permanent'):
+                    self.add(row['entity_type'], row['entity_id'])
+                elif row.get('expires_at'):
+                    self.add(row['entity_type'], row['entity_id'], self._parse_datetime(row['expires_at']))
+            self._loaded = True
+            logger.info(f"🛡️ GlobalChat: Blacklist geladen ({len(self._banned['user'])} User, {len(self._banned['guild'])} Server)")
+
+    def is_banned(self, entity_type: str, entity_id: int) -> bool:
+        """Prüft einen Ban in O(1); abgelaufene Bans werden vorher entfernt"""
+        if self._heap and self._heap[0][0] <= time.time():
+            self._expire()
+        return entity_id in self._banned[entity_type]
+
+    def add(self, entity_type: str, entity_id: int, expires_at: Optional[datetime] = None):
+        """Trägt einen Ban ein (``expires_at=None`` = permanent)"""
+        key = (entity_type, entity_id)
+        self._banned[entity_type].add(entity_id)
+        if expires_at is None:
+            self._expires.pop(key, None)
+            return
+        expires_ts = expires_at.timestamp()
+        self._expires[key] = expires_ts
+        heapq.heappush(self._heap, (expires_ts, entity_type, entity_id))
+
+    def remove(self, entity_type: str, entity_id: int):
+        """Entfernt einen Ban (der Heap-Eintrag verfällt beim nächsten Ablauf)"""
+        self._banned[entity_type].discard(entity_id)
+        self._expires.pop((entity_type, entity_id), None)
+
+    def get_counts(self) -> Tuple[int, int]:
+        """Anzahl gebannter User und Server"""
+        self._expire()
+        return len(self._banned['user']), len(self._banned['guild'])
+
+    def _expire(self):
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            expires_ts, entity_type, entity_id = heapq.heappop(self._heap)
+            key = (entity_type, entity_id)
+            # Nur entfernen, wenn der Ban nicht verlängert/aufgehoben wurde
+            if self._expires.get(key) == expires_ts:
+                del self._expires[key]
+                self._banned[entity_type].discard(entity_id)
+
+    @staticmethod
+    def _parse_datetime(value) -> datetime:
+        if isinstance(value, datetime):
+            return value
+        return datetime.fromisoformat(str(value))
+
+
 class MessageValidator:
     """Validiert und filtert Nachrichten"""
     
-    def __init__(self, config: GlobalChatConfig):
+    def __init__(self, config: GlobalChatConfig, executor: DatabaseExecutor, blacklist: GlobalChatBlacklist):
         self.config = config
+        self.executor = executor
+        self.blacklist = blacklist
         self.media_handler = MediaHandler(config)
-        self._compile_patterns()
+        self.scanner = ContentScanner(config)
     
-    def _compile_patterns(self):
-        """Kompiliert Regex-Patterns für bessere Performance"""
-        self.invite_pattern = re.compile(self.config.DISCORD_INVITE_PATTERN)
-        self.url_pattern = re.compile(self.config.URL_PATTERN)
-    
-    def validate_message(self, message: discord.Message, settings: Dict) -> Tuple[bool, str]:
+    async def validate_message(self, message: discord.Message, settings: Dict) -> Tuple[bool, str]:
         """Hauptvalidierung für Nachrichten"""
         # Bot-Nachrichten ignorieren
         if message.author.bot:
             return False, "Bot-Nachricht"
         
-        # Blacklist prüfen
-        if db.is_blacklisted('user', message.author.id):
+        # Blacklist prüfen (In-Memory)
+        await self.blacklist.ensure_loaded()
+        if self.blacklist.is_banned('user', message.author.id):
             return False, "User auf Blacklist"
         
-        if db.is_blacklisted('guild', message.guild.id):
+        if self.blacklist.is_banned('guild', message.guild.id):
             return False, "Guild auf Blacklist"
         
         # Leere Nachrichten (ohne Text UND ohne Anhänge/Sticker)
@@ -180,44 +441,41 @@ class MessageValidator:
             if not valid:
                 return False, f"Ungültige Anhänge: {reason}"
         
-        # Content Filter
-        if settings.get('filter_enabled', True):
-            is_filtered, filter_reason = self.check_filtered_content(message.content)
-            if is_filtered:
-                return False, f"Gefilterte Inhalte: {filter_reason}"
-        
-        # NSFW Filter
-        if settings.get('nsfw_filter', True):
-            if self.check_nsfw_content(message.content):
+        # Content- und NSFW-Filter in einem Durchlauf
+        filter_enabled = settings.get('filter_enabled', True)
+        nsfw_filter = settings.get('nsfw_filter', True)
+        if message.content and (filter_enabled or nsfw_filter):
+            hits = self.scanner.scan(
+                message.content,
+                message.guild.id,
+                settings.get('filter_words') if filter_enabled else None
+            )
+            if filter_enabled:
+                is_filtered, filter_reason = self._filter_reason(hits)
+                if is_filtered:
+                    return False, f"Gefilterte Inhalte: {filter_reason}"
+            if nsfw_filter and 'nsfw' in hits:
                 return False, "NSFW Inhalt erkannt"
         
         return True, "OK"
     
     def check_filtered_content(self, content: str) -> Tuple[bool, str]:
         """Prüft auf gefilterte Inhalte mit detailliertem Grund"""
-        if not content:
-            return False, ""
-        
-        # Discord Invites
-        if self.invite_pattern.search(content):
-            return True, "Discord Invite"
-        
-        return False, ""
+        return self._filter_reason(self.scanner.scan(content))
     
     def check_nsfw_content(self, content: str) -> bool:
         """Erweiterte NSFW-Erkennung"""
-        if not content:
-            return False
-        
-        content_lower = content.lower()
-        
-        # Keyword-Check mit Wortgrenzen
-        for keyword in self.config.NSFW_KEYWORDS:
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            if re.search(pattern, content_lower):
-                return True
-        
-        return False
+        return 'nsfw' in self.scanner.scan(content)
+
+    @staticmethod
+    def _filter_reason(hits: set) -> Tuple[bool, str]:
+        # Discord Invites
+        if 'invite' in hits:
+            return True, "Discord Invite"
+        # Eigene Filterwörter des Servers
+        if 'custom' in hits:
+            return True, "Gefiltertes Wort"
+        return False, ""
     
     def clean_content(self, content: str) -> str:
         """Bereinigt Nachrichteninhalt"""
@@ -234,28 +492,194 @@ class MessageValidator:
         return content
 
 
+class AttachmentBuffer:
+    """Heruntergeladener Anhang - im Speicher oder als Temp-Datei gespoolt
+
+    ``open()`` liefert für jeden Sendevorgang einen eigenen, frischen Stream:
+    im Speicher ein BytesIO (teilt sich den Puffer, keine Kopie), auf Disk
+    ein eigenes Datei-Handle, aus dem aiohttp beim Upload streamt.
+    """
+
+    __slots__ = ('size', '_data', '_path', '_budget')
+
+    def __init__(self, size: int, data: Optional[bytes] = None, path: Optional[str] = None,
+                 budget: Optional['DownloadBudget'] = None):
+        self.size = size
+        self._data = data
+        self._path = path
+        self._budget = budget
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def spooled(self) -> bool:
+        return self._path is not None
+
+    def open(self) -> io.BufferedIOBase:
+        """Öffnet einen neuen Lese-Stream (wird von discord.File nach dem Senden geschlossen)"""
+        if self._path is not None:
+            return open(self._path, 'rb')
+        if self._data is None:
+            raise ValueError("AttachmentBuffer wurde bereits geschlossen")
+        return io.BytesIO(self._data)
+
+    def close(self):
+        """Gibt Speicherbudget bzw. Temp-Datei frei (mehrfacher Aufruf ist erlaubt)"""
+        if self._data is not None:
+            self._data = None
+            if self._budget is not None:
+                self._budget.release(self.size)
+                self._budget = None
+        if self._path is not None:
+            try:
+                os.unlink(self._path)
+            except OSError:
+                pass
+            self._path = None
+
+
+class DownloadBudget:
+    """Bot-weites Speicherbudget für Anhänge im RAM (in Bytes)"""
+
+    def __init__(self, limit_bytes: int):
+        self.limit = limit_bytes
+        self.used = 0
+
+    def try_reserve(self, size: int) -> bool:
+        """Reserviert ``size`` Bytes, falls das Budget reicht"""
+        if self.used + size > self.limit:
+            return False
+        self.used += size
+        return True
+
+    def release(self, size: int):
+        self.used = max(0, self.used - size)
+
+
+class AttachmentDownloader:
+    """Lädt Anhänge parallel, gestreamt und größenbegrenzt herunter
+
+    Kleine Dateien bleiben im Speicher, solange das globale Budget reicht.
+    Alles andere wird in Chunks in eine Temp-Datei geschrieben, so dass nie
+    eine komplette große Datei im RAM liegt.
+    """
+
+    def __init__(self, config: GlobalChatConfig):
+        self.config = config
+        self.budget = DownloadBudget(config.DOWNLOAD_MEMORY_BUDGET_MB * 1024 * 1024)
+        self._semaphore = asyncio.Semaphore(config.DOWNLOAD_CONCURRENCY)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._stats = {
+            'in_memory': 0,
+            'spooled': 0,
+            'failed': 0,
+        }
+
+    async def fetch_all(self, attachments: List[discord.Attachment]) -> List[Tuple[str, AttachmentBuffer, str]]:
+        """Lädt alle Anhänge parallel herunter; fehlgeschlagene werden ausgelassen"""
+        results = await asyncio.gather(
+            *(self.fetch(attachment) for attachment in attachments),
+            return_exceptions=True
+        )
+
+        downloaded: List[Tuple[str, AttachmentBuffer, str]] = []
+        for attachment, result in zip(attachments, results):
+            if isinstance(result, BaseException):
+                self._stats['failed'] += 1
+                logger.error(f"❌ Fehler beim Herunterladen von {attachment.filename}: {result}")
+                continue
+            downloaded.append((attachment.filename, result, attachment.content_type or ''))
+        return downloaded
+
+    async def fetch(self, attachment: discord.Attachment) -> AttachmentBuffer:
+        """Lädt einen Anhang in den Speicher oder spoolt ihn auf Disk"""
+        max_bytes = self.config.MAX_FILE_SIZE_MB * 1024 * 1024
+        if attachment.size > max_bytes:
+            raise ValueError(f"Datei ist größer als {self.config.MAX_FILE_SIZE_MB}MB")
+
+        async with self._semaphore:
+            in_memory_max = self.config.IN_MEMORY_MAX_MB * 1024 * 1024
+            if attachment.size <= in_memory_max and self.budget.try_reserve(attachment.size):
+                try:
+                    data = await attachment.read()
+                except BaseException:
+                    self.budget.release(attachment.size)
+                    raise
+                self._stats['in_memory'] += 1
+                return AttachmentBuffer(attachment.size, data=data, budget=self.budget)
+
+            buffer = await self._spool(attachment.url, max_bytes)
+            self._stats['spooled'] += 1
+            return buffer
+
+    async def _spool(self, url: str, max_bytes: int) -> AttachmentBuffer:
+        """Streamt eine Datei chunkweise in eine Temp-Datei"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=120))
+
+        fd, path = tempfile.mkstemp(prefix='mx-globalchat-')
+        size = 0
+        try:
+            with os.fdopen(fd, 'wb') as spool:
+                async with self._session.get(url) as response:
+                    response.raise_for_status()
+                    async for chunk in response.content.iter_chunked(self.config.DOWNLOAD_CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > max_bytes:
+                            raise ValueError(f"Datei ist größer als {self.config.MAX_FILE_SIZE_MB}MB")
+                        # Kleine Chunks in den Page-Cache, blockiert den Loop nicht spürbar
+                        spool.write(chunk)
+        except BaseException:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            raise
+        return AttachmentBuffer(size, path=path)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def get_stats(self) -> dict:
+        return {
+            **self._stats,
+            'memory_used_mb': self.budget.used / (1024 * 1024),
+            'memory_budget_mb': self.budget.limit / (1024 * 1024),
+        }
+
+
 class EmbedBuilder:
     """Erstellt formatierte Embeds für GlobalChat mit vollständigem Medien-Support"""
+
+    # Vorlagen für das Embed-Dict (Embed.from_dict statt einzelner set_*-Aufrufe)
+    FOOTER_TEMPLATE = "📍 {guild} • #{channel} • ID:{message_id}"
+    ROLE_MENTION_PATTERN = re.compile(r'<@&(\d+)>')
     
     def __init__(self, config: GlobalChatConfig, bot=None):
         self.config = config
         self.media_handler = MediaHandler(config)
         self.bot = bot  # Bot für Message-Fetching
+
+        # (guild, member, Name, Rollen-Hash, Avatar-Hash) -> (Author-Block, erstellt um)
+        self._author_cache: "OrderedDict[tuple, Tuple[Dict[str, str], float]]" = OrderedDict()
+        self._color_cache: Dict[str, int] = {}
+        self._author_stats = {'hits': 0, 'misses': 0}
     
-    async def create_message_embed(self, message: discord.Message, settings: Dict, attachment_data: List[Tuple[str, bytes, str]] = None) -> Tuple[discord.Embed, List[Tuple[str, bytes]]]:
+    async def create_message_embed(self, message: discord.Message, settings: Dict, attachment_data: List[Tuple[str, 'AttachmentBuffer', str]] = None,
+                                   linked_attachments: List[Tuple[str, str, str, int]] = None) -> Tuple[discord.Embed, List[Tuple[str, 'AttachmentBuffer']]]:
         """Erstellt ein verbessertes Embed mit vollständigem Medien-Support
         
-        attachment_data: Liste von (filename, bytes, content_type) - schon heruntergeladene Dateien
-        Gibt (embed, [(filename, bytes), ...]) zurück - Bytes statt discord.File!
+        attachment_data: Liste von (filename, AttachmentBuffer, content_type) - schon heruntergeladene Dateien
+        linked_attachments: Liste von (filename, url, content_type, size) - nur verlinkt (CDN/Relay)
+        Gibt (embed, [(filename, AttachmentBuffer), ...]) zurück - Puffer statt discord.File!
         """
         if attachment_data is None:
             attachment_data = []
         
         content = self._clean_content(message.content)
         
-        # Embed-Farbe
-        embed_color = self._parse_color(settings.get('embed_color', self.config.DEFAULT_EMBED_COLOR))
-        
         # Beschreibung
         if content:
             description = content
@@ -263,27 +687,27 @@ class EmbedBuilder:
             description = "*Medien-Nachricht*"
         else:
             description = "*Keine Beschreibung*"
-        
-        # Embed erstellen
-        embed = discord.Embed(
-            description=description,
-            color=embed_color,
-            timestamp=message.created_at
-        )
-        
-        # Author mit Badges
-        author_text, badges = self._build_author_info(message.author)
-        embed.set_author(
-            name=author_text,
-            icon_url=message.author.display_avatar.url
-        )
-        
+
         # Footer mit Server-Info UND Original-Message-ID (für Reply-Tracking)
-        footer_text = f"📍 {message.guild.name} • #{message.channel.name} • ID:{message.id}"
-        embed.set_footer(
-            text=footer_text,
-            icon_url=message.guild.icon.url if message.guild.icon else None
-        )
+        footer = {
+            'text': self.FOOTER_TEMPLATE.format(
+                guild=message.guild.name,
+                channel=message.channel.name,
+                message_id=message.id
+            )
+        }
+        if message.guild.icon:
+            footer['icon_url'] = message.guild.icon.url
+
+        # Embed aus Vorlage + gecachtem Author-Block (mit Badges) zusammensetzen
+        embed = discord.Embed.from_dict({
+            'type': 'rich',
+            'description': description,
+            'color': self._color_value(settings.get('embed_color', self.config.DEFAULT_EMBED_COLOR)),
+            'timestamp': message.created_at.isoformat(),
+            'author': dict(self.get_author_block(message.author)),
+            'footer': footer,
+        })
         
         # Reply-Kontext hinzufügen (robust, ohne invasive Änderungen)
         if message.reference:
@@ -371,26 +795,32 @@ class EmbedBuilder:
                 pass
         
         # Medien verarbeiten mit heruntergeladenen Dateien
-        files_to_upload = await self._process_media(embed, message, attachment_data)
+        files_to_upload = await self._process_media(embed, message, attachment_data, linked_attachments)
 
         # Rückgabe: Embed + Liste von discord.File Objekten
         return embed, files_to_upload
     
-    async def _process_media(self, embed: discord.Embed, message: discord.Message, attachment_data: List[Tuple[str, bytes, str]] = None) -> List[Tuple[str, bytes]]:
+    async def _process_media(self, embed: discord.Embed, message: discord.Message, attachment_data: List[Tuple[str, 'AttachmentBuffer', str]] = None,
+                             linked_attachments: List[Tuple[str, str, str, int]] = None) -> List[Tuple[str, 'AttachmentBuffer']]:
         """Verarbeitet alle Medien-Typen mit heruntergeladenen Anhängen
         
-        attachment_data: Liste von (filename, bytes, content_type) - bereits heruntergeladen
-        Gibt Liste von (filename, bytes) zurück - NOT discord.File!
+        attachment_data: Liste von (filename, AttachmentBuffer, content_type) - bereits heruntergeladen
+        linked_attachments: Liste von (filename, url, content_type, size) - werden nur verlinkt
+        Gibt Liste von (filename, AttachmentBuffer) zurück - NOT discord.File!
         """
         if attachment_data is None:
             attachment_data = []
         
-        attachment_bytes: List[Tuple[str, bytes]] = []
+        attachment_bytes: List[Tuple[str, 'AttachmentBuffer']] = []
 
         # === HERUNTERGELADENE ATTACHMENTS ===
         if attachment_data:
             attachment_bytes.extend(self._process_downloaded_attachments(embed, attachment_data))
 
+        # === VERLINKTE ATTACHMENTS (CDN/Relay) ===
+        if linked_attachments:
+            self._process_linked_attachments(embed, linked_attachments)
+
         # === STICKERS ===
         if message.stickers:
             self._process_stickers(embed, message.stickers)
@@ -401,13 +831,13 @@ class EmbedBuilder:
 
         return attachment_bytes
     
-    def _process_downloaded_attachments(self, embed: discord.Embed, attachment_data: List[Tuple[str, bytes, str]]) -> List[Tuple[str, bytes]]:
-        """Verarbeitet heruntergeladene Anhänge und gibt (filename, bytes) zurück
+    def _process_downloaded_attachments(self, embed: discord.Embed, attachment_data: List[Tuple[str, 'AttachmentBuffer', str]]) -> List[Tuple[str, 'AttachmentBuffer']]:
+        """Verarbeitet heruntergeladene Anhänge und gibt (filename, AttachmentBuffer) zurück
         
-        attachment_data: [(filename, bytes_data, content_type), ...]
-        Gibt [(filename, bytes), ...] zurück - NICHT discord.File!
+        attachment_data: [(filename, buffer, content_type), ...]
+        Gibt [(filename, buffer), ...] zurück - NICHT discord.File!
         """
-        attachment_bytes: List[Tuple[str, bytes]] = []
+        attachment_bytes: List[Tuple[str, 'AttachmentBuffer']] = []
         
         # Kategorisiere nach Typ
         images = []
@@ -511,8 +941,39 @@ class EmbedBuilder:
                     inline=False
                 )
                 
-        return attachment_bytes # Wichtig: bytes zurückgeben
+        return attachment_bytes # Wichtig: Puffer zurückgeben
     
+    def _process_linked_attachments(self, embed: discord.Embed, linked_attachments: List[Tuple[str, str, str, int]]):
+        """Verlinkt Anhänge, die nicht in jeden Channel hochgeladen werden
+
+        linked_attachments: [(filename, url, content_type, size), ...]
+        """
+        lines = []
+        for filename, url, content_type, size in linked_attachments:
+            category = self._get_attachment_category(filename, content_type)
+
+            # Erstes Bild anzeigen, falls kein hochgeladenes Bild gesetzt ist
+            if category == 'image' and not getattr(embed.image, 'url', None):
+                embed.set_image(url=url)
+
+            icon = {'image': '🖼️', 'video': '🎥', 'audio': '🎵', 'document': '📄'}.get(category, '📎')
+            size_str = self.media_handler.format_file_size(size)
+            lines.append(f"{icon} [{filename}]({url}) ({size_str})")
+
+        # Feldwert ist auf 1024 Zeichen begrenzt, CDN-URLs sind lang
+        value = ""
+        shown = 0
+        for line in lines:
+            if len(value) + len(line) + 1 > 1000:
+                break
+            value += line + "\n"
+            shown += 1
+        if shown < len(lines):
+            value += f"_+{len(lines) - shown} weitere_"
+
+        if value:
+            embed.add_field(name="🔗 Anhänge", value=value.strip(), inline=False)
+
     def _process_stickers(self, embed: discord.Embed, stickers: List[discord.StickerItem]):
         """Verarbeitet Discord Sticker"""
         if not stickers:
@@ -558,6 +1019,7 @@ class EmbedBuilder:
 
     def _get_attachment_category(self, filename: str, content_type: str) -> str:
         """Hilfsfunktion zur Kategorisierung basierend auf Name und Content-Type"""
+        content_type = content_type or ''
         if content_type.startswith('image/'):
             return 'image'
         elif content_type.startswith('video/'):
@@ -585,10 +1047,57 @@ class EmbedBuilder:
         """Bereinigt Nachrichteninhalt"""
         if not content:
             return ""
+        # Ohne "@" gibt es nichts zu neutralisieren
+        if '@' not in content:
+            return content.strip()
         content = content.replace('@everyone', '＠everyone')
         content = content.replace('@here', '＠here')
-        content = re.sub(r'<@&(\d+)>', r'＠role', content)
+        content = self.ROLE_MENTION_PATTERN.sub('＠role', content)
         return content.strip()
+
+    def get_author_block(self, author: discord.Member) -> Dict[str, str]:
+        """Gibt den vorgerenderten Author-Block (Name mit Badges + Avatar) zurück
+
+        Gecacht pro (Server, Mitglied, Anzeigename, Rollen, Avatar) - ändert sich
+        eins davon, entsteht ein neuer Schlüssel. Die TTL fängt Änderungen an
+        Rollen-Berechtigungen ab, die den Schlüssel nicht verändern.
+        """
+        avatar = author.display_avatar
+        key = (
+            author.guild.id,
+            author.id,
+            author.display_name,
+            hash(tuple(role.id for role in author.roles)),
+            avatar.key,
+        )
+
+        cached = self._author_cache.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[1] < self.config.AUTHOR_CACHE_TTL:
+            self._author_cache.move_to_end(key)
+            self._author_stats['hits'] += 1
+            return cached[0]
+
+        self._author_stats['misses'] += 1
+        author_text, _ = self._build_author_info(author)
+        block = {'name': author_text, 'icon_url': avatar.url}
+        self._author_cache[key] = (block, now)
+        self._author_cache.move_to_end(key)
+        while len(self._author_cache) > self.config.AUTHOR_CACHE_SIZE:
+            self._author_cache.popitem(last=False)
+        return block
+
+    def get_cache_stats(self) -> dict:
+        return {**self._author_stats, 'size': len(self._author_cache)}
+
+    def _color_value(self, color_hex: str) -> int:
+        """Wie ``_parse_color``, aber als gecachter Integer für das Embed-Dict"""
+        value = self._color_cache.get(color_hex)
+        if value is None:
+            value = self._parse_color(color_hex).value
+            if len(self._color_cache) < 256:
+                self._color_cache[color_hex] = value
+        return value
     
     def _parse_color(self, color_hex: str) -> discord.Color:
         """Parst Hex-Farbe zu discord.Color"""
@@ -624,116 +1133,1144 @@ class EmbedBuilder:
         return author_text, roles
 
 
-class GlobalChatSender:
-    """Verantwortlich für das Senden der Nachricht an alle verbundenen Kanäle"""
-    def __init__(self, bot, config: GlobalChatConfig, embed_builder: EmbedBuilder, cache_ref: List[int]):
+class AttachmentRelay:
+    """Upload-once für große Anhänge
+
+    Pro Datei entscheidet die Größe:
+    - bis ``DIRECT_UPLOAD_MAX_MB``: direkter Upload in jeden Channel
+    - größer: die CDN-URL des Originals wird wiederverwendet. Wird das Original
+      gelöscht (``delete_original``), verschwindet auch die URL - dann wird die
+      Datei einmal in den Relay-Channel hochgeladen und dessen URL verteilt.
+    Ohne Relay-Channel fällt das auf den direkten Upload zurück.
+    """
+
+    def __init__(self, bot, config: GlobalChatConfig):
         self.bot = bot
         self.config = config
-        self.embed_builder = embed_builder
-        self._cached_channels = cache_ref # Referenz zum Cache in der Cog
+        self._stats = {
+            'direct': 0,
+            'linked_cdn': 0,
+            'relayed': 0,
+            'relay_failures': 0,
+        }
 
-    async def _get_all_active_channels(self) -> List[int]:
-        """Ruft alle aktiven Channel-IDs ab, nutzt den Cache"""
-        if self._cached_channels is None:
-            # Cache initial füllen
-            self._cached_channels = await self._fetch_all_channels()
-        return self._cached_channels
-
-    async def _fetch_all_channels(self) -> List[int]:
-            """Holt Channel IDs direkt aus der Datenbank"""
+    def get_relay_channel(self) -> Optional[discord.TextChannel]:
+        if not self.config.RELAY_CHANNEL_ID:
+            return None
+        return self.bot.get_channel(self.config.RELAY_CHANNEL_ID)
+
+    def plan(self, attachments: List[discord.Attachment], delete_original: bool) -> Tuple[
+            List[discord.Attachment], List[discord.Attachment], List[Tuple[str, str, str, int]]]:
+        """Teilt Anhänge auf
+
+        Returns:
+            (direkt hochladen, einmal in den Relay-Channel, bereits verlinkbar als
+            (filename, url, content_type, size))
+        """
+        direct: List[discord.Attachment] = []
+        to_relay: List[discord.Attachment] = []
+        linked: List[Tuple[str, str, str, int]] = []
+
+        max_size = self.config.MAX_FILE_SIZE_MB * 1024 * 1024
+        direct_max = self.config.DIRECT_UPLOAD_MAX_MB * 1024 * 1024
+        relay_available = self.get_relay_channel() is not None
+
+        for attachment in attachments:
+            if attachment.size > max_size:
+                continue
+            if attachment.size <= direct_max:
+                direct.append(attachment)
+            elif not delete_original:
+                linked.append((attachment.filename, attachment.url, attachment.content_type or '', attachment.size))
+            elif relay_available:
+                to_relay.append(attachment)
+            else:
+                direct.append(attachment)
+
+        self._stats['direct'] += len(direct)
+        self._stats['linked_cdn'] += len(linked)
+        return direct, to_relay, linked
+
+    async def upload(self, message: discord.Message, files: List[Tuple[str, 'AttachmentBuffer', str]]) -> Tuple[
+            List[Tuple[str, str, str, int]], List[Tuple[str, 'AttachmentBuffer', str]]]:
+        """Lädt Dateien einmal in den Relay-Channel hoch
+
+        Returns:
+            (verlinkte Anhänge, Dateien die nicht hochgeladen werden konnten)
+        """
+        channel = self.get_relay_channel()
+        if channel is None:
+            return [], files
+
+        linked: List[Tuple[str, str, str, int]] = []
+        failed: List[Tuple[str, 'AttachmentBuffer', str]] = []
+        for batch in self._batches(files):
             try:
-                channel_ids = db.get_all_channels()
-                return channel_ids
-            except Exception as e:
-                logger.error(f"❌ Fehler beim Abrufen aller Channel-IDs: {e}", exc_info=True)
-                return []
+                sent = await channel.send(
+                    content=f"🌍 Relay • Server {message.guild.id} • Nachricht {message.id}",
+                    files=[discord.File(data.open(), filename=filename) for filename, data, _ in batch]
+                )
+                for (filename, data, content_type), uploaded in zip(batch, sent.attachments):
+                    linked.append((filename, uploaded.url, content_type or '', len(data)))
+                self._stats['relayed'] += len(batch)
+            except discord.HTTPException as e:
+                logger.warning(f"⚠️ Relay-Upload fehlgeschlagen, sende direkt: {e}")
+                self._stats['relay_failures'] += len(batch)
+                failed.extend(batch)
+
+        return linked, failed
+
+    def _batches(self, files: List[Tuple[str, 'AttachmentBuffer', str]]) -> List[List[Tuple[str, 'AttachmentBuffer', str]]]:
+        """Gruppiert Dateien in Nachrichten (max. 10 Dateien und MAX_FILE_SIZE_MB je Nachricht)"""
+        max_bytes = self.config.MAX_FILE_SIZE_MB * 1024 * 1024
+        batches: List[List[Tuple[str, 'AttachmentBuffer', str]]] = []
+        current: List[Tuple[str, 'AttachmentBuffer', str]] = []
+        current_size = 0
+        for item in files:
+            size = len(item[1])
+            if current and (len(current) >= self.config.MAX_ATTACHMENTS or current_size + size > max_bytes):
+                batches.append(current)
+                current, current_size = [], 0
+            current.append(item)
+            current_size += size
+        if current:
+            batches.append(current)
+        return batches
+
+    def get_stats(self) -> dict:
+        return dict(self._stats)
+
+
+class DeliveryLatencyHistogram:
+    """Histogramm der Zustell-Latenzen mit festen Buckets (Millisekunden)"""
+
+    BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+    __slots__ = ('counts', 'count', 'total_ms', 'max_ms')
+
+    def __init__(self):
+        # Letzter Bucket sammelt alles über dem größten Grenzwert
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float):
+        """Erfasst eine Zustellung"""
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, p: float) -> float:
+        """Obergrenze des Buckets, in dem das p-Quantil liegt (0 < p <= 1)"""
+        if not self.count:
+            return 0.0
+        threshold = p * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= threshold:
+                return float(self.BUCKETS_MS[index]) if index < len(self.BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def as_dict(self) -> dict:
+        buckets = {f"<={bound}ms": self.counts[i] for i, bound in enumerate(self.BUCKETS_MS)}
+        buckets[f">{self.BUCKETS_MS[-1]}ms"] = self.counts[-1]
+        return {
+            'count': self.count,
+            'avg_ms': (self.total_ms / self.count) if self.count else 0.0,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'max_ms': self.max_ms,
+            'buckets': buckets,
+        }
+
+
+class FanoutPayload:
+    """Inhalt einer Zustellung; Dateien werden pro Sendeversuch als discord.File erzeugt"""
+
+    __slots__ = ('embed', 'files', 'username', 'avatar_url')
+
+    def __init__(self, embed: discord.Embed, files: List[Tuple[str, 'AttachmentBuffer']] = None,
+                 username: Optional[str] = None, avatar_url: Optional[str] = None):
+        self.embed = embed
+        self.files = files or []
+        self.username = username
+        self.avatar_url = avatar_url
 
-    async def _send_to_channel(self, channel_id: int, embed: discord.Embed, attachment_bytes: List[Tuple[str, bytes]]) -> bool:
-        """Sendet die Embed-Nachricht an einen spezifischen Channel mit Error-Handling
-        attachment_bytes: Liste von (filename, bytes) - wird zu discord.File konvertiert
-        Wichtig: Raw bytes, nicht discord.File, da File-Streams verbraucht sind!
+    def make_files(self) -> List[discord.File]:
+        """Erstellt frische discord.File Objekte (ein gesendetes File ist verbraucht)
+
+        Jedes File liest direkt aus dem geteilten AttachmentBuffer, die Daten
+        werden dabei nicht kopiert.
         """
-        try:
-            channel = self.bot.get_channel(channel_id)
-            if not channel:
-                logger.warning(f"⚠️ Channel {channel_id} nicht gefunden")
-                return False
-            
-            # Permissions prüfen
-            perms = channel.permissions_for(channel.guild.me)
-            if not perms.send_messages or not perms.embed_links:
-                logger.warning(f"⚠️ Keine Permissions in {channel_id}")
-                return False
-            
-            # Erstelle NEUE discord.File Objekte für diesen Channel (wichtig!)
-            # Jeder Channel bekommt seine eigenen frischen Files!
-            files = []
-            if attachment_bytes:
-                for filename, data in attachment_bytes:
-                    try:
-                        files.append(discord.File(io.BytesIO(data), filename=filename))
-                    except Exception as e:
-                        logger.warning(f"⚠️ Error creating file {filename}: {e}")
+        return [discord.File(buffer.open(), filename=filename) for filename, buffer in self.files]
 
-            # Sende mit Retry-Logik
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    if files:
-                        await channel.send(embed=embed, files=files)
+
+class GlobalChatFanout:
+    """Verteilt Nachrichten mit begrenzter Parallelität an viele Channels
+
+    - Bot-weites Limit gleichzeitiger Requests (``FANOUT_CONCURRENCY``) und
+      gleichmäßige Taktung unter dem globalen Rate-Limit (``FANOUT_MAX_PER_SECOND``)
+    - Pro Route (Channel) wird ``retry_after`` aus 429-Antworten beachtet,
+      statt mit festen Pausen zu wiederholen
+    - Optional ein gecachter Webhook pro Channel
+    - Latenz-Histogramm über alle Zustellungen
+    """
+
+    def __init__(self, bot, config: GlobalChatConfig, on_forbidden: Callable[[int], None] = None):
+        self.bot = bot
+        self.config = config
+        self.on_forbidden = on_forbidden
+        self._semaphore = asyncio.Semaphore(config.FANOUT_CONCURRENCY)
+        self._next_slot = 0.0
+        self._global_blocked_until = 0.0
+        self._route_blocked_until: Dict[int, float] = {}
+
+        # channel_id -> Webhook; channel_id -> Zeitpunkt des letzten Fehlschlags
+        self._webhooks: Dict[int, discord.Webhook] = {}
+        self._webhook_misses: Dict[int, float] = {}
+        self._webhook_lock = asyncio.Lock()
+
+        self.histogram = DeliveryLatencyHistogram()
+        self._stats = {
+            'delivered': 0,
+            'failed': 0,
+            'retries': 0,
+            'rate_limited': 0,
+            'webhook_sends': 0,
+        }
+
+    async def deliver(self, channel_ids: List[int], payload: FanoutPayload) -> Dict[int, Optional[discord.Message]]:
+        """Stellt ``payload`` an alle Channels zu
+
+        Es laufen höchstens ``FANOUT_CONCURRENCY`` Worker pro Aufruf; das
+        Semaphore begrenzt zusätzlich über alle gleichzeitigen Aufrufe hinweg.
+
+        Returns:
+            Dict[int, Optional[discord.Message]]: Gesendete Nachricht pro Channel (None bei Fehler)
+        """
+        results: Dict[int, Optional[discord.Message]] = {}
+
+        async def deliver(channel_id: int):
+            results[channel_id] = None  # Zählt als Fehler, falls deliver_one wirft
+            results[channel_id] = await self.deliver_one(channel_id, payload)
+
+        await self._run_workers(channel_ids, deliver)
+        return results
+
+    async def update(self, relays: List[Tuple[int, int, bool]], embed: Optional[discord.Embed] = None) -> Tuple[int, int]:
+        """Bearbeitet oder löscht bereits weitergeleitete Nachrichten
+
+        Args:
+            relays: [(channel_id, message_id, via_webhook), ...]
+            embed: Neues Embed; ``None`` löscht die Nachrichten
+
+        Returns:
+            Tuple[int, int]: (erfolgreich, fehlgeschlagen)
+        """
+        counts = [0, 0]
+
+        async def apply(relay: Tuple[int, int, bool]):
+            ok = await self.update_one(*relay, embed=embed)
+            counts[0 if ok else 1] += 1
+
+        await self._run_workers(relays, apply)
+        return counts[0], counts[1]
+
+    async def update_one(self, channel_id: int, message_id: int, via_webhook: bool,
+                         embed: Optional[discord.Embed] = None) -> bool:
+        """Bearbeitet/löscht eine weitergeleitete Nachricht, inkl. Retries"""
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            return False
+
+        # Webhook-Nachrichten lassen sich nur über den Webhook bearbeiten
+        webhook = await self._get_webhook(channel) if via_webhook else None
+        if via_webhook and webhook is None and embed is not None:
+            return False
+
+        for attempt in range(self.config.FANOUT_MAX_RETRIES):
+            await self._wait_for_route(channel_id)
+            try:
+                async with self._semaphore:
+                    if webhook is not None:
+                        if embed is not None:
+                            await webhook.edit_message(message_id, embed=embed)
+                        else:
+                            await webhook.delete_message(message_id)
                     else:
-                        await channel.send(embed=embed)
-                    return True
-                except (ConnectionResetError, aiohttp.ClientConnectorError, asyncio.TimeoutError) as e:
-                    logger.warning(f"❌ Sendefehler (Retry {attempt+1}/{max_retries}) in {channel_id}: {e}")
-                    await asyncio.sleep(1 + attempt * 2)
-                except discord.Forbidden:
-                    logger.warning(f"❌ Bot hat Senderechte in {channel_id} verloren. Enferne aus Cache.")
-                    if channel_id in self._cached_channels:
-                        self._cached_channels.remove(channel_id)
+                        partial = channel.get_partial_message(message_id)
+                        if embed is not None:
+                            await partial.edit(embed=embed)
+                        else:
+                            await partial.delete()
+                return True
+            except (discord.NotFound, discord.Forbidden):
+                # Bereits gelöscht bzw. keine Rechte mehr
+                return False
+            except discord.HTTPException as e:
+                if e.status == 429:
+                    retry_after, is_global = self._rate_limit_info(e)
+                    self._stats['rate_limited'] += 1
+                    self._block(channel_id, retry_after, is_global)
+                elif e.status >= 500:
+                    self._block(channel_id, self._backoff(attempt))
+                else:
+                    logger.error(f"❌ Fehler beim Aktualisieren von {message_id} in {channel_id}: {e}")
                     return False
+            except (ConnectionResetError, aiohttp.ClientError, asyncio.TimeoutError):
+                self._block(channel_id, self._backoff(attempt))
+            self._stats['retries'] += 1
+        return False
+
+    async def _run_workers(self, items: list, handler: Callable):
+        """Arbeitet ``items`` mit höchstens ``FANOUT_CONCURRENCY`` Workern ab"""
+        if not items:
+            return
+
+        queue = list(reversed(items))
+
+        async def worker():
+            while queue:
+                item = queue.pop()
+                try:
+                    await handler(item)
                 except Exception as e:
+                    logger.error(f"❌ Fan-out Fehler bei {item}: {e}", exc_info=True)
+
+        workers = min(self.config.FANOUT_CONCURRENCY, len(items))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+    async def deliver_one(self, channel_id: int, payload: FanoutPayload) -> Optional[discord.Message]:
+        """Stellt ``payload`` an einen Channel zu, inkl. Retries"""
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            logger.warning(f"⚠️ Channel {channel_id} nicht gefunden")
+            self._stats['failed'] += 1
+            return None
+
+        perms = channel.permissions_for(channel.guild.me)
+        if not perms.send_messages or not perms.embed_links:
+            logger.warning(f"⚠️ Keine Permissions in {channel_id}")
+            self._stats['failed'] += 1
+            return None
+
+        use_webhook = self.config.USE_WEBHOOKS and perms.manage_webhooks
+        started = time.perf_counter()
+
+        for attempt in range(self.config.FANOUT_MAX_RETRIES):
+            if attempt:
+                self._stats['retries'] += 1
+            await self._wait_for_route(channel_id)
+
+            webhook = await self._get_webhook(channel) if use_webhook else None
+            try:
+                async with self._semaphore:
+                    # Files erst mit freiem Slot öffnen (gespoolte Dateien belegen Handles)
+                    kwargs = {'embed': payload.embed}
+                    if payload.files:
+                        kwargs['files'] = payload.make_files()
+                    if webhook is not None:
+                        sent = await webhook.send(
+                            username=payload.username,
+                            avatar_url=payload.avatar_url,
+                            wait=True,
+                            **kwargs
+                        )
+                        self._stats['webhook_sends'] += 1
+                    else:
+                        sent = await channel.send(**kwargs)
+
+                self.histogram.record(time.perf_counter() - started)
+                self._stats['delivered'] += 1
+                return sent
+
+            except discord.Forbidden:
+                if webhook is not None:
+                    # Webhook-Rechte entzogen, normal weitersenden
+                    self._drop_webhook(channel_id)
+                    use_webhook = False
+                    continue
+                logger.warning(f"❌ Bot hat Senderechte in {channel_id} verloren. Enferne aus Cache.")
+                if self.on_forbidden:
+                    self.on_forbidden(channel_id)
+                break
+            except discord.NotFound:
+                if webhook is not None:
+                    # Webhook wurde gelöscht
+                    self._drop_webhook(channel_id)
+                    continue
+                break
+            except discord.HTTPException as e:
+                if e.status == 429:
+                    retry_after, is_global = self._rate_limit_info(e)
+                    self._stats['rate_limited'] += 1
+                    self._block(channel_id, retry_after, is_global)
+                    logger.warning(f"⏳ Rate-Limit in {channel_id} ({'global' if is_global else 'Route'}), warte {retry_after:.2f}s")
+                elif e.status >= 500:
+                    self._block(channel_id, self._backoff(attempt))
+                elif webhook is not None:
+                    # z.B. ungültiger Webhook-Username - ohne Webhook erneut versuchen
+                    use_webhook = False
+                else:
                     logger.error(f"❌ Unerwarteter Sendefehler in {channel_id}: {e}")
+                    break
+            except (ConnectionResetError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"❌ Sendefehler (Retry {attempt+1}/{self.config.FANOUT_MAX_RETRIES}) in {channel_id}: {e}")
+                self._block(channel_id, self._backoff(attempt))
+        else:
+            logger.error(f"❌ Senden nach {self.config.FANOUT_MAX_RETRIES} Retries in {channel_id} fehlgeschlagen.")
+
+        self._stats['failed'] += 1
+        return None
+
+    # ==================== Scheduling ====================
+
+    async def _wait_for_route(self, channel_id: int):
+        """Wartet auf Route-/Global-Sperren und taktet Requests gleichmäßig"""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            blocked_until = max(self._global_blocked_until, self._route_blocked_until.get(channel_id, 0.0))
+            if blocked_until <= now:
+                break
+            await asyncio.sleep(blocked_until - now)
+        self._route_blocked_until.pop(channel_id, None)
+
+        # Leaky Bucket: jeder Request bekommt den nächsten freien Zeitslot
+        interval = 1.0 / self.config.FANOUT_MAX_PER_SECOND
+        now = loop.time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def _block(self, channel_id: int, delay: float, is_global: bool = False):
+        until = asyncio.get_running_loop().time() + delay
+        if is_global:
+            self._global_blocked_until = max(self._global_blocked_until, until)
+        else:
+            self._route_blocked_until[channel_id] = max(self._route_blocked_until.get(channel_id, 0.0), until)
+
+    def _backoff(self, attempt: int) -> float:
+        base = self.config.FANOUT_BACKOFF_BASE * (2 ** attempt)
+        return base + random.uniform(0, base / 2)
+
+    @staticmethod
+    def _rate_limit_info(error: discord.HTTPException) -> Tuple[float, bool]:
+        """Liest ``retry_after`` und den Scope aus einer 429-Antwort"""
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is None:
+            try:
+                retry_after = float(headers.get('Retry-After', 1.0))
+            except (TypeError, ValueError):
+                retry_after = 1.0
+        is_global = headers.get('X-RateLimit-Global') == 'true' or headers.get('X-RateLimit-Scope') == 'global'
+        return max(float(retry_after), 0.0), is_global
+
+    # ==================== Webhooks ====================
+
+    async def _get_webhook(self, channel: discord.TextChannel) -> Optional[discord.Webhook]:
+        """Gibt den gecachten Webhook des Channels zurück oder legt ihn an"""
+        webhook = self._webhooks.get(channel.id)
+        if webhook is not None:
+            return webhook
+
+        missed_at = self._webhook_misses.get(channel.id)
+        if missed_at is not None and time.monotonic() - missed_at < self.config.WEBHOOK_RETRY_SECONDS:
+            return None
+
+        async with self._webhook_lock:
+            webhook = self._webhooks.get(channel.id)
+            if webhook is not None:
+                return webhook
+            try:
+                for existing in await channel.webhooks():
+                    if existing.name == self.config.WEBHOOK_NAME and existing.token:
+                        webhook = existing
+                        break
+                if webhook is None:
+                    webhook = await channel.create_webhook(name=self.config.WEBHOOK_NAME)
+            except discord.HTTPException as e:
+                logger.debug(f"Kein Webhook für {channel.id} verfügbar: {e}")
+                self._webhook_misses[channel.id] = time.monotonic()
+                return None
+
+            self._webhooks[channel.id] = webhook
+            self._webhook_misses.pop(channel.id, None)
+            return webhook
+
+    def _drop_webhook(self, channel_id: int):
+        self._webhooks.pop(channel_id, None)
+        self._webhook_misses[channel_id] = time.monotonic()
+
+    def forget_channel(self, channel_id: int):
+        """Entfernt alle Zustände eines Channels (z.B. nach /globalchat remove)"""
+        self._webhooks.pop(channel_id, None)
+        self._webhook_misses.pop(channel_id, None)
+        self._route_blocked_until.pop(channel_id, None)
+
+    def get_stats(self) -> dict:
+        """Gibt Zähler, Latenz-Histogramm und Webhook-Cache-Größe zurück"""
+        return {
+            **self._stats,
+            'latency': self.histogram.as_dict(),
+            'webhooks_cached': len(self._webhooks),
+            'routes_blocked': len(self._route_blocked_until),
+        }
+
+
+class RelayMessageMap:
+    """Zuordnung Original-Nachricht -> weitergeleitete Kopien
+
+    Die Kopien liegen in einem Ringpuffer aus ``array``-Spalten fester Größe
+    (Channel-ID, Message-ID, Webhook-Flag = 17 Bytes pro Kopie). Der Index
+    zeigt pro Original auf einen zusammenhängenden Abschnitt im Ring. Alte
+    Einträge fallen heraus, sobald sie überschrieben werden oder älter als
+    der Zeithorizont sind - der Speicher bleibt dadurch konstant.
+    """
+
+    _MAGIC = b'MXRM1'
+
+    def __init__(self, capacity: int, horizon_seconds: float):
+        self.capacity = capacity
+        self.horizon = horizon_seconds
+        self._channel_ids = array('q', bytes(8 * capacity))
+        self._message_ids = array('q', bytes(8 * capacity))
+        self._webhook_flags = array('b', bytes(capacity))
+        # Absolute Schreibposition (Ring-Index = _head % capacity)
+        self._head = 0
+        # origin_id -> (Start, Anzahl, Zeitstempel)
+        self._index: Dict[int, Tuple[int, int, float]] = {}
+        # (origin_id, Start) in Schreibreihenfolge, für die Verdrängung
+        self._order: deque = deque()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, origin_id: int) -> bool:
+        return self._valid_entry(origin_id) is not None
+
+    def record(self, origin_id: int, relays: List[Tuple[int, int, bool]]):
+        """Speichert die Kopien einer Nachricht: [(channel_id, message_id, via_webhook), ...]
+
+        Auch ohne Kopien wird das Original vermerkt, damit Edits/Löschungen
+        an andere Prozesse weitergegeben werden.
+        """
+        relays = relays[:self.capacity]
+
+        start = self._head
+        for offset, (channel_id, message_id, via_webhook) in enumerate(relays):
+            position = (start + offset) % self.capacity
+            self._channel_ids[position] = channel_id
+            self._message_ids[position] = message_id
+            self._webhook_flags[position] = 1 if via_webhook else 0
+        self._head += len(relays)
+
+        self._index[origin_id] = (start, len(relays), time.time())
+        self._order.append((origin_id, start))
+        self._evict()
+
+    def get(self, origin_id: int) -> List[Tuple[int, int, bool]]:
+        """Gibt die Kopien einer Nachricht zurück (leer, wenn unbekannt oder verdrängt)"""
+        entry = self._valid_entry(origin_id)
+        if entry is None:
+            return []
+
+        start, count, _ = entry
+        relays = []
+        for offset in range(count):
+            position = (start + offset) % self.capacity
+            relays.append((
+                self._channel_ids[position],
+                self._message_ids[position],
+                bool(self._webhook_flags[position])
+            ))
+        return relays
+
+    def pop(self, origin_id: int) -> List[Tuple[int, int, bool]]:
+        """Gibt die Kopien zurück und entfernt die Nachricht aus dem Index"""
+        relays = self.get(origin_id)
+        self._index.pop(origin_id, None)
+        return relays
+
+    def _valid_entry(self, origin_id: int) -> Optional[Tuple[int, int, float]]:
+        entry = self._index.get(origin_id)
+        if entry is None:
+            return None
+        start, _, recorded_at = entry
+        if start < self._head - self.capacity or time.time() - recorded_at > self.horizon:
+            del self._index[origin_id]
+            return None
+        return entry
+
+    def _evict(self):
+        """Entfernt überschriebene und zu alte Einträge vom Anfang des Rings"""
+        oldest_valid = self._head - self.capacity
+        horizon = time.time() - self.horizon
+        while self._order:
+            origin_id, start = self._order[0]
+            entry = self._index.get(origin_id)
+            if entry is not None and entry[0] == start:
+                if start >= oldest_valid and entry[2] >= horizon:
+                    break
+                del self._index[origin_id]
+            self._order.popleft()
+
+    # ==================== Persistenz ====================
+
+    def save(self, path: str):
+        """Schreibt den Ring in eine Datei (z.B. beim Entladen der Cog)"""
+        self._evict()
+        entries = [(origin_id, *self._index[origin_id]) for origin_id, start in self._order
+                   if origin_id in self._index and self._index[origin_id][0] == start]
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self._MAGIC)
+            f.write(struct.pack('<qqq', self.capacity, self._head, len(entries)))
+            self._channel_ids.tofile(f)
+            self._message_ids.tofile(f)
+            self._webhook_flags.tofile(f)
+            for entry in entries:
+                f.write(struct.pack('<qqqd', *entry))
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> bool:
+        """Lädt einen gespeicherten Ring; passt die Kapazität nicht, wird er verworfen"""
+        try:
+            with open(path, 'rb') as f:
+                if f.read(len(self._MAGIC)) != self._MAGIC:
                     return False
-            
-            # Wenn alle Retries fehlschlagen
-            logger.error(f"❌ Senden nach {max_retries} Retries in {channel_id} fehlgeschlagen.")
+                capacity, head, count = struct.unpack('<qqq', f.read(24))
+                if capacity != self.capacity:
+                    return False
+                channel_ids, message_ids, webhook_flags = array('q'), array('q'), array('b')
+                channel_ids.fromfile(f, capacity)
+                message_ids.fromfile(f, capacity)
+                webhook_flags.fromfile(f, capacity)
+                entry_size = struct.calcsize('<qqqd')
+                entries = [struct.unpack('<qqqd', f.read(entry_size)) for _ in range(count)]
+        except (OSError, EOFError, struct.error) as e:
+            logger.warning(f"⚠️ Relay-Map konnte nicht geladen werden: {e}")
             return False
 
+        self._channel_ids, self._message_ids, self._webhook_flags = channel_ids, message_ids, webhook_flags
+        self._head = head
+        self._index.clear()
+        self._order.clear()
+        for origin_id, start, relay_count, recorded_at in entries:
+            self._index[origin_id] = (start, relay_count, recorded_at)
+            self._order.append((origin_id, start))
+        self._evict()
+        return True
+
+    def get_stats(self) -> dict:
+        return {
+            'messages': len(self._index),
+            'relays_written': self._head,
+            'capacity': self.capacity,
+            'memory_kb': (self._channel_ids.itemsize + self._message_ids.itemsize + self._webhook_flags.itemsize) * self.capacity / 1024,
+        }
+
+
+class GlobalChatChannelRegistry:
+    """In-Memory Registry aller aktiven GlobalChat-Channels
+
+    Ein Set für die O(1)-Prüfung im on_message Listener plus ein Index
+    Guild -> Channel. Setup/Remove/Forbidden ändern die Registry direkt,
+    ``resync()`` gleicht sie im Hintergrund mit der Datenbank ab.
+    """
+
+    def __init__(self, bot, executor: DatabaseExecutor):
+        self.bot = bot
+        self.executor = executor
+        self._channels: set = set()
+        self._by_guild: Dict[int, int] = {}
+        self._guild_by_channel: Dict[int, int] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        # Wird bei jeder lokalen Änderung erhöht, damit ein Resync sie nicht überschreibt
+        self._generation = 0
+        self.last_sync: Optional[datetime] = None
+
+    def __contains__(self, channel_id: int) -> bool:
+        return channel_id in self._channels
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def channel_ids(self) -> List[int]:
+        """Momentaufnahme aller Channel-IDs (sicher gegen Änderungen während des Fan-outs)"""
+        return list(self._channels)
+
+    def get_guild_channel(self, guild_id: int) -> Optional[int]:
+        return self._by_guild.get(guild_id)
+
+    def add(self, guild_id: int, channel_id: int):
+        """Registriert den GlobalChat-Channel eines Servers (ersetzt einen vorherigen)"""
+        previous = self._by_guild.get(guild_id)
+        if previous is not None and previous != channel_id:
+            self._channels.discard(previous)
+            self._guild_by_channel.pop(previous, None)
+        self._channels.add(channel_id)
+        self._by_guild[guild_id] = channel_id
+        self._guild_by_channel[channel_id] = guild_id
+        self._generation += 1
+
+    def remove_guild(self, guild_id: int) -> Optional[int]:
+        """Entfernt den Channel eines Servers und gibt ihn zurück"""
+        channel_id = self._by_guild.pop(guild_id, None)
+        if channel_id is not None:
+            self._channels.discard(channel_id)
+            self._guild_by_channel.pop(channel_id, None)
+        self._generation += 1
+        return channel_id
+
+    def discard_channel(self, channel_id: int):
+        """Entfernt einen Channel (z.B. nach Forbidden) bis zum nächsten Resync"""
+        self._channels.discard(channel_id)
+        guild_id = self._guild_by_channel.pop(channel_id, None)
+        if guild_id is not None and self._by_guild.get(guild_id) == channel_id:
+            del self._by_guild[guild_id]
+        self._generation += 1
+
+    async def ensure_loaded(self):
+        """Lädt die Registry beim ersten Zugriff"""
+        if not self._loaded:
+            await self.resync()
+
+    async def resync(self) -> int:
+        """Gleicht die Registry mit ``db.get_all_channels`` ab
+
+        Returns:
+            int: Anzahl aktiver Channels nach dem Abgleich
+        """
+        async with self._load_lock:
+            # Lokale Änderungen während des Ladens? Dann erneut laden (max. 3 Versuche)
+            for _ in range(3):
+                generation = self._generation
+                try:
+                    channel_ids = await self.executor.run(db.get_all_channels)
+                except Exception as e:
+                    logger.error(f"❌ Fehler beim Abrufen aller Channel-IDs: {e}", exc_info=True)
+                    return len(self._channels)
+                if generation == self._generation:
+                    break
+
+            channels = set(channel_ids)
+            by_guild: Dict[int, int] = {}
+            for channel_id in channels:
+                # Guild-Zuordnung über den Bot-Cache; unbekannte Channels bleiben nur im Set
+                channel = self.bot.get_channel(channel_id)
+                guild = getattr(channel, 'guild', None)
+                if guild is not None:
+                    by_guild[guild.id] = channel_id
+
+            self._channels = channels
+            self._by_guild = by_guild
+            self._guild_by_channel = {channel_id: guild_id for guild_id, channel_id in by_guild.items()}
+            self._loaded = True
+            self.last_sync = datetime.utcnow()
+            return len(channels)
+
+
+class RelayEnvelope:
+    """Normalisierte, serialisierbare Relay-Nachricht zwischen Bot-Prozessen
+
+    kind: ``message``, ``edit``, ``delete`` oder ``broadcast``.
+    Das Embed wird als Dict übertragen; Anhänge sind darin nur verlinkt.
+    """
+
+    __slots__ = ('kind', 'origin_instance', 'origin_guild_id', 'origin_channel_id',
+                 'origin_message_id', 'embed', 'username', 'avatar_url')
+
+    KINDS = ('message', 'edit', 'delete', 'broadcast')
+
+    def __init__(self, kind: str, origin_instance: str, origin_guild_id: int = 0, origin_channel_id: int = 0,
+                 origin_message_id: int = 0, embed: Optional[dict] = None,
+                 username: Optional[str] = None, avatar_url: Optional[str] = None):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unbekannter Envelope-Typ: {kind}")
+        self.kind = kind
+        self.origin_instance = origin_instance
+        self.origin_guild_id = origin_guild_id
+        self.origin_channel_id = origin_channel_id
+        self.origin_message_id = origin_message_id
+        self.embed = embed
+        self.username = username
+        self.avatar_url = avatar_url
+
+    def to_json(self) -> str:
+        return json.dumps({slot: getattr(self, slot) for slot in self.__slots__}, separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, data) -> 'RelayEnvelope':
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        return cls(**json.loads(data))
+
+
+class GlobalChatBroker(ABC):
+    """Schnittstelle für die Verteilung von Relays an andere Bot-Prozesse
+
+    Jeder Prozess stellt selbst nur an seine eigenen Channels zu. Der Broker
+    verteilt den Envelope an alle ANDEREN Prozesse, deren Handler dann lokal
+    zustellen. ``remote`` ist False, solange es keine anderen Prozesse gibt.
+    Konkrete Broker implementieren ``publish``.
+    """
+
+    remote = False
+
+    def __init__(self):
+        self.instance_id = uuid.uuid4().hex
+        self._handler: Optional[Callable] = None
+        self._stats = {'published': 0, 'received': 0, 'errors': 0}
+
+    @staticmethod
+    def from_config(config: GlobalChatConfig) -> 'GlobalChatBroker':
+        """Erstellt den konfigurierten Broker (Standard: In-Process)"""
+        url = config.BROKER_URL
+        if url and url.startswith(('redis://', 'rediss://', 'unix://')):
+            if aioredis is not None:
+                return RedisBroker(url, config.BROKER_CHANNEL)
+            logger.error("❌ GlobalChat: BROKER_URL gesetzt, aber das Paket 'redis' fehlt - nutze In-Process Broker")
+        elif url:
+            logger.error("❌ GlobalChat: Unbekanntes Broker-Schema in BROKER_URL - nutze In-Process Broker")
+        return InProcessBroker()
+
+    async def start(self, handler: Callable):
+        """Registriert den Handler für eingehende Envelopes"""
+        self._handler = handler
+
+    @abstractmethod
+    async def publish(self, envelope: RelayEnvelope):
+        """Verteilt einen Envelope an alle anderen Prozesse"""
+
+    async def close(self):
+        pass
+
+    async def _dispatch(self, envelope: RelayEnvelope):
+        if self._handler is None:
+            return
+        self._stats['received'] += 1
+        try:
+            await self._handler(envelope)
         except Exception as e:
-            logger.error(f"❌ Generischer Fehler im _send_to_channel: {e}", exc_info=True)
-            return False
+            self._stats['errors'] += 1
+            logger.error(f"❌ Fehler beim Verarbeiten eines Relay-Envelopes ({envelope.kind}): {e}", exc_info=True)
+
+    def get_stats(self) -> dict:
+        return {**self._stats, 'backend': type(self).__name__, 'remote': self.remote}
+
+
+class InProcessBroker(GlobalChatBroker):
+    """Standard-Broker: alle Channels liegen in diesem Prozess
+
+    Mit einem geteilten ``hub`` (Liste) lassen sich mehrere Bot-Instanzen in
+    einem Prozess wie getrennte Shards betreiben - als lokaler Ersatz für
+    Redis. Envelopes werden dabei wie über das Netzwerk serialisiert.
+    """
+
+    def __init__(self, hub: Optional[list] = None):
+        super().__init__()
+        self._hub = hub if hub is not None else []
+
+    @property
+    def remote(self) -> bool:
+        return len(self._hub) > 1
+
+    async def start(self, handler: Callable):
+        await super().start(handler)
+        if self not in self._hub:
+            self._hub.append(self)
+
+    async def publish(self, envelope: RelayEnvelope):
+        data = envelope.to_json()
+        self._stats['published'] += 1
+        for peer in list(self._hub):
+            if peer is not self:
+                await peer._dispatch(RelayEnvelope.from_json(data))
+
+    async def close(self):
+        if self in self._hub:
+            self._hub.remove(self)
+
+
+class RedisBroker(GlobalChatBroker):
+    """Broker über Redis Pub/Sub (oder einen kompatiblen Server, z.B. KeyDB/Valkey)
+
+    Envelopes werden nacheinander verarbeitet, damit ein Edit/Delete nie vor
+    der zugehörigen Nachricht ankommt.
+    """
+
+    remote = True
+    RECONNECT_DELAY = 5
+
+    def __init__(self, url: str, channel: str):
+        super().__init__()
+        if aioredis is None:
+            raise RuntimeError("Für GlobalChat BROKER_URL wird das Paket 'redis' benötigt")
+        self.url = url
+        self.channel = channel
+        self._redis = None
+        self._reader: Optional[asyncio.Task] = None
+
+    async def start(self, handler: Callable):
+        await super().start(handler)
+        self._redis = aioredis.from_url(self.url)
+        self._reader = asyncio.create_task(self._read_loop())
+        logger.info(f"🌐 GlobalChat: Redis-Broker verbunden ({self.channel})")
+
+    async def _read_loop(self):
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for item in pubsub.listen():
+                    if item.get('type') != 'message':
+                        continue
+                    try:
+                        envelope = RelayEnvelope.from_json(item['data'])
+                    except (ValueError, TypeError, KeyError) as e:
+                        logger.warning(f"⚠️ Ungültiger Relay-Envelope verworfen: {e}")
+                        continue
+                    # Eigene Envelopes wurden bereits lokal zugestellt
+                    if envelope.origin_instance != self.instance_id:
+                        await self._dispatch(envelope)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Redis-Broker Verbindung verloren, neuer Versuch in {self.RECONNECT_DELAY}s: {e}")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
 
-    async def send_global_message(self, message: discord.Message, attachment_data: List[Tuple[str, bytes, str]] = None) -> Tuple[int, int]:
-        """Sendet eine Nachricht global an alle verbundenen Channels"""
-        settings = db.get_guild_settings(message.guild.id)
-        
-        embed, files_to_upload = await self.embed_builder.create_message_embed(message, settings, attachment_data)
-        
+    async def publish(self, envelope: RelayEnvelope):
+        await self._redis.publish(self.channel, envelope.to_json())
+        self._stats['published'] += 1
+
+    async def close(self):
+        if self._reader is not None:
+            self._reader.cancel()
+        if self._redis is not None:
+            await self._redis.close()
+
+
+class GlobalChatSender:
+    """Verantwortlich für das Senden der Nachricht an alle verbundenen Kanäle"""
+    def __init__(self, bot, config: GlobalChatConfig, embed_builder: EmbedBuilder, registry: GlobalChatChannelRegistry,
+                 broker: Optional[GlobalChatBroker] = None):
+        self.bot = bot
+        self.config = config
+        self.embed_builder = embed_builder
+        self.registry = registry
+        self.settings_cache = get_guild_cache(bot)
+        self.executor = get_db_executor(bot)
+        self.fanout = GlobalChatFanout(bot, config, on_forbidden=self._drop_channel)
+        self.relay_map = RelayMessageMap(config.RELAY_MAP_CAPACITY, config.RELAY_MAP_HORIZON_HOURS * 3600)
+        if config.RELAY_MAP_PATH and os.path.exists(config.RELAY_MAP_PATH):
+            if self.relay_map.load(config.RELAY_MAP_PATH):
+                logger.info(f"🧠 GlobalChat: Relay-Map geladen ({len(self.relay_map)} Nachrichten)")
+        self.broker = broker or GlobalChatBroker.from_config(config)
+        self._broker_started = False
+
+    async def start_broker(self):
+        """Startet den Broker (nach on_ready, damit der Channel-Cache gefüllt ist)"""
+        if self._broker_started:
+            return
+        self._broker_started = True
+        await self.broker.start(self._handle_envelope)
+
+    async def close_broker(self):
+        self._broker_started = False
+        await self.broker.close()
+
+    async def _get_all_active_channels(self) -> List[int]:
+        """Ruft alle aktiven Channel-IDs aus der Registry ab"""
+        await self.registry.ensure_loaded()
+        channel_ids = self.registry.channel_ids()
+        if self.broker.remote:
+            # Bei mehreren Prozessen stellt jeder nur an die Channels seiner Shards zu
+            return [channel_id for channel_id in channel_ids if self.bot.get_channel(channel_id) is not None]
+        return channel_ids
+
+    def _drop_channel(self, channel_id: int):
+        """Entfernt einen Channel ohne Senderechte aus der Registry"""
+        self.registry.discard_channel(channel_id)
+        self.fanout.forget_channel(channel_id)
+
+    async def _send_to_channel(self, channel_id: int, payload: FanoutPayload) -> Optional[discord.Message]:
+        """Sendet die Nachricht an einen einzelnen Channel über die Fan-out Engine"""
+        return await self.fanout.deliver_one(channel_id, payload)
+
+    async def _send_to_all(self, payload: FanoutPayload, exclude_channel_id: Optional[int] = None) -> Dict[int, Optional[discord.Message]]:
+        """Stellt ``payload`` an alle aktiven Channels zu"""
         active_channels = await self._get_all_active_channels()
-        successful_sends = 0
-        failed_sends = 0
-
-        # Berechne, wie viele Tasks gleichzeitig laufen sollen (z.B. 10)
-        tasks = []
-        for channel_id in active_channels:
-            # Sende nicht an den Ursprungskanal zurück
-            if channel_id == message.channel.id:
-                continue
+        targets = [channel_id for channel_id in active_channels if channel_id != exclude_channel_id]
+        return await self.fanout.deliver(targets, payload)
 
-            tasks.append(self._send_to_channel(channel_id, embed, files_to_upload))
+    @staticmethod
+    def _count_results(results: Dict[int, Optional[discord.Message]]) -> Tuple[int, int]:
+        successful_sends = sum(1 for sent in results.values() if sent is not None)
+        return successful_sends, len(results) - successful_sends
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    async def send_global_message(self, message: discord.Message, attachment_data: List[Tuple[str, 'AttachmentBuffer', str]] = None,
+                                  linked_attachments: List[Tuple[str, str, str, int]] = None) -> Tuple[int, int]:
+        """Sendet eine Nachricht global an alle verbundenen Channels"""
+        guild_id = message.guild.id
+        settings = await self.settings_cache.get(
+            guild_id, ('globalchat', 'settings'),
+            lambda: self.executor.run(db.get_guild_settings, guild_id)
+        )
+        
+        embed, files_to_upload = await self.embed_builder.create_message_embed(message, settings, attachment_data, linked_attachments)
+
+        # Webhook-Name: Autor + Herkunftsserver (Discord erlaubt max. 80 Zeichen)
+        author_block = self.embed_builder.get_author_block(message.author)
+        payload = FanoutPayload(
+            embed,
+            files_to_upload,
+            username=f"{author_block['name']} • {message.guild.name}"[:80],
+            avatar_url=message.author.display_avatar.url
+        )
 
-        for result in results:
-            if result is True:
-                successful_sends += 1
+        # Sende nicht an den Ursprungskanal zurück
+        results = await self._send_to_all(payload, exclude_channel_id=message.channel.id)
+
+        # Kopien merken, damit Edits/Löschungen des Originals weitergegeben werden können
+        relays = [
+            (channel_id, sent.id, sent.webhook_id is not None)
+            for channel_id, sent in results.items() if sent is not None
+        ]
+        if relays or self.broker.remote:
+            self.relay_map.record(message.id, relays)
+
+        if self.broker.remote:
+            await self._publish_message(message, settings, embed, payload, results, linked_attachments)
+        return self._count_results(results)
+
+    async def _publish_message(self, message: discord.Message, settings: Dict, embed: discord.Embed,
+                               payload: FanoutPayload, results: Dict[int, Optional[discord.Message]],
+                               linked_attachments: List[Tuple[str, str, str, int]] = None):
+        """Veröffentlicht die Nachricht einmal für die anderen Prozesse"""
+        if payload.files:
+            # Dateien gehen nicht über den Broker: die Anhänge einer lokal gesendeten
+            # Kopie (sonst die Original-URLs) werden stattdessen verlinkt
+            linked = list(linked_attachments or [])
+            sent_copy = next((sent for sent in results.values() if sent is not None and sent.attachments), None)
+            if sent_copy is not None:
+                source = sent_copy.attachments
             else:
-                failed_sends += 1
-                if isinstance(result, Exception):
-                    logger.error(f"❌ Task-Fehler beim Senden: {result}")
-        
-        return successful_sends, failed_sends
+                linked_urls = {url for _, url, _, _ in linked}
+                source = [attachment for attachment in message.attachments if attachment.url not in linked_urls]
+            linked += [
+                (attachment.filename, attachment.url, attachment.content_type or '', attachment.size)
+                for attachment in source
+            ]
+            embed, _ = await self.embed_builder.create_message_embed(message, settings, None, linked)
+
+        await self._publish(RelayEnvelope(
+            'message', self.broker.instance_id,
+            origin_guild_id=message.guild.id,
+            origin_channel_id=message.channel.id,
+            origin_message_id=message.id,
+            embed=embed.to_dict(),
+            username=payload.username,
+            avatar_url=payload.avatar_url
+        ))
+
+    async def _publish(self, envelope: RelayEnvelope):
+        """Broker-Fehler dürfen die lokale Zustellung nicht beeinflussen"""
+        try:
+            await self.broker.publish(envelope)
+        except Exception as e:
+            logger.error(f"❌ GlobalChat: Envelope ({envelope.kind}) konnte nicht veröffentlicht werden: {e}")
+
+    async def _handle_envelope(self, envelope: RelayEnvelope):
+        """Stellt einen Envelope eines anderen Prozesses an die eigenen Channels zu"""
+        if envelope.kind == 'delete':
+            relays = self.relay_map.pop(envelope.origin_message_id)
+            if relays:
+                await self.fanout.update(relays)
+            return
+
+        embed = discord.Embed.from_dict(envelope.embed)
+        if envelope.kind == 'edit':
+            relays = self.relay_map.get(envelope.origin_message_id)
+            if relays:
+                await self.fanout.update(relays, embed)
+            return
+
+        payload = FanoutPayload(embed, username=envelope.username, avatar_url=envelope.avatar_url)
+        results = await self._send_to_all(payload, exclude_channel_id=envelope.origin_channel_id)
+        if envelope.kind == 'message':
+            self.relay_map.record(envelope.origin_message_id, [
+                (channel_id, sent.id, sent.webhook_id is not None)
+                for channel_id, sent in results.items() if sent is not None
+            ])
+        successful, failed = self._count_results(results)
+        logger.info(f"🌐 GlobalChat: Remote-{envelope.kind} aus Guild {envelope.origin_guild_id} | ✅ {successful} | ❌ {failed}")
+
+    async def edit_global_message(self, message: discord.Message, settings: Dict) -> Tuple[int, int]:
+        """Gibt die Bearbeitung einer Original-Nachricht an alle Kopien weiter"""
+        relays = self.relay_map.get(message.id)
+        if not relays and not self.broker.remote:
+            return 0, 0
+
+        # Anhänge werden beim Bearbeiten nicht neu hochgeladen, sondern über die Original-URL verlinkt
+        linked_attachments = [
+            (attachment.filename, attachment.url, attachment.content_type or '', attachment.size)
+            for attachment in message.attachments
+        ]
+        embed, _ = await self.embed_builder.create_message_embed(message, settings, None, linked_attachments)
+        if self.broker.remote:
+            await self._publish(RelayEnvelope(
+                'edit', self.broker.instance_id,
+                origin_guild_id=message.guild.id,
+                origin_channel_id=message.channel.id,
+                origin_message_id=message.id,
+                embed=embed.to_dict()
+            ))
+        return await self.fanout.update(relays, embed)
+
+    async def delete_global_message(self, message_id: int) -> Tuple[int, int]:
+        """Löscht alle Kopien einer Original-Nachricht"""
+        relays = self.relay_map.pop(message_id)
+        if self.broker.remote:
+            await self._publish(RelayEnvelope('delete', self.broker.instance_id, origin_message_id=message_id))
+        if not relays:
+            return 0, 0
+        return await self.fanout.update(relays)
+
+    def save_relay_map(self):
+        """Speichert die Relay-Map, falls Persistenz aktiviert ist"""
+        if not self.config.RELAY_MAP_PATH:
+            return
+        try:
+            self.relay_map.save(self.config.RELAY_MAP_PATH)
+        except OSError as e:
+            logger.error(f"❌ Relay-Map konnte nicht gespeichert werden: {e}")
+
+    async def send_global_broadcast_message(self, embed: discord.Embed) -> Tuple[int, int]:
+        """Sendet ein Broadcast-Embed an alle verbundenen Channels"""
+        results = await self._send_to_all(FanoutPayload(embed, username=self.config.WEBHOOK_NAME))
+        if self.broker.remote:
+            await self._publish(RelayEnvelope(
+                'broadcast', self.broker.instance_id, embed=embed.to_dict(), username=self.config.WEBHOOK_NAME
+            ))
+        return self._count_results(results)
 
 
 class GlobalChatCog(ezcord.Cog):
@@ -745,26 +2282,76 @@ class GlobalChatCog(ezcord.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.config = GlobalChatConfig()
-        self.validator = MessageValidator(self.config)
+        self.executor = get_db_executor(bot)
+        self.blacklist = GlobalChatBlacklist(self.executor)
+        self.validator = MessageValidator(self.config, self.executor, self.blacklist)
         self.embed_builder = EmbedBuilder(self.config, bot)
+        self.relay = AttachmentRelay(bot, self.config)
+        self.downloader = AttachmentDownloader(self.config)
+        self._filter_words_column = False
+        self._self_deleted: set = set()
         self.message_cooldown = commands.CooldownMapping.from_cooldown(
             self.config.RATE_LIMIT_MESSAGES, 
             self.config.RATE_LIMIT_SECONDS, 
             commands.BucketType.user
         )
-        self._cached_channels: Optional[List[int]] = None
-        self.sender = GlobalChatSender(self.bot, self.config, self.embed_builder, self._cached_channels)
+        self.settings_cache = get_guild_cache(bot)
+        self.registry = GlobalChatChannelRegistry(bot, self.executor)
+        self.sender = GlobalChatSender(self.bot, self.config, self.embed_builder, self.registry)
         self.cleanup_task.start()
 
-    @tasks.loop(hours=12)
+    async def _ensure_filter_words_column(self):
+        """Legt die Spalte ``filter_words`` in guild_settings einmalig an"""
+        if self._filter_words_column:
+            return
+        columns = await self.executor.fetchall(DB_PATH, "PRAGMA table_info(guild_settings)")
+        if not any(column[1] == 'filter_words' for column in columns):
+            try:
+                await self.executor.execute(DB_PATH, "ALTER TABLE guild_settings ADD COLUMN filter_words TEXT")
+            except sqlite3.OperationalError:
+                # Parallel bereits angelegt
+                pass
+        self._filter_words_column = True
+
+    def cog_unload(self):
+        """Cleanup beim Entladen der Cog"""
+        self.cleanup_task.cancel()
+        self.sender.save_relay_map()
+        try:
+            loop = asyncio.get_running_loop()
+            loop.create_task(self.downloader.close())
+            loop.create_task(self.sender.close_broker())
+        except RuntimeError:
+            # Kein laufender Loop mehr (Shutdown) - die Session endet mit dem Prozess
+            pass
+
+    @tasks.loop(minutes=GlobalChatConfig.REGISTRY_RESYNC_MINUTES)
     async def cleanup_task(self):
-            """Task zur Bereinigung abgelaufener Blacklist-Einträge und Cache-Aktualisierung"""
-            # db.delete_expired_blacklist_entries() <--- DIESE ZEILE AUSKOMMENTIEREN
-            # logger.info("🗑️ GlobalChat: Abgelaufene Blacklist-Einträge bereinigt.")
+            """Task zur Bereinigung abgelaufener Blacklist-Einträge und Registry-Abgleich"""
+            # Die In-Memory Blacklist läuft exakt ab, hier werden nur die DB-Zeilen entfernt
+            try:
+                removed = await self.executor.execute(
+                    DB_PATH,
+                    "DELETE FROM globalchat_blacklist WHERE is_permanent = 0 AND expires_at IS NOT NULL AND expires_at < ?",
+                    (datetime.now().isoformat(" "),)
+                )
+                if removed:
+                    logger.info(f"🗑️ GlobalChat: {removed} abgelaufene Blacklist-Einträge bereinigt.")
+            except Exception as e:
+                logger.error(f"❌ Fehler beim Bereinigen der Blacklist: {e}", exc_info=True)
             
-            # Cache neu laden, um Änderungen in der DB zu sehen
-            self._cached_channels = await self.sender._fetch_all_channels()
-            logger.info("🧠 GlobalChat: Channel-Cache neu geladen.")
+            # Registry mit der DB abgleichen (Änderungen von außen, z.B. anderer Prozess)
+            count = await self.registry.resync()
+            logger.debug(f"🧠 GlobalChat: Channel-Registry abgeglichen ({count} Channels).")
+
+    @cleanup_task.before_loop
+    async def before_cleanup_task(self):
+        # Guild-Zuordnung braucht den gefüllten Channel-Cache
+        await self.bot.wait_until_ready()
+        try:
+            await self.sender.start_broker()
+        except Exception as e:
+            logger.error(f"❌ GlobalChat: Broker konnte nicht gestartet werden: {e}", exc_info=True)
 
     @ezcord.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -772,16 +2359,22 @@ class GlobalChatCog(ezcord.Cog):
         if not message.guild or message.author.bot:
             return
 
-        # Prüfen ob Channel ein GlobalChat-Channel ist
-        global_chat_channel_id = db.get_globalchat_channel(message.guild.id)
-        if message.channel.id != global_chat_channel_id:
+        guild_id = message.guild.id
+
+        # Prüfen ob Channel ein GlobalChat-Channel ist (O(1) über die Registry)
+        if not self.registry.loaded:
+            await self.registry.ensure_loaded()
+        if message.channel.id not in self.registry:
             return
 
         # Guild-Settings laden
-        settings = db.get_guild_settings(message.guild.id)
+        settings = await self.settings_cache.get(
+            guild_id, ('globalchat', 'settings'),
+            lambda: self.executor.run(db.get_guild_settings, guild_id)
+        )
 
         # Message validieren
-        is_valid, reason = self.validator.validate_message(message, settings)
+        is_valid, reason = await self.validator.validate_message(message, settings)
         if not is_valid:
             logger.debug(f"❌ Nachricht abgelehnt: {reason} (User: {message.author.id})")
             
@@ -817,34 +2410,88 @@ class GlobalChatCog(ezcord.Cog):
             return
 
         # === Medien herunterladen (wenn vorhanden) ===
-        attachment_data: List[Tuple[str, bytes, str]] = []
-        if message.attachments:
-            try:
-                await message.channel.trigger_typing()
-                for attachment in message.attachments:
-                    # Maximal 25MB (Discord-Limit)
-                    if attachment.size <= self.config.MAX_FILE_SIZE_MB * 1024 * 1024:
-                        data = await attachment.read()
-                        attachment_data.append((attachment.filename, data, attachment.content_type))
-            except Exception as e:
-                logger.error(f"❌ Fehler beim Herunterladen von Attachments: {e}")
-                # Wenn Download fehlschlägt, Nachricht trotzdem ohne Medien senden
-                attachment_data = []
-
-        # Nachricht senden
-        successful, failed = await self.sender.send_global_message(message, attachment_data)
+        # Große Dateien werden nur verlinkt (CDN) bzw. einmal in den Relay-Channel hochgeladen
+        # Downloads laufen parallel; fehlgeschlagene Dateien werden ohne Medien weitergesendet
+        attachment_data: List[Tuple[str, AttachmentBuffer, str]] = []
+        relay_data: List[Tuple[str, AttachmentBuffer, str]] = []
+        linked_attachments: List[Tuple[str, str, str, int]] = []
+        try:
+            if message.attachments:
+                direct, to_relay, linked_attachments = self.relay.plan(
+                    message.attachments, settings.get('delete_original', False)
+                )
+                if direct or to_relay:
+                    await message.channel.trigger_typing()
+                    attachment_data, relay_data = await asyncio.gather(
+                        self.downloader.fetch_all(direct),
+                        self.downloader.fetch_all(to_relay)
+                    )
+
+                if relay_data:
+                    relayed, fallback = await self.relay.upload(message, relay_data)
+                    linked_attachments.extend(relayed)
+                    attachment_data.extend(fallback)
+
+            # Nachricht senden
+            successful, failed = await self.sender.send_global_message(message, attachment_data, linked_attachments)
+        finally:
+            # Speicherbudget und Temp-Dateien sofort nach dem Fan-out freigeben
+            for _, buffer, _ in attachment_data + relay_data:
+                buffer.close()
 
         # Ursprüngliche Nachricht löschen, wenn Relaying erfolgreich war
         if settings.get('delete_original', False):
+             # Eigene Löschung nicht als "Original gelöscht" an die Kopien weitergeben
+             self._self_deleted.add(message.id)
              try:
                 await message.delete()
              except discord.Forbidden:
+                self._self_deleted.discard(message.id)
                 logger.warning(f"⚠️ Keine Permissions zum Löschen der Original-Nachricht in {message.channel.id}")
              except discord.NotFound:
-                pass
+                self._self_deleted.discard(message.id)
         
         logger.info(f"🌍 GlobalChat: Nachricht von {message.guild.name} | User: {message.author.name} | ✅ {successful} | ❌ {failed}")
 
+    @ezcord.Cog.listener()
+    async def on_message_edit(self, before: discord.Message, after: discord.Message):
+        """Gibt Bearbeitungen einer weitergeleiteten Nachricht an alle Kopien weiter"""
+        if not after.guild or after.author.bot:
+            return
+        # Link-Vorschauen lösen ebenfalls Edit-Events aus
+        if before.content == after.content:
+            return
+        if after.channel.id not in self.registry or after.id not in self.sender.relay_map:
+            return
+
+        guild_id = after.guild.id
+        settings = await self.settings_cache.get(
+            guild_id, ('globalchat', 'settings'),
+            lambda: self.executor.run(db.get_guild_settings, guild_id)
+        )
+
+        # Bearbeitete Inhalte durchlaufen dieselben Filter; sonst Kopien entfernen
+        is_valid, reason = await self.validator.validate_message(after, settings)
+        if not is_valid:
+            deleted, failed = await self.sender.delete_global_message(after.id)
+            logger.info(f"🗑️ GlobalChat: Bearbeitete Nachricht abgelehnt ({reason}) | ✅ {deleted} | ❌ {failed}")
+            return
+
+        updated, failed = await self.sender.edit_global_message(after, settings)
+        logger.info(f"✏️ GlobalChat: Bearbeitung weitergegeben | User: {after.author.name} | ✅ {updated} | ❌ {failed}")
+
+    @ezcord.Cog.listener()
+    async def on_message_delete(self, message: discord.Message):
+        """Löscht alle Kopien, wenn das Original gelöscht wird"""
+        if message.id in self._self_deleted:
+            self._self_deleted.discard(message.id)
+            return
+        if not message.guild or message.id not in self.sender.relay_map:
+            return
+
+        deleted, failed = await self.sender.delete_global_message(message.id)
+        logger.info(f"🗑️ GlobalChat: Löschung weitergegeben | Nachricht: {message.id} | ✅ {deleted} | ❌ {failed}")
+
 
     # ==================== Slash Commands ====================
 
@@ -881,16 +2528,18 @@ class GlobalChatCog(ezcord.Cog):
 
         try:
             db.set_globalchat_channel(ctx.guild.id, channel.id)
+            self.settings_cache.invalidate(ctx.guild.id, 'globalchat')
             
-            # Cache aktualisieren
-            self._cached_channels = await self.sender._fetch_all_channels()
+            # Registry aktualisieren
+            await self.registry.ensure_loaded()
+            self.registry.add(ctx.guild.id, channel.id)
 
             # UI Container für eine schönere Antwort (falls vorhanden)
             container = Container()
 
             status_text = f"✅ **GlobalChat eingerichtet!**\n\n"
             status_text += f"Der GlobalChat ist nun in {channel.mention} aktiv.\n"
-            status_text += f"Aktuell verbunden: **{len(self._cached_channels)}** Server."
+            status_text += f"Aktuell verbunden: **{len(self.registry)}** Server."
 
             container.add_text(status_text)
             container.add_separator()
@@ -935,14 +2584,18 @@ class GlobalChatCog(ezcord.Cog):
 
         try:
             db.set_globalchat_channel(ctx.guild.id, None)
+            self.settings_cache.invalidate(ctx.guild.id, 'globalchat')
             
-            # Cache aktualisieren
-            self._cached_channels = await self.sender._fetch_all_channels()
+            # Registry aktualisieren
+            await self.registry.ensure_loaded()
+            removed_channel_id = self.registry.remove_guild(ctx.guild.id)
+            if removed_channel_id is not None:
+                self.sender.fanout.forget_channel(removed_channel_id)
 
             await ctx.respond(
                 f"✅ **GlobalChat entfernt!**\n\n"
                 f"Der GlobalChat wurde von diesem Server entfernt.\n"
-                f"Es sind nun noch **{len(self._cached_channels)}** Server verbunden.",
+                f"Es sind nun noch **{len(self.registry)}** Server verbunden.",
                 ephemeral=True
             )
         except Exception as e:
@@ -965,6 +2618,11 @@ class GlobalChatCog(ezcord.Cog):
             required=False, 
             min_value=50, 
             max_value=2000
+        ),
+        filter_words: Optional[str] = Option(
+            str,
+            "Eigene Filterwörter, kommagetrennt (\"-\" entfernt alle)",
+            required=False
         )
     ):
         """Verwaltet Server-spezifische Einstellungen"""
@@ -994,6 +2652,8 @@ class GlobalChatCog(ezcord.Cog):
         if embed_color:
             # Hex-Validierung
             if not re.match(r'^#[0-9a-fA-F]{6}$', embed_color):
+                if updated:
+                    self.settings_cache.invalidate(ctx.guild.id, 'globalchat', 'settings')
                 await ctx.respond("❌ Ungültiger Hex-Farbcode. Erwarte z.B. `#5865F2`.", ephemeral=True)
                 return
             if db.update_guild_setting(ctx.guild.id, 'embed_color', embed_color):
@@ -1003,10 +2663,22 @@ class GlobalChatCog(ezcord.Cog):
             if db.update_guild_setting(ctx.guild.id, 'max_message_length', max_message_length):
                 updated.append(f"Max. Länge: **{max_message_length}** Zeichen")
 
+        if filter_words is not None:
+            words = () if filter_words.strip() == '-' else ContentScanner.normalize_words(filter_words)
+            try:
+                await self._ensure_filter_words_column()
+                if await self.executor.write(DB_PATH, db.update_guild_setting, ctx.guild.id, 'filter_words', ','.join(words) or None):
+                    self.validator.scanner.invalidate(ctx.guild.id)
+                    updated.append(f"Filterwörter: **{len(words)}**" if words else "Filterwörter: entfernt")
+            except Exception as e:
+                logger.error(f"❌ Fehler beim Speichern der Filterwörter: {e}", exc_info=True)
+
         if not updated:
             await ctx.respond("ℹ️ Keine Änderungen vorgenommen.", ephemeral=True)
             return
 
+        self.settings_cache.invalidate(ctx.guild.id, 'globalchat', 'settings')
+
         # Erfolgs-Embed
         embed = discord.Embed(
             title="✅ GlobalChat Einstellungen aktualisiert",
@@ -1026,7 +2698,7 @@ class GlobalChatCog(ezcord.Cog):
         entity_id: str = Option(str, "ID des Users oder Servers (Guild-ID)", required=True),
         entity_type: str = Option(str, "Typ der Entität", choices=["user", "guild"], required=True),
         reason: str = Option(str, "Grund für den Ban", required=True),
-        duration: Optional[int] = Option(int, "Dauer in Stunden (optional, permanent wenn leer)", required=False)
+        duration: Optional[int] = Option(int, "Dauer in Stunden (optional, permanent wenn leer)", required=False, min_value=1)
     ):
         """Bannt eine Entität aus dem GlobalChat"""
         if ctx.author.id not in self.config.BOT_OWNERS:
@@ -1052,6 +2724,14 @@ class GlobalChatCog(ezcord.Cog):
                 await ctx.respond("❌ Fehler beim Bannen!", ephemeral=True)
                 return
 
+            # In-Memory Blacklist direkt aktualisieren (gleiche Ablaufzeit wie in der DB)
+            await self.blacklist.ensure_loaded()
+            self.blacklist.add(
+                entity_type,
+                entity_id_int,
+                datetime.now() + timedelta(hours=duration) if duration else None
+            )
+
             # Success-Response
             duration_text = f"{duration} Stunden" if duration else "Permanent"
             embed = discord.Embed(
@@ -1105,11 +2785,13 @@ class GlobalChatCog(ezcord.Cog):
             return
             
         try:
-            if not db.is_blacklisted(entity_type, entity_id_int):
+            await self.blacklist.ensure_loaded()
+            if not self.blacklist.is_banned(entity_type, entity_id_int):
                 await ctx.respond(f"ℹ️ {entity_type.title()} `{entity_id_int}` ist nicht auf der Blacklist.", ephemeral=True)
                 return
 
             if db.remove_from_blacklist(entity_type, entity_id_int):
+                self.blacklist.remove(entity_type, entity_id_int)
                 embed = discord.Embed(
                     title="🔓 GlobalChat-Unban erfolgreich",
                     description=f"{entity_type.title()} mit ID `{entity_id_int}` wurde von der Blacklist entfernt.",
@@ -1185,7 +2867,8 @@ class GlobalChatCog(ezcord.Cog):
             await ctx.respond("❌ Nur Bot-Owner können diesen Befehl nutzen.", ephemeral=True)
             return
 
-        user_bans, guild_bans = db.get_blacklist_stats()
+        await self.blacklist.ensure_loaded()
+        user_bans, guild_bans = self.blacklist.get_counts()
         active_servers = await self.sender._get_all_active_channels()
 
         embed = discord.Embed(
@@ -1448,9 +3131,8 @@ class GlobalChatCog(ezcord.Cog):
 
         await ctx.defer(ephemeral=True)
         try:
-            old_count = len(self._cached_channels or [])
-            self._cached_channels = await self.sender._fetch_all_channels()
-            new_count = len(self._cached_channels)
+            old_count = len(self.registry)
+            new_count = await self.registry.resync()
 
             await ctx.respond(
                 f"✅ **Cache neu geladen!**\n\n"
@@ -1477,7 +3159,7 @@ class GlobalChatCog(ezcord.Cog):
 
         await ctx.defer(ephemeral=True)
         try:
-            cached_channels = len(self._cached_channels or [])
+            cached_channels = len(self.registry)
             all_settings = db.get_all_guild_settings()
             
             debug_info = (
@@ -1486,15 +3168,56 @@ class GlobalChatCog(ezcord.Cog):
                 f"• Guilds: `{len(self.bot.guilds)}`\n"
                 f"• Uptime: `<t:{int(self.bot.start_time.timestamp())}:R>`\n\n"
                 f"**GlobalChat-Status:**\n"
-                f"• Aktive Channels (Cache): `{cached_channels}`\n"
+                f"• Aktive Channels (Registry): `{cached_channels}`\n"
                 f"• DB Settings Einträge: `{len(all_settings)}`\n"
                 f"• Cleanup Task: `{'Aktiv' if self.cleanup_task.is_running() else 'Inaktiv'}`\n"
             )
 
             # Beispiel für Blacklist-Info
-            user_bans, guild_bans = db.get_blacklist_stats()
+            await self.blacklist.ensure_loaded()
+            user_bans, guild_bans = self.blacklist.get_counts()
+            debug_info += (
+                f"• Gebannte User/Server: `{user_bans} / {guild_bans}`\n\n"
+            )
+
+            # Fan-out Statistiken
+            fanout = self.sender.fanout.get_stats()
+            latency = fanout['latency']
+            debug_info += (
+                f"**Fan-out:**\n"
+                f"• Zugestellt/Fehlgeschlagen: `{fanout['delivered']} / {fanout['failed']}`\n"
+                f"• Retries/Rate-Limits: `{fanout['retries']} / {fanout['rate_limited']}`\n"
+                f"• Webhooks (Cache/Sends): `{fanout['webhooks_cached']} / {fanout['webhook_sends']}`\n"
+                f"• Latenz p50/p95/max: `{latency['p50_ms']:.0f} / {latency['p95_ms']:.0f} / {latency['max_ms']:.0f} ms`\n"
+            )
+
+            broker = self.sender.broker.get_stats()
+            debug_info += (
+                f"• Broker: `{broker['backend']}` ({'mehrere Prozesse' if broker['remote'] else 'lokal'}), "
+                f"`{broker['published']} / {broker['received']} / {broker['errors']}` gesendet/empfangen/Fehler\n\n"
+            )
+
+            relay = self.relay.get_stats()
+            debug_info += (
+                f"**Anhänge:**\n"
+                f"• Direkt/CDN-Link/Relay: `{relay['direct']} / {relay['linked_cdn']} / {relay['relayed']}`\n"
+                f"• Relay-Fehler: `{relay['relay_failures']}`\n"
+            )
+
+            author_cache = self.embed_builder.get_cache_stats()
+            debug_info += (
+                f"• Author-Cache: `{author_cache['size']}` Einträge, `{author_cache['hits']} / {author_cache['misses']}` Hits/Misses\n"
+            )
+
+            relay_map = self.sender.relay_map.get_stats()
+            debug_info += (
+                f"• Relay-Map: `{relay_map['messages']}` Nachrichten, `{relay_map['memory_kb'] / 1024:.1f} MB`\n"
+            )
+
+            downloads = self.downloader.get_stats()
             debug_info += (
-                f"• Gebannte User/Server: `{user_bans} / {guild_bans}`"
+                f"• Downloads RAM/Spool/Fehler: `{downloads['in_memory']} / {downloads['spooled']} / {downloads['failed']}`\n"
+                f"• Speicherbudget: `{downloads['memory_used_mb']:.1f} / {downloads['memory_budget_mb']:.0f} MB`"
             )
 
             embed = discord.Embed(
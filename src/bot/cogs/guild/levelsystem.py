@@ -5,19 +5,487 @@ from discord.ext import commands, tasks
 import time
 import random
 from DevTools import LevelDatabase
+from src.bot.core.settings_cache import get_guild_cache
+from src.bot.core.db_executor import get_db_executor
 import asyncio
 import io
 import csv
-from typing import Optional
+import logging
+import sqlite3
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 from discord.ui import Container
 
+logger = logging.getLogger(__name__)
+
+
+class XPLedger:
+    """
+    Write-behind Puffer für XP-Vergaben.
+
+    Hält pro (guild_id, user_id) den aktuellen XP-/Level-Stand im Speicher,
+    berechnet Level-Ups lokal und schreibt die gesammelten Deltas gebündelt
+    in einer einzigen ``executemany``-Transaktion in die Datenbank.
+    """
+
+    FLUSH_INTERVAL = 10       # Sekunden zwischen zwei Flushes
+    MAX_PENDING = 500         # Flush sobald so viele User ausstehen
+    IDLE_TTL = 3600           # Stand inaktiver User nach 1h verwerfen
+
+    UPSERT_SQL = '''
+        INSERT INTO user_levels (user_id, guild_id, xp, level, messages, last_message, total_xp_earned)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(user_id, guild_id) DO UPDATE SET
+            xp = xp + excluded.xp,
+            level = excluded.level,
+            messages = messages + excluded.messages,
+            last_message = excluded.last_message,
+            total_xp_earned = total_xp_earned + excluded.total_xp_earned
+    '''
+
+    def __init__(self, db: LevelDatabase, executor):
+        self.db = db
+        self.executor = executor
+        # (guild_id, user_id) -> [xp, level, zuletzt_aktiv] inkl. ungeschriebener Deltas
+        self._state: Dict[Tuple[int, int], List] = {}
+        # (guild_id, user_id) -> [xp_delta, nachrichten, last_message]
+        self._pending: Dict[Tuple[int, int], List] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        # (guild_id, user_id) -> Event, solange eine Admin-Änderung für den User läuft
+        self._paused: Dict[Tuple[int, int], asyncio.Event] = {}
+
+    async def add(self, guild_id: int, user_id: int, xp_amount: int, timestamp: float) -> Tuple[bool, int]:
+        """
+        Vergibt XP und prüft lokal auf Level-Up.
+
+        Returns:
+            Tuple[bool, int]: (Level-Up erfolgt, aktuelles Level)
+        """
+        key = (guild_id, user_id)
+        while True:
+            paused = self._paused.get(key)
+            if paused is not None:
+                # Admin-Änderung abwarten, danach neu aus der DB laden
+                await paused.wait()
+                continue
+            state = self._state.get(key)
+            if state is not None:
+                break
+            row = await self.executor.fetchone(
+                self.db.db_path,
+                'SELECT xp, level FROM user_levels WHERE user_id = ? AND guild_id = ?',
+                (user_id, guild_id)
+            )
+            if key in self._paused:
+                # Während des Ladens begann eine Admin-Änderung, der Stand ist veraltet
+                continue
+            # Während des Ladens evtl. schon von einer anderen Nachricht angelegt
+            state = self._state.setdefault(key, [row[0], row[1], timestamp] if row else [0, 0, timestamp])
+            break
+
+        old_level = state[1]
+        state[0] += xp_amount
+        state[2] = timestamp
+
+        new_level = old_level
+        while state[0] >= self.db.xp_for_level(new_level + 1):
+            new_level += 1
+        state[1] = new_level
+
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = [xp_amount, 1, timestamp]
+        else:
+            pending[0] += xp_amount
+            pending[1] += 1
+            pending[2] = timestamp
+
+        if len(self._pending) >= self.MAX_PENDING and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_logged())
+
+        return new_level > old_level, new_level
+
+    def get_state(self, guild_id: int, user_id: int) -> Optional[Tuple[int, int]]:
+        """Aktueller (xp, level) Stand inkl. ungeschriebener Deltas"""
+        state = self._state.get((guild_id, user_id))
+        return (state[0], state[1]) if state else None
+
+    def pending_for_guild(self, guild_id: int) -> Dict[int, Tuple[int, int, int]]:
+        """user_id -> (xp, level, ausstehende Nachrichten) für alle gepufferten User eines Servers"""
+        result = {}
+        for (pending_guild, user_id), pending in self._pending.items():
+            state = self._state.get((pending_guild, user_id))
+            if pending_guild == guild_id and state is not None:
+                result[user_id] = (state[0], state[1], pending[1])
+        return result
+
+    async def _flush_logged(self):
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Fehler beim Schreiben der XP: {e}")
+
+    def _take_rows(self) -> List[tuple]:
+        """Entnimmt alle ausstehenden Deltas als Parameter-Tupel für UPSERT_SQL"""
+        pending, self._pending = self._pending, {}
+        rows = []
+        for (guild_id, user_id), (xp_delta, messages, last_message) in pending.items():
+            state = self._state.get((guild_id, user_id))
+            level = state[1] if state else self.db.calculate_level(xp_delta)
+            rows.append((user_id, guild_id, xp_delta, level, messages, last_message, xp_delta))
+        return rows
+
+    def _restore_rows(self, rows: List[tuple]):
+        """Legt nicht geschriebene Deltas nach einem Fehler zurück in den Puffer"""
+        for user_id, guild_id, xp_delta, _, messages, last_message, _ in rows:
+            pending = self._pending.setdefault((guild_id, user_id), [0, 0, last_message])
+            pending[0] += xp_delta
+            pending[1] += messages
+            pending[2] = max(pending[2], last_message)
+
+    async def flush(self) -> int:
+        """
+        Schreibt alle ausstehenden Deltas in einer Transaktion.
+
+        Returns:
+            int: Anzahl geschriebener User-Zeilen
+        """
+        async with self._flush_lock:
+            rows = self._take_rows()
+            if not rows:
+                return 0
+            try:
+                await self.executor.execute(self.db.db_path, self.UPSERT_SQL, rows, many=True)
+            except Exception:
+                self._restore_rows(rows)
+                raise
+
+            self._evict_idle()
+            return len(rows)
+
+    @asynccontextmanager
+    async def flush_guard(self):
+        """
+        Hält Flushes an, solange der Block läuft.
+
+        Innerhalb des Blocks passen DB-Stand und ``pending_for_guild()``
+        exakt zusammen, z.B. für ``LevelRanking.ensure_loaded``.
+        """
+        async with self._flush_lock:
+            yield
+
+    def flush_sync(self) -> int:
+        """Blockierender Flush für cog_unload / Shutdown, wenn kein Event-Loop mehr läuft"""
+        rows = self._take_rows()
+        if not rows:
+            return 0
+        self._execute_sync(self.UPSERT_SQL, rows, many=True)
+        return len(rows)
+
+    async def run_admin(self, guild_id: int, user_id: int, func: Callable[..., Any], *args) -> Any:
+        """
+        Führt eine Admin-Änderung an einem User (Level setzen, XP, Reset,
+        Prestige) atomar mit Flush und ``forget()`` aus.
+
+        Unter dem Flush-Lock werden alle ausstehenden Deltas entnommen und
+        der Stand des Users verworfen. Deltas und ``func`` laufen im selben
+        Write-Queue-Aufruf. Nachrichten des Users warten in ``add()``, bis
+        die Änderung geschrieben ist, und laden danach den neuen Stand.
+
+        Args:
+            guild_id: Discord Server ID
+            user_id: Betroffener User
+            func: Synchrone Funktion, läuft im DB-Thread
+            *args: Argumente für ``func``
+
+        Returns:
+            Any: Rückgabewert von ``func``
+        """
+        key = (guild_id, user_id)
+        released = asyncio.Event()
+        async with self._flush_lock:
+            rows = self._take_rows()
+            self._paused[key] = released
+            self.forget(guild_id, user_id)
+            try:
+                return await self.executor.write(self.db.db_path, self._write_admin, rows, func, args)
+            except Exception:
+                self._restore_rows(rows)
+                raise
+            finally:
+                del self._paused[key]
+                released.set()
+
+    async def execute_admin(self, guild_id: int, user_id: int, sql: str, params: Sequence = ()) -> int:
+        """``run_admin()`` für ein einzelnes SQL-Statement, gibt die Anzahl geänderter Zeilen zurück"""
+        return await self.run_admin(guild_id, user_id, self._execute_sync, sql, params)
+
+    def _write_admin(self, rows: List[tuple], func: Callable[..., Any], args: tuple) -> Any:
+        if rows:
+            self._execute_sync(self.UPSERT_SQL, rows, many=True)
+        return func(*args)
+
+    def _execute_sync(self, sql: str, params: Sequence, many: bool = False) -> int:
+        conn = sqlite3.connect(self.db.db_path, timeout=30)
+        try:
+            with conn:
+                cursor = conn.executemany(sql, params) if many else conn.execute(sql, params)
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def forget(self, guild_id: int, user_id: Optional[int] = None):
+        """
+        Verwirft den gepufferten Stand, z.B. nachdem der Server zurückgesetzt wurde.
+        Vorher ``flush()`` aufrufen, sonst gehen ausstehende XP verloren; für
+        einzelne User ``run_admin()`` verwenden, das beides atomar erledigt.
+
+        Args:
+            guild_id: Discord Server ID
+            user_id: Nur diesen User verwerfen, sonst den ganzen Server
+        """
+        for store in (self._state, self._pending):
+            if user_id is not None:
+                store.pop((guild_id, user_id), None)
+            else:
+                for key in [k for k in store if k[0] == guild_id]:
+                    del store[key]
+
+    def _evict_idle(self):
+        cutoff = time.time() - self.IDLE_TTL
+        for key in [k for k, state in self._state.items() if state[2] < cutoff and k not in self._pending]:
+            del self._state[key]
+
+
+class _SkipEnd:
+    """Sentinel am Ende der Skip-List, größer als jeder Schlüssel"""
+
+    def __lt__(self, other):
+        return False
+
+    def __le__(self, other):
+        return False
+
+
+class _SkipNode:
+    __slots__ = ('key', 'next', 'width')
+
+    def __init__(self, key, next_nodes, widths):
+        self.key = key
+        self.next = next_nodes
+        self.width = widths
+
+
+_SKIP_NIL = _SkipNode(_SkipEnd(), [], [])
+
+
+class RankedSkipList:
+    """
+    Indizierbare Skip-List: sortiertes Einfügen/Entfernen, Rang und
+    Zugriff per Position jeweils in O(log n).
+
+    ``width[i]`` speichert, wie viele Positionen der Sprung zu ``next[i]``
+    überspringt, daraus ergibt sich der Rang beim Durchlaufen.
+    """
+
+    MAX_LEVELS = 20  # reicht für ~1 Mio. Einträge
+
+    def __init__(self):
+        self.size = 0
+        self.head = _SkipNode(None, [_SKIP_NIL] * self.MAX_LEVELS, [1] * self.MAX_LEVELS)
+
+    def __len__(self):
+        return self.size
+
+    @staticmethod
+    def _random_height() -> int:
+        height = 1
+        while height < RankedSkipList.MAX_LEVELS and random.getrandbits(1):
+            height += 1
+        return height
+
+    def insert(self, key):
+        chain = [None] * self.MAX_LEVELS
+        steps_at_level = [0] * self.MAX_LEVELS
+        node = self.head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level].key <= key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        height = self._random_height()
+        new_node = _SkipNode(key, [None] * height, [None] * height)
+        steps = 0
+        for level in range(height):
+            prev = chain[level]
+            new_node.next[level] = prev.next[level]
+            prev.next[level] = new_node
+            new_node.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(height, self.MAX_LEVELS):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, key):
+        chain = [None] * self.MAX_LEVELS
+        node = self.head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is _SKIP_NIL or target.key != key:
+            raise KeyError(key)
+
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), self.MAX_LEVELS):
+            chain[level].width[level] -= 1
+        self.size -= 1
+
+    def count_less(self, key) -> int:
+        """Anzahl der Einträge, die echt kleiner als ``key`` sind"""
+        position = 0
+        node = self.head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        return position
+
+    def slice(self, start: int, count: int) -> list:
+        """Gibt bis zu ``count`` Schlüssel ab Position ``start`` zurück"""
+        if start >= self.size or count <= 0:
+            return []
+
+        node = self.head
+        remaining = start + 1
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+
+        keys = []
+        while node is not _SKIP_NIL and len(keys) < count:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+class LevelRanking:
+    """
+    In-Memory Rangliste pro Server auf Basis einer :class:`RankedSkipList`.
+
+    Sortiert wie ``LevelDatabase.get_leaderboard`` (Prestige, Level, XP
+    absteigend). Ein Server wird beim ersten Rang-/Leaderboard-Befehl
+    einmalig geladen und danach bei jeder XP-Vergabe aktualisiert.
+    """
+
+    MAX_GUILDS = 200  # geladene Server (LRU)
+
+    def __init__(self, db: LevelDatabase, executor, ledger: XPLedger):
+        self.db = db
+        self.executor = executor
+        self.ledger = ledger
+        # guild_id -> (Skip-List, {user_id: [xp, level, messages, prestige]})
+        self._guilds: "OrderedDict[int, Tuple[RankedSkipList, Dict[int, List[int]]]]" = OrderedDict()
+
+    @staticmethod
+    def _key(user_id: int, entry: List[int]) -> tuple:
+        xp, level, _, prestige = entry
+        return (-prestige, -level, -xp, user_id)
+
+    async def ensure_loaded(self, guild_id: int):
+        """Lädt die Rangliste eines Servers, falls noch nicht im Speicher"""
+        if guild_id in self._guilds:
+            self._guilds.move_to_end(guild_id)
+            return
+
+        # Kein Flush während des Ladens, damit DB-Stand + Puffer exakt zusammenpassen
+        async with self.ledger.flush_guard():
+            if guild_id in self._guilds:
+                return
+            rows = await self.executor.fetchall(
+                self.db.db_path,
+                'SELECT user_id, xp, level, messages, prestige_level FROM user_levels WHERE guild_id = ?',
+                (guild_id,)
+            )
+            entries = {user_id: [xp, level, messages, prestige] for user_id, xp, level, messages, prestige in rows}
+            for user_id, (xp, level, pending_messages) in self.ledger.pending_for_guild(guild_id).items():
+                entry = entries.setdefault(user_id, [0, 0, 0, 0])
+                entry[0] = xp
+                entry[1] = level
+                entry[2] += pending_messages
+
+            index = RankedSkipList()
+            for user_id, entry in entries.items():
+                index.insert(self._key(user_id, entry))
+
+            self._guilds[guild_id] = (index, entries)
+            while len(self._guilds) > self.MAX_GUILDS:
+                self._guilds.popitem(last=False)
+
+    def record(self, guild_id: int, user_id: int, xp: int, level: int, messages: int = 1):
+        """Übernimmt eine XP-Vergabe in die Rangliste (nur wenn der Server geladen ist)"""
+        loaded = self._guilds.get(guild_id)
+        if loaded is None:
+            return
+
+        index, entries = loaded
+        entry = entries.get(user_id)
+        if entry is None:
+            entry = [xp, level, messages, 0]
+            entries[user_id] = entry
+        else:
+            index.remove(self._key(user_id, entry))
+            entry[0] = xp
+            entry[1] = level
+            entry[2] += messages
+        index.insert(self._key(user_id, entry))
+
+    def invalidate(self, guild_id: int):
+        """Verwirft die Rangliste eines Servers, z.B. nach Admin-Änderungen"""
+        self._guilds.pop(guild_id, None)
+
+    def get_rank(self, guild_id: int, user_id: int) -> Optional[int]:
+        """Rang eines Users (gleichstand teilt sich den Rang), ``None`` wenn unbekannt"""
+        index, entries = self._guilds[guild_id]
+        entry = entries.get(user_id)
+        if entry is None:
+            return None
+        xp, level, _, prestige = entry
+        return index.count_less((-prestige, -level, -xp)) + 1
+
+    def get_top(self, guild_id: int, limit: int, offset: int = 0) -> List[Tuple[int, int, int, int, int]]:
+        """Seite der Rangliste als (user_id, xp, level, messages, prestige) wie ``get_leaderboard``"""
+        index, entries = self._guilds[guild_id]
+        result = []
+        for key in index.slice(offset, limit):
+            user_id = key[3]
+            xp, level, messages, prestige = entries[user_id]
+            result.append((user_id, xp, level, messages, prestige))
+        return result
+
+    def get_user_count(self, guild_id: int) -> int:
+        """Anzahl der User mit Leveldaten auf dem Server"""
+        return len(self._guilds[guild_id][0])
+
 
 class PrestigeConfirmView(discord.ui.View):
-    def __init__(self, db, user, guild):
+    def __init__(self, db, user, guild, ledger: XPLedger, ranking: LevelRanking):
         super().__init__(timeout=300)
         self.db = db
         self.user = user
         self.guild = guild
+        self.ledger = ledger
+        self.ranking = ranking
 
     @discord.ui.button(label="Bestätigen", style=discord.ButtonStyle.danger, emoji="⚠️")
     async def confirm_prestige(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -25,7 +493,10 @@ class PrestigeConfirmView(discord.ui.View):
             await interaction.response.send_message("Nur der User kann sein eigenes Prestige bestätigen!", ephemeral=True)
             return
 
-        success = self.db.prestige_user(self.user.id, self.guild.id)
+        success = await self.ledger.run_admin(
+            self.guild.id, self.user.id, self.db.prestige_user, self.user.id, self.guild.id
+        )
+        self.ranking.invalidate(self.guild.id)
         if success:
             embed = discord.Embed(
                 title="✨ Prestige erfolgreich!",
@@ -60,22 +531,38 @@ class LevelSystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = LevelDatabase()
+        self.cache = get_guild_cache(bot)
+        self.executor = get_db_executor(bot)
+        self.ledger = XPLedger(self.db, self.executor)
+        self.ranking = LevelRanking(self.db, self.executor, self.ledger)
         self.xp_cooldowns = {}  # User-ID -> Timestamp
         
         # Starte Background Tasks
         self.cleanup_expired_boosts.start()
         self.cleanup_temporary_roles.start()
+        self.flush_xp_ledger.start()
 
     def cog_unload(self):
         """Cleanup beim Entladen der Cog"""
         self.cleanup_expired_boosts.cancel()
         self.cleanup_temporary_roles.cancel()
+        self.flush_xp_ledger.cancel()
+        # Ausstehende XP nicht verlieren
+        self.ledger.flush_sync()
 
     levelsystem = SlashCommandGroup("levelsystem", "Verwalte das Levelsystem")
     levelrole = SlashCommandGroup("levelrole", "Verwalte Level-Rollen")
     xpboost = SlashCommandGroup("xpboost", "Verwalte XP-Boosts")
     levelconfig = SlashCommandGroup("levelconfig", "Konfiguriere das Levelsystem")
 
+    @tasks.loop(seconds=XPLedger.FLUSH_INTERVAL)
+    async def flush_xp_ledger(self):
+        """Schreibt gepufferte XP gebündelt in die Datenbank"""
+        try:
+            await self.ledger.flush()
+        except Exception as e:
+            logger.error(f"Fehler beim Schreiben der XP: {e}")
+
     @tasks.loop(hours=1)
     async def cleanup_expired_boosts(self):
         """Entfernt abgelaufene XP-Boosts"""
@@ -111,20 +598,33 @@ class LevelSystem(commands.Cog):
         if message.guild is None:
             return
 
+        user_id = message.author.id
+        guild_id = message.guild.id
+        channel_id = message.channel.id
+
         # Prüfe ob Levelsystem aktiviert ist
-        if not self.db.is_levelsystem_enabled(message.guild.id):
+        enabled = await self.cache.get(
+            guild_id, ('levelsystem', 'enabled'),
+            lambda: self.executor.run(self.db.is_levelsystem_enabled, guild_id)
+        )
+        if not enabled:
             return
 
         # Prüfe ob Kanal auf Blacklist steht
-        if self.db.is_channel_blacklisted(message.guild.id, message.channel.id):
+        blacklisted = await self.cache.get(
+            guild_id, ('levelsystem', 'blacklisted', channel_id),
+            lambda: self.executor.run(self.db.is_channel_blacklisted, guild_id, channel_id)
+        )
+        if blacklisted:
             return
 
-        user_id = message.author.id
-        guild_id = message.guild.id
         current_time = time.time()
 
         # Guild-Konfiguration holen
-        config = self.db.get_guild_config(guild_id)
+        config = await self.cache.get(
+            guild_id, ('levelsystem', 'config'),
+            lambda: self.executor.run(self.db.get_guild_config, guild_id)
+        )
         cooldown = config.get('cooldown', 30)
 
         # XP-Cooldown prüfen
@@ -133,25 +633,41 @@ class LevelSystem(commands.Cog):
                 return
 
         # Kanal-spezifischen Multiplikator anwenden
-        channel_multiplier = self.db.get_channel_multiplier(guild_id, message.channel.id)
+        channel_multiplier = await self.cache.get(
+            guild_id, ('levelsystem', 'multiplier', channel_id),
+            lambda: self.executor.run(self.db.get_channel_multiplier, guild_id, channel_id)
+        )
         
+        # Anti-Spam Protection (rein In-Memory)
+        if self.db.anti_spam.is_spam(user_id, current_time):
+            return
+        if message.content and self.db.anti_spam.is_xp_farming(user_id, message.content, current_time):
+            return
+
+        # Aktiver XP-Boost
+        boost_multiplier = await self.cache.get(
+            guild_id, ('levelsystem', 'boost', user_id),
+            lambda: self.executor.run(self.db.get_active_xp_multiplier, guild_id, user_id)
+        )
+
         # XP berechnen
         min_xp = config.get('min_xp', 10)
         max_xp = config.get('max_xp', 20)
         base_xp = random.randint(min_xp, max_xp)
-        final_xp = int(base_xp * channel_multiplier)
-
-        # XP hinzufügen mit Anti-Spam Protection
-        level_up, new_level = self.db.add_xp(user_id, guild_id, final_xp, message.content)
+        final_xp = int(int(base_xp * channel_multiplier) * boost_multiplier)
 
-        if not level_up and new_level == 0:
-            return  # Anti-Spam blockierte die XP
+        # XP im Ledger verbuchen, geschrieben wird gebündelt
+        level_up, new_level = await self.ledger.add(guild_id, user_id, final_xp, current_time)
+        xp_total, _ = self.ledger.get_state(guild_id, user_id)
+        self.ranking.record(guild_id, user_id, xp_total, new_level)
 
         # Cooldown setzen
         self.xp_cooldowns[user_id] = current_time
 
         # Level Up Behandlung
         if level_up:
+            await self.executor.write(self.db.db_path, self.db.check_achievements, user_id, guild_id, new_level)
+
             # Bestimme Zielkanal für Level-Up Nachrichten
             target_channel = message.channel
             level_up_channel_id = config.get('level_up_channel')
@@ -165,7 +681,7 @@ class LevelSystem(commands.Cog):
             await target_channel.send(embed=embed)
 
             # Level-Rolle vergeben
-            role_id = self.db.get_role_for_level(guild_id, new_level)
+            role_id = await self.executor.run(self.db.get_role_for_level, guild_id, new_level)
             if role_id:
                 role = message.guild.get_role(role_id)
                 if role:
@@ -194,7 +710,8 @@ class LevelSystem(commands.Cog):
             await ctx.respond(embed=embed)
             return
 
-        leaderboard_data = self.db.get_leaderboard(ctx.guild.id, anzahl)
+        await self.ranking.ensure_loaded(ctx.guild.id)
+        leaderboard_data = self.ranking.get_top(ctx.guild.id, anzahl)
 
         if not leaderboard_data:
             embed = discord.Embed(
@@ -246,6 +763,7 @@ class LevelSystem(commands.Cog):
             return
 
         target_user = user or ctx.author
+        await self.ledger.flush()
         user_stats = self.db.get_user_stats(target_user.id, ctx.guild.id)
 
         if not user_stats:
@@ -258,7 +776,8 @@ class LevelSystem(commands.Cog):
             return
 
         xp, level, messages, xp_needed, prestige, total_earned = user_stats
-        rank = self.db.get_user_rank(target_user.id, ctx.guild.id)
+        await self.ranking.ensure_loaded(ctx.guild.id)
+        rank = self.ranking.get_rank(ctx.guild.id, target_user.id)
 
         embed = discord.Embed(
             title=f"📊 Profil von {target_user.display_name}",
@@ -269,7 +788,7 @@ class LevelSystem(commands.Cog):
         # Erste Zeile
         embed.add_field(name="🏆 Level", value=str(level), inline=True)
         embed.add_field(name="⭐ XP", value=f"{xp:,}", inline=True)
-        embed.add_field(name="📈 Rang", value=f"#{rank}", inline=True)
+        embed.add_field(name="📈 Rang", value=f"#{rank}" if rank else "-", inline=True)
 
         # Zweite Zeile  
         embed.add_field(name="💬 Nachrichten", value=f"{messages:,}", inline=True)
@@ -328,6 +847,7 @@ class LevelSystem(commands.Cog):
             await ctx.respond(embed=embed, ephemeral=True)
             return
 
+        await self.ledger.flush()
         user_stats = self.db.get_user_stats(ctx.author.id, ctx.guild.id)
         min_level = config.get('prestige_min_level', 50)
         
@@ -341,7 +861,7 @@ class LevelSystem(commands.Cog):
             return
 
         # Bestätigung erforderlich
-        view = PrestigeConfirmView(self.db, ctx.author, ctx.guild)
+        view = PrestigeConfirmView(self.db, ctx.author, ctx.guild, self.ledger, self.ranking)
         embed = discord.Embed(
             title="⚠️ Prestige Bestätigung",
             description=f"Möchtest du wirklich dein Level zurücksetzen?\n\n**Was passiert:**\n• Dein Level wird auf 0 zurückgesetzt\n• Deine XP werden auf 0 zurückgesetzt\n• Du erhältst einen Prestige-Rang (⭐)\n• Du behältst deine Nachrichten-Anzahl\n\n**Aktuelles Level:** {user_stats[1]}",
@@ -361,6 +881,7 @@ class LevelSystem(commands.Cog):
             await ctx.respond(embed=embed, ephemeral=True)
             return
 
+        await self.ledger.flush()
         analytics = self.db.get_detailed_analytics(ctx.guild.id)
 
         embed = discord.Embed(
@@ -406,6 +927,7 @@ class LevelSystem(commands.Cog):
 
         await ctx.defer(ephemeral=True)
 
+        await self.ledger.flush()
         data = self.db.export_guild_data(ctx.guild.id)
 
         output = io.StringIO()
@@ -618,6 +1140,7 @@ class LevelSystem(commands.Cog):
                          dauer_stunden: discord.Option(int, "Dauer in Stunden", min_value=1, max_value=168)):
         
         self.db.add_xp_boost(ctx.guild.id, None, multiplier, dauer_stunden)
+        self.cache.invalidate(ctx.guild.id, 'levelsystem', 'boost')
         
         embed = discord.Embed(
             title="🚀 Globaler XP-Boost aktiviert",
@@ -636,6 +1159,7 @@ class LevelSystem(commands.Cog):
                        dauer_stunden: discord.Option(int, "Dauer in Stunden", min_value=1, max_value=168)):
         
         self.db.add_xp_boost(ctx.guild.id, user.id, multiplier, dauer_stunden)
+        self.cache.invalidate(ctx.guild.id, 'levelsystem', 'boost', user.id)
         
         embed = discord.Embed(
             title="🚀 Persönlicher XP-Boost aktiviert",
@@ -670,6 +1194,7 @@ class LevelSystem(commands.Cog):
             return
         
         self.db.set_guild_config(ctx.guild.id, **config_updates)
+        self.cache.invalidate(ctx.guild.id, 'levelsystem', 'config')
         
         current_config = self.db.get_guild_config(ctx.guild.id)
         
@@ -690,6 +1215,7 @@ class LevelSystem(commands.Cog):
                                 multiplier: discord.Option(float, "Multiplikator (0.0 = keine XP)", min_value=0.0, max_value=5.0)):
         
         self.db.set_channel_multiplier(ctx.guild.id, channel.id, multiplier)
+        self.cache.invalidate(ctx.guild.id, 'levelsystem', 'multiplier', channel.id)
         
         if multiplier == 0:
             description = f"{channel.mention} gibt keine XP mehr."
@@ -711,6 +1237,7 @@ class LevelSystem(commands.Cog):
                                channel: discord.Option(discord.TextChannel, "Kanal zum Ausschließen")):
         
         self.db.add_blacklisted_channel(ctx.guild.id, channel.id)
+        self.cache.invalidate(ctx.guild.id, 'levelsystem', 'blacklisted', channel.id)
         
         embed = discord.Embed(
             title="✅ Kanal ausgeschlossen",
@@ -726,6 +1253,7 @@ class LevelSystem(commands.Cog):
         
         if channel:
             self.db.set_guild_config(ctx.guild.id, level_up_channel=channel.id)
+            self.cache.invalidate(ctx.guild.id, 'levelsystem', 'config')
             embed = discord.Embed(
                 title="✅ Level-Up Kanal gesetzt",
                 description=f"Level-Up Nachrichten werden in {channel.mention} gesendet.",
@@ -733,6 +1261,7 @@ class LevelSystem(commands.Cog):
             )
         else:
             self.db.set_guild_config(ctx.guild.id, level_up_channel=None)
+            self.cache.invalidate(ctx.guild.id, 'levelsystem', 'config')
             embed = discord.Embed(
                 title="✅ Level-Up Kanal zurückgesetzt",
                 description="Level-Up Nachrichten werden wieder im ursprünglichen Kanal gesendet.",
@@ -748,6 +1277,7 @@ class LevelSystem(commands.Cog):
                                min_level: discord.Option(int, "Minimum Level für Prestige", default=50, min_value=10, max_value=200)):
         
         self.db.set_guild_config(ctx.guild.id, prestige_enabled=aktiviert, prestige_min_level=min_level)
+        self.cache.invalidate(ctx.guild.id, 'levelsystem', 'config')
         
         embed = discord.Embed(
             title="✅ Prestige-Einstellungen aktualisiert",
@@ -775,6 +1305,7 @@ class LevelSystem(commands.Cog):
             return
 
         self.db.set_levelsystem_enabled(ctx.guild.id, True)
+        self.cache.invalidate(ctx.guild.id, 'levelsystem', 'enabled')
 
         embed = discord.Embed(
             title="✅ Levelsystem aktiviert",
@@ -796,6 +1327,7 @@ class LevelSystem(commands.Cog):
             return
 
         self.db.set_levelsystem_enabled(ctx.guild.id, False)
+        self.cache.invalidate(ctx.guild.id, 'levelsystem', 'enabled')
 
         embed = discord.Embed(
             title="✅ Levelsystem deaktiviert",
@@ -827,9 +1359,10 @@ class LevelSystem(commands.Cog):
             )
 
             # Statistiken
-            leaderboard = self.db.get_leaderboard(ctx.guild.id, 1)
+            await self.ranking.ensure_loaded(ctx.guild.id)
+            leaderboard = self.ranking.get_top(ctx.guild.id, 1)
             level_roles = self.db.get_level_roles(ctx.guild.id)
-            total_users = len(self.db.get_leaderboard(ctx.guild.id, 1000))
+            total_users = self.ranking.get_user_count(ctx.guild.id)
 
             embed.add_field(
                 name="📈 Statistiken",
@@ -872,21 +1405,14 @@ class LevelSystem(commands.Cog):
         required_xp = self.db.xp_for_level(level)
         
         # User in Datenbank erstellen/aktualisieren
-        conn = self.db.db_path
-        import sqlite3
-        conn = sqlite3.connect(self.db.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        await self.ledger.execute_admin(ctx.guild.id, user.id, '''
             INSERT OR REPLACE INTO user_levels (user_id, guild_id, xp, level, messages, last_message, total_xp_earned)
             VALUES (?, ?, ?, ?, 
                     COALESCE((SELECT messages FROM user_levels WHERE user_id = ? AND guild_id = ?), 0),
                     ?, 
                     COALESCE((SELECT total_xp_earned FROM user_levels WHERE user_id = ? AND guild_id = ?), 0) + ?)
         ''', (user.id, ctx.guild.id, required_xp, level, user.id, ctx.guild.id, time.time(), user.id, ctx.guild.id, required_xp))
-        
-        conn.commit()
-        conn.close()
+        self.ranking.invalidate(ctx.guild.id)
         
         embed = discord.Embed(
             title="✅ Level gesetzt",
@@ -901,7 +1427,10 @@ class LevelSystem(commands.Cog):
                     user: discord.Option(discord.Member, "Benutzer"),
                     xp_amount: discord.Option(int, "XP-Menge", min_value=1, max_value=100000)):
         
-        level_up, new_level = self.db.add_xp(user.id, ctx.guild.id, xp_amount, "Admin XP Grant")
+        level_up, new_level = await self.ledger.run_admin(
+            ctx.guild.id, user.id, self.db.add_xp, user.id, ctx.guild.id, xp_amount, "Admin XP Grant"
+        )
+        self.ranking.invalidate(ctx.guild.id)
         
         embed = discord.Embed(
             title="✅ XP hinzugefügt",
@@ -920,17 +1449,12 @@ class LevelSystem(commands.Cog):
                           user: discord.Option(discord.Member, "Benutzer"),
                           messages: discord.Option(int, "Anzahl Nachrichten", min_value=0, max_value=1000000)):
         
-        import sqlite3
-        conn = sqlite3.connect(self.db.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        await self.ledger.flush()
+        await self.executor.execute(self.db.db_path, '''
             UPDATE user_levels SET messages = ? 
             WHERE user_id = ? AND guild_id = ?
         ''', (messages, user.id, ctx.guild.id))
-        
-        conn.commit()
-        conn.close()
+        self.ranking.invalidate(ctx.guild.id)
         
         embed = discord.Embed(
             title="✅ Nachrichten-Anzahl gesetzt",
@@ -944,15 +1468,12 @@ class LevelSystem(commands.Cog):
     async def reset_user(self, ctx,
                         user: discord.Option(discord.Member, "Benutzer zum Zurücksetzen")):
         
-        import sqlite3
-        conn = sqlite3.connect(self.db.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM user_levels WHERE user_id = ? AND guild_id = ?', (user.id, ctx.guild.id))
-        
-        affected_rows = cursor.rowcount
-        conn.commit()
-        conn.close()
+        affected_rows = await self.ledger.execute_admin(
+            ctx.guild.id, user.id,
+            'DELETE FROM user_levels WHERE user_id = ? AND guild_id = ?',
+            (user.id, ctx.guild.id)
+        )
+        self.ranking.invalidate(ctx.guild.id)
         
         if affected_rows > 0:
             embed = discord.Embed(
@@ -4,17 +4,557 @@
 import discord
 from discord import SlashCommandGroup
 from discord.ext import commands
-from datetime import datetime, timedelta
-from typing import Dict, Set, Optional, List
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Set, Optional, List, Tuple
+from collections import Counter, deque
+from array import array
 import asyncio
+import gzip
+import heapq
+import io
 import logging
+import mmap
+import time
+import zlib
 
 # Import our separate database class
 from DevTools import LoggingDatabase
+from src.bot.core.settings_cache import get_guild_cache
+from src.bot.core.db_executor import get_db_executor
+from src.bot.core.join_shield import get_join_shield
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+
+class LogDispatcher:
+    """
+    Sammelt Log-Embeds pro (Guild, Log-Typ) und sendet sie gebündelt.
+
+    Eine Nachricht enthält bis zu 10 Embeds (max. 6000 Zeichen insgesamt)
+    und höchstens eine Datei. Gesendet wird nach einem kurzen Zeitfenster
+    oder sofort, sobald die Queue voll ist. Die Reihenfolge pro Queue
+    bleibt erhalten.
+    """
+
+    MAX_EMBEDS = 10
+    MAX_TOTAL_CHARS = 6000
+
+    def __init__(self, send_batch: Callable[[int, str, List[discord.Embed], Optional[discord.File]], Awaitable[None]],
+                 window: float = 1.0, max_queue: int = 500):
+        self._send_batch = send_batch
+        self.window = window
+        self.max_queue = max_queue
+
+        self._queues: Dict[Tuple[int, str], deque] = {}
+        self._tasks: Dict[Tuple[int, str], asyncio.Task] = {}
+        self._wakeups: Dict[Tuple[int, str], asyncio.Event] = {}
+        self._closing = False
+
+        self._stats = {
+            'queued': 0,
+            'batches': 0,
+            'dropped': 0,
+        }
+
+    def submit(self, guild_id: int, log_type: str, embed: discord.Embed, file: Optional[discord.File] = None):
+        """Reiht ein Embed (optional mit Datei) ein, ohne auf den Versand zu warten"""
+        key = (guild_id, log_type)
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = deque()
+
+        if len(queue) >= self.max_queue:
+            # Bei extremen Bursts die ältesten Logs verwerfen statt unbegrenzt zu wachsen
+            queue.popleft()
+            self._stats['dropped'] += 1
+        queue.append((embed, file))
+        self._stats['queued'] += 1
+
+        task = self._tasks.get(key)
+        if task is None or task.done():
+            self._wakeups[key] = asyncio.Event()
+            self._tasks[key] = asyncio.create_task(self._drain(key))
+        elif len(queue) >= self.MAX_EMBEDS:
+            self._wakeups[key].set()
+
+    async def _drain(self, key: Tuple[int, str]):
+        """Leert eine Queue in Batches; endet, sobald sie leer ist"""
+        queue = self._queues[key]
+        wakeup = self._wakeups[key]
+        try:
+            while queue:
+                if len(queue) < self.MAX_EMBEDS and not self._closing:
+                    # Kurz auf weitere Events warten, außer die Queue wird vorher voll
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), self.window)
+                    except asyncio.TimeoutError:
+                        pass
+                wakeup.clear()
+
+                batch, file = self._take_batch(queue)
+                try:
+                    await self._send_batch(key[0], key[1], batch, file)
+                    self._stats['batches'] += 1
+                except Exception as e:
+                    logger.error(f"Log batch for guild {key[0]} ({key[1]}) failed: {e}")
+        finally:
+            self._tasks.pop(key, None)
+            self._wakeups.pop(key, None)
+            if not queue:
+                self._queues.pop(key, None)
+
+    def _take_batch(self, queue: deque) -> Tuple[List[discord.Embed], Optional[discord.File]]:
+        embed, file = queue.popleft()
+        batch = [embed]
+        total = len(embed)
+        while queue and len(batch) < self.MAX_EMBEDS:
+            next_embed, next_file = queue[0]
+            size = len(next_embed)
+            if total + size > self.MAX_TOTAL_CHARS or (file is not None and next_file is not None):
+                break
+            queue.popleft()
+            batch.append(next_embed)
+            file = file or next_file
+            total += size
+        return batch, file
+
+    def discard(self, guild_id: int, log_type: Optional[str] = None):
+        """Verwirft wartende Logs eines Servers (z.B. wenn der Channel ungültig ist)"""
+        for key in [k for k in self._queues if k[0] == guild_id and log_type in (None, k[1])]:
+            self._queues[key].clear()
+
+    def close(self):
+        """Sendet alle wartenden Logs ohne weiteres Zeitfenster"""
+        self._closing = True
+        for wakeup in self._wakeups.values():
+            wakeup.set()
+
+    def get_stats(self) -> dict:
+        return {
+            **self._stats,
+            'pending': sum(len(queue) for queue in self._queues.values()),
+            'queues': len(self._queues),
+        }
+
+class EditDebouncer:
+    """
+    Verzögert Edit-Logs aller Nachrichten über einen Heap und eine Coroutine.
+
+    Pro Nachricht gibt es einen Eintrag: das erste ``before`` und das
+    neueste ``after``. Jede weitere Bearbeitung verschiebt nur die Fälligkeit;
+    der Heap-Eintrag wird beim Abarbeiten lazy neu einsortiert.
+    """
+
+    def __init__(self, delay: float, callback: Callable[[discord.Message, discord.Message], Awaitable[None]]):
+        self.delay = delay
+        self._callback = callback
+        # message_id -> [before, after, fällig_um]
+        self._pending: Dict[int, list] = {}
+        self._heap: List[Tuple[float, int]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def push(self, before: discord.Message, after: discord.Message):
+        """Plant das Edit-Log bzw. verlängert die Wartezeit einer laufenden Bearbeitung"""
+        due = time.monotonic() + self.delay
+        entry = self._pending.get(before.id)
+        if entry is not None:
+            entry[1] = after
+            entry[2] = due
+            return
+
+        self._pending[before.id] = [before, after, due]
+        heapq.heappush(self._heap, (due, before.id))
+
+        if self._runner is None or self._runner.done():
+            self._wakeup = asyncio.Event()
+            self._runner = asyncio.create_task(self._run())
+        elif len(self._heap) == 1:
+            # Feste Verzögerung: neue Einträge sind nie früher fällig als ein vorhandener
+            self._wakeup.set()
+
+    async def _run(self):
+        heap = self._heap
+        while True:
+            if not heap:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            due, message_id = heap[0]
+            wait = due - time.monotonic()
+            if wait > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            heapq.heappop(heap)
+            entry = self._pending.get(message_id)
+            if entry is None:
+                continue
+            if entry[2] > due:
+                # Zwischenzeit erneut bearbeitet
+                heapq.heappush(heap, (entry[2], message_id))
+                continue
+
+            del self._pending[message_id]
+            try:
+                await self._callback(entry[0], entry[1])
+            except Exception as e:
+                logger.error(f"Error in delayed edit log: {e}")
+
+    def close(self):
+        if self._runner is not None:
+            self._runner.cancel()
+        self._pending.clear()
+        self._heap.clear()
+
+
+class StoredMessage:
+    """Aus dem MessageContentStore gelesene Nachricht (ohne Discord-Objekte)"""
+
+    __slots__ = ('id', 'guild_id', 'channel_id', 'author_id', 'author_name', 'content', 'attachments', 'created_at')
+
+    def __init__(self, message_id: int, guild_id: int, channel_id: int, author_id: int,
+                 author_name: str, content: str, attachments: List[str], created_at: datetime):
+        self.id = message_id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.author_id = author_id
+        self.author_name = author_name
+        self.content = content
+        self.attachments = attachments
+        self.created_at = created_at
+
+    @classmethod
+    def from_message(cls, message: discord.Message) -> 'StoredMessage':
+        return cls(
+            message.id, message.guild.id, message.channel.id, message.author.id,
+            str(message.author), message.content or "",
+            [attachment.filename for attachment in message.attachments],
+            message.created_at
+        )
+
+
+class MessageContentStore:
+    """
+    Begrenzter Speicher für Inhalte kürzlich gesendeter Nachrichten.
+
+    Damit lassen sich auch Raw-Events (Nachricht nicht mehr im Cache von
+    discord.py) vollständig loggen. Die Inhalte liegen komprimiert in einem
+    Ringpuffer fester Größe (bytearray oder mmap-Datei), die Metadaten in
+    Arrays. Der Speicherbedarf ist damit fest: ``max_bytes`` plus ca.
+    150 Bytes Index pro Nachricht, höchstens ``max_records`` Nachrichten.
+    """
+
+    COMPRESS_MIN = 64  # Kürzere Inhalte werden unkomprimiert abgelegt
+    _SEP = '\x1f'
+    _SLOT_BYTES = 6 * 8 + 2 * 4 + 1
+
+    def __init__(self, max_bytes: int, max_records: int, max_age: float, path: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.max_records = max_records
+        self.max_age = max_age
+
+        self._file = None
+        if path:
+            # Inhalte in eine Datei auslagern, das Betriebssystem verwaltet den Page-Cache
+            self._file = open(path, 'w+b')
+            self._file.truncate(max_bytes)
+            self._arena = mmap.mmap(self._file.fileno(), max_bytes)
+        else:
+            self._arena = bytearray(max_bytes)
+        self._write_pos = 0
+
+        # Metadaten als Ring von Slots, ältester Eintrag bei self._first
+        self._message_ids = array('q', bytes(8 * max_records))
+        self._guild_ids = array('q', bytes(8 * max_records))
+        self._channel_ids = array('q', bytes(8 * max_records))
+        self._author_ids = array('q', bytes(8 * max_records))
+        self._created = array('d', bytes(8 * max_records))
+        self._stored_at = array('d', bytes(8 * max_records))
+        self._offsets = array('I', bytes(4 * max_records))
+        self._lengths = array('I', bytes(4 * max_records))
+        self._compressed = array('b', bytes(max_records))
+        self._first = 0
+        self._count = 0
+        # message_id -> Slot (entfernte Nachrichten bleiben bis zur Verdrängung als Lücke)
+        self._index: Dict[int, int] = {}
+
+        self._stats = {'stored': 0, 'evicted': 0, 'hits': 0, 'misses': 0}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, message_id: int) -> bool:
+        return message_id in self._index
+
+    def add(self, message: discord.Message):
+        """Legt Inhalt und Metadaten einer Nachricht ab"""
+        self._store(
+            message.id, message.guild.id, message.channel.id, message.author.id,
+            str(message.author), message.content or "",
+            [attachment.filename for attachment in message.attachments],
+            message.created_at.timestamp()
+        )
+
+    def update_content(self, message_id: int, content: str):
+        """Ersetzt den Inhalt nach einer Bearbeitung (wird als neuer Eintrag abgelegt)"""
+        stored = self.get(message_id)
+        if stored is None:
+            return
+        self._store(
+            message_id, stored.guild_id, stored.channel_id, stored.author_id,
+            stored.author_name, content, stored.attachments, stored.created_at.timestamp()
+        )
+
+    def get(self, message_id: int) -> Optional[StoredMessage]:
+        """Liest eine Nachricht; None wenn unbekannt, verdrängt oder abgelaufen"""
+        self._expire()
+        slot = self._index.get(message_id)
+        if slot is None:
+            self._stats['misses'] += 1
+            return None
+        self._stats['hits'] += 1
+
+        offset = self._offsets[slot]
+        data = bytes(self._arena[offset:offset + self._lengths[slot]])
+        if self._compressed[slot]:
+            data = zlib.decompress(data)
+        author_name, content, attachments = data.decode('utf-8').split(self._SEP, 2)
+
+        return StoredMessage(
+            message_id,
+            self._guild_ids[slot],
+            self._channel_ids[slot],
+            self._author_ids[slot],
+            author_name,
+            content,
+            attachments.split(self._SEP) if attachments else [],
+            datetime.fromtimestamp(self._created[slot], tz=timezone.utc)
+        )
+
+    def pop(self, message_id: int) -> Optional[StoredMessage]:
+        """Liest und entfernt eine Nachricht (z.B. nach dem Löschen)"""
+        stored = self.get(message_id)
+        self._index.pop(message_id, None)
+        return stored
+
+    def discard_guild(self, guild_id: int):
+        """Entfernt alle Einträge eines Servers aus dem Index (z.B. nach Opt-out)"""
+        for message_id in [mid for mid, slot in self._index.items() if self._guild_ids[slot] == guild_id]:
+            del self._index[message_id]
+
+    def _store(self, message_id: int, guild_id: int, channel_id: int, author_id: int,
+               author_name: str, content: str, attachments: List[str], created_at: float):
+        data = self._SEP.join((author_name.replace(self._SEP, ' '), content, self._SEP.join(attachments))).encode('utf-8')
+        compressed = False
+        if len(data) >= self.COMPRESS_MIN:
+            packed = zlib.compress(data, 6)
+            if len(packed) < len(data):
+                data, compressed = packed, True
+        if len(data) > self.max_bytes // 16:
+            # Einzelne Riesen-Nachrichten würden den halben Puffer verdrängen
+            return
+
+        self._expire()
+        if self._count == self.max_records:
+            self._evict_first()
+        offset = self._allocate(len(data))
+        self._arena[offset:offset + len(data)] = data
+
+        slot = (self._first + self._count) % self.max_records
+        self._message_ids[slot] = message_id
+        self._guild_ids[slot] = guild_id
+        self._channel_ids[slot] = channel_id
+        self._author_ids[slot] = author_id
+        self._created[slot] = created_at
+        self._stored_at[slot] = time.time()
+        self._offsets[slot] = offset
+        self._lengths[slot] = len(data)
+        self._compressed[slot] = 1 if compressed else 0
+        self._count += 1
+        self._index[message_id] = slot
+        self._stats['stored'] += 1
+
+    def _allocate(self, size: int) -> int:
+        """Reserviert ``size`` Bytes im Ring und verdrängt überschriebene Einträge"""
+        pos = self._write_pos
+        if pos + size > self.max_bytes:
+            # Rest am Ende bleibt frei; die Einträge dort sind die ältesten
+            while self._count and self._offsets[self._first] >= pos:
+                self._evict_first()
+            pos = 0
+
+        end = pos + size
+        while self._count:
+            first = self._first
+            offset = self._offsets[first]
+            if offset < end and pos < offset + self._lengths[first]:
+                self._evict_first()
+            else:
+                break
+
+        self._write_pos = end
+        return pos
+
+    def _evict_first(self):
+        slot = self._first
+        message_id = self._message_ids[slot]
+        # Nur entfernen, wenn der Index noch auf diesen Slot zeigt (nicht nach update_content)
+        if self._index.get(message_id) == slot:
+            del self._index[message_id]
+            self._stats['evicted'] += 1
+        self._first = (slot + 1) % self.max_records
+        self._count -= 1
+
+    def _expire(self):
+        oldest_allowed = time.time() - self.max_age
+        while self._count and self._stored_at[self._first] < oldest_allowed:
+            self._evict_first()
+
+    def close(self):
+        if self._file is not None:
+            self._arena.close()
+            self._file.close()
+            self._file = None
+
+    def get_stats(self) -> dict:
+        return {
+            **self._stats,
+            'messages': len(self._index),
+            'buffer_mb': self.max_bytes / (1024 * 1024),
+            'index_mb': self.max_records * self._SLOT_BYTES / (1024 * 1024),
+        }
+
+
+class VoicePresenceIndex:
+    """
+    Kompakter Index der Mitglieder in Voice-Channels.
+
+    Pro Mitglied nur ``(channel_id, flags, since)`` statt des ganzen
+    VoiceState. Einträge werden beim Verlassen sofort entfernt; nach
+    Reconnect/Resume gleicht ``reconcile()`` einmal mit den ``voice_states``
+    der Voice- und Stage-Channels ab.
+    """
+
+    SELF_MUTE = 1
+    SELF_DEAF = 2
+    MUTE = 4
+    DEAF = 8
+    STREAMING = 16
+    VIDEO = 32
+    # ``since`` stammt aus einem Abgleich, der echte Beitritt war früher
+    RECONCILED = 128
+
+    def __init__(self):
+        # guild_id -> member_id -> (channel_id, flags, since)
+        self._guilds: Dict[int, Dict[int, Tuple[int, int, float]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(members) for members in self._guilds.values())
+
+    @classmethod
+    def flags_for(cls, state: discord.VoiceState) -> int:
+        return (
+            (cls.SELF_MUTE if state.self_mute else 0)
+            | (cls.SELF_DEAF if state.self_deaf else 0)
+            | (cls.MUTE if state.mute else 0)
+            | (cls.DEAF if state.deaf else 0)
+            | (cls.STREAMING if state.self_stream else 0)
+            | (cls.VIDEO if state.self_video else 0)
+        )
+
+    def get(self, guild_id: int, member_id: int) -> Optional[Tuple[int, int, float]]:
+        members = self._guilds.get(guild_id)
+        return members.get(member_id) if members else None
+
+    def update(self, guild_id: int, member_id: int, state: discord.VoiceState) -> Optional[Tuple[int, int, float]]:
+        """
+        Übernimmt den neuen VoiceState eines Mitglieds.
+
+        Returns:
+            Optional[Tuple]: Vorheriger Eintrag (None wenn unbekannt)
+        """
+        members = self._guilds.get(guild_id)
+        previous = members.get(member_id) if members else None
+
+        if state.channel is None:
+            if previous is not None:
+                del members[member_id]
+                if not members:
+                    del self._guilds[guild_id]
+            return previous
+
+        if members is None:
+            members = self._guilds[guild_id] = {}
+        channel_id = state.channel.id
+        flags = self.flags_for(state)
+        if previous is not None and previous[0] == channel_id:
+            # Gleicher Channel: Beitrittszeit behalten
+            flags |= previous[1] & self.RECONCILED
+            members[member_id] = (channel_id, flags, previous[2])
+        else:
+            members[member_id] = (channel_id, flags, time.time())
+        return previous
+
+    def reconcile(self, guild: discord.Guild) -> int:
+        """Gleicht einen Server mit den VoiceStates seiner Channels ab (nach Reconnect/Resume)"""
+        previous = self._guilds.get(guild.id, {})
+        now = time.time()
+        members = {}
+        for channel in (*guild.voice_channels, *guild.stage_channels):
+            for member_id, state in channel.voice_states.items():
+                entry = previous.get(member_id)
+                flags = self.flags_for(state)
+                if entry is not None and entry[0] == channel.id:
+                    members[member_id] = (channel.id, flags | (entry[1] & self.RECONCILED), entry[2])
+                else:
+                    members[member_id] = (channel.id, flags | self.RECONCILED, now)
+
+        if members:
+            self._guilds[guild.id] = members
+        else:
+            self._guilds.pop(guild.id, None)
+        return len(members)
+
+    def remove_guild(self, guild_id: int):
+        self._guilds.pop(guild_id, None)
+
+
+class DeleteBurst:
+    """Gleitendes Zeitfenster der Einzel-Löschungen eines Servers"""
+
+    __slots__ = ('times', 'messages', 'channels', 'started', 'flush_handle')
+
+    def __init__(self):
+        self.times: deque = deque()
+        self.messages: List[StoredMessage] = []
+        self.channels: Set[int] = set()
+        self.started: Optional[datetime] = None
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def record(self, now: float, window: float) -> int:
+        """Vermerkt eine Löschung und gibt die Anzahl im Zeitfenster zurück"""
+        times = self.times
+        times.append(now)
+        while now - times[0] > window:
+            times.popleft()
+        return len(times)
+
+    @property
+    def active(self) -> bool:
+        """Bulk-Löschung erkannt, Zusammenfassung steht noch aus"""
+        return self.flush_handle is not None
+
+
 class LoggingCog(commands.Cog):
     """
     Comprehensive Discord logging system with improved performance and features
@@ -23,23 +563,46 @@ class LoggingCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = LoggingDatabase()
+        self.settings_cache = get_guild_cache(bot)
+        self.executor = get_db_executor(bot)
+        self.join_shield = get_join_shield(bot)
+        self.join_shield.add_listener(self._on_join_raid)
 
         # Improved caching system
-        self._edit_tasks: Dict[int, asyncio.Task] = {}
-        self._bulk_deletes: Dict[int, Dict[str, any]] = {}
-        self._voice_cache: Dict[int, Dict[int, Optional[discord.VoiceState]]] = {}
+        self._delete_bursts: Dict[int, DeleteBurst] = {}
+        self.voice_index = VoicePresenceIndex()
         
         # Configuration
         self.config = {
             'edit_debounce_time': 3.0,      # Sekunden
             'bulk_delete_threshold': 3,     # Anzahl für Bulk-Erkennung
             'bulk_delete_window': 2.0,      # Sekunden Zeitfenster
+            'bulk_delete_transcript': True, # Gelöschte Inhalte als .txt.gz an die Zusammenfassung hängen
             'max_content_length': 1500,     # Max Content-Länge in Embeds
             'max_embed_fields': 25,         # Discord Limit
             'cleanup_interval': 300,        # 5 Minuten Cache-Cleanup
             'max_attachment_display': 5,    # Max Attachments in Embed
             'max_role_display': 10,         # Max Roles in Embed
+            'log_batch_window': 1.0,        # Sekunden bis ein Log-Batch gesendet wird
+            'log_queue_limit': 500,         # Max wartende Logs pro Guild und Log-Typ
+            'content_store_mb': 32,         # Ringpuffer für Nachrichteninhalte (nur Opt-in Server)
+            'content_store_max_messages': 200_000,
+            'content_store_max_age': 86400, # Sekunden
+            'content_store_path': None,     # z.B. 'data/message_store.bin' um per mmap auszulagern
         }
+        self.content_store = MessageContentStore(
+            self.config['content_store_mb'] * 1024 * 1024,
+            self.config['content_store_max_messages'],
+            self.config['content_store_max_age'],
+            self.config['content_store_path']
+        )
+        self._content_store_guilds: Set[int] = set()
+        self.edit_debouncer = EditDebouncer(self.config['edit_debounce_time'], self._log_message_edit)
+        self.dispatcher = LogDispatcher(
+            self._send_log_batch,
+            window=self.config['log_batch_window'],
+            max_queue=self.config['log_queue_limit']
+        )
         
         # Performance tracking
         self._stats = {
@@ -59,6 +622,7 @@ class LoggingCog(commands.Cog):
     async def _start_background_tasks(self):
         """Startet Background-Tasks nachdem der Bot bereit ist"""
         await self.bot.wait_until_ready()
+        await self._load_content_store_guilds()
         self._cleanup_task = self.bot.loop.create_task(self._cleanup_loop())
         logger.info("Background tasks started")
 
@@ -69,10 +633,20 @@ class LoggingCog(commands.Cog):
         if self._cleanup_task and not self._cleanup_task.done():
             self._cleanup_task.cancel()
         
-        # Cancel all edit tasks
-        for task in self._edit_tasks.values():
-            if not task.done():
-                task.cancel()
+        # Ausstehende Edit-Logs verwerfen
+        self.edit_debouncer.close()
+        self.content_store.close()
+
+        # Offene Bulk-Zusammenfassungen verwerfen
+        for burst in self._delete_bursts.values():
+            if burst.flush_handle is not None:
+                burst.flush_handle.cancel()
+        self._delete_bursts.clear()
+
+        self.join_shield.remove_listener(self._on_join_raid)
+
+        # Wartende Logs noch senden
+        self.dispatcher.close()
         
         # Close database connection
         self.db.close()
@@ -96,47 +670,16 @@ class LoggingCog(commands.Cog):
         try:
             cleanup_count = 0
             
-            # Edit Tasks bereinigen
-            completed_tasks = [
-                msg_id for msg_id, task in self._edit_tasks.items()
-                if task.done()
+            # Inaktive Delete-Zeitfenster bereinigen
+            now = time.monotonic()
+            expired_guilds = [
+                guild_id for guild_id, burst in self._delete_bursts.items()
+                if not burst.active and (not burst.times or now - burst.times[-1] > self.config['bulk_delete_window'])
             ]
-            for msg_id in completed_tasks:
-                del self._edit_tasks[msg_id]
-                cleanup_count += 1
-
-            # Bulk Delete Cache bereinigen (älter als 5 Minuten)
-            current_time = datetime.utcnow()
-            expired_guilds = []
-            
-            for guild_id, data in self._bulk_deletes.items():
-                if 'timestamp' in data:
-                    age = (current_time - data['timestamp']).total_seconds()
-                    if age > 300:  # 5 Minuten
-                        expired_guilds.append(guild_id)
-            
             for guild_id in expired_guilds:
-                del self._bulk_deletes[guild_id]
+                del self._delete_bursts[guild_id]
                 cleanup_count += 1
 
-            # Voice Cache für offline Mitglieder bereinigen
-            for guild_id in list(self._voice_cache.keys()):
-                guild = self.bot.get_guild(guild_id)
-                if not guild:
-                    del self._voice_cache[guild_id]
-                    cleanup_count += 1
-                    continue
-                
-                offline_members = []
-                for member_id in self._voice_cache[guild_id]:
-                    member = guild.get_member(member_id)
-                    if not member or not member.voice:
-                        offline_members.append(member_id)
-                
-                for member_id in offline_members:
-                    del self._voice_cache[guild_id][member_id]
-                    cleanup_count += 1
-
             if cleanup_count > 0:
                 logger.debug(f"Cache cleanup: {cleanup_count} items removed")
 
@@ -144,18 +687,36 @@ class LoggingCog(commands.Cog):
             logger.error(f"Cache cleanup error: {e}")
             self._stats['errors'] += 1
 
-    async def send_log(self, guild_id: int, embed: discord.Embed, log_type: str = "general") -> bool:
-        """Verbesserte Log-Versendung mit Retry-Logik"""
+    async def _load_content_store_guilds(self):
+        """Lädt die Server, die den Inhalts-Speicher aktiviert haben"""
         try:
-            channel_id = await self.db.get_log_channel(guild_id, log_type)
-            if not channel_id:
-                return False
+            await self.executor.execute(
+                self.db.db_path,
+                "CREATE TABLE IF NOT EXISTS content_store_guilds (guild_id INTEGER PRIMARY KEY)"
+            )
+            rows = await self.executor.fetchall(self.db.db_path, "SELECT guild_id FROM content_store_guilds")
+            self._content_store_guilds = {row[0] for row in rows}
+        except Exception as e:
+            logger.error(f"Error loading content store guilds: {e}")
 
-            channel = self.bot.get_channel(channel_id)
-            if not channel:
-                # Channel nicht mehr vorhanden, aus DB entfernen
-                await self.db.remove_log_channel(guild_id, log_type)
-                logger.warning(f"Removed invalid channel {channel_id} for guild {guild_id}")
+    async def _get_log_channel_id(self, guild_id: int, log_type: str) -> Optional[int]:
+        """Log-Channel aus dem Cache (wird bei set/remove invalidiert)"""
+        return await self.settings_cache.get(
+            guild_id, ('logging', 'channel', log_type),
+            lambda: self.db.get_log_channel(guild_id, log_type)
+        )
+
+    async def _remove_invalid_log_channel(self, guild_id: int, log_type: str):
+        await self.db.remove_log_channel(guild_id, log_type)
+        self.settings_cache.invalidate(guild_id, 'logging')
+        self.dispatcher.discard(guild_id, log_type)
+
+    async def send_log(self, guild_id: int, embed: discord.Embed, log_type: str = "general",
+                       file: Optional[discord.File] = None) -> bool:
+        """Reiht ein Log-Embed ein; gesendet wird gebündelt über den LogDispatcher"""
+        try:
+            channel_id = await self._get_log_channel_id(guild_id, log_type)
+            if not channel_id:
                 return False
 
             # Embed validieren und anpassen
@@ -165,41 +726,68 @@ class LoggingCog(commands.Cog):
                 while len(embed.fields) > 10:
                     embed.remove_field(-1)
 
-            # Embed senden
-            await channel.send(embed=embed)
-            self._stats['logs_sent'] += 1
+            self.dispatcher.submit(guild_id, log_type, embed, file)
             return True
 
+        except Exception as e:
+            logger.error(f"Unexpected error queueing log for guild {guild_id}: {e}")
+            self._stats['errors'] += 1
+
+        return False
+
+    async def _send_log_batch(self, guild_id: int, log_type: str, embeds: List[discord.Embed],
+                              file: Optional[discord.File] = None):
+        """Sendet einen Batch von bis zu 10 Embeds mit einer Nachricht"""
+        channel = None
+        try:
+            channel_id = await self._get_log_channel_id(guild_id, log_type)
+            if not channel_id:
+                return
+
+            channel = self.bot.get_channel(channel_id)
+            if not channel:
+                # Channel nicht mehr vorhanden, aus DB entfernen
+                await self._remove_invalid_log_channel(guild_id, log_type)
+                logger.warning(f"Removed invalid channel {channel_id} for guild {guild_id}")
+                return
+
+            if file is not None:
+                await channel.send(embeds=embeds, file=file)
+            else:
+                await channel.send(embeds=embeds)
+            self._stats['logs_sent'] += len(embeds)
+
         except discord.Forbidden:
             logger.warning(f"No permission for log channel in guild {guild_id}")
-            await self.db.remove_log_channel(guild_id, log_type)
-            return False
+            await self._remove_invalid_log_channel(guild_id, log_type)
         except discord.NotFound:
             logger.warning(f"Log channel not found in guild {guild_id}")
-            await self.db.remove_log_channel(guild_id, log_type)
-            return False
+            await self._remove_invalid_log_channel(guild_id, log_type)
         except discord.HTTPException as e:
             if e.code == 50035:  # Invalid form body
                 logger.error(f"Invalid embed content for guild {guild_id}: {e}")
-                # Fallback embed senden
-                try:
-                    fallback_embed = discord.Embed(
-                        title="⚠️ Log-Fehler",
-                        description="Originale Log-Nachricht konnte nicht angezeigt werden (zu lang oder ungültig)",
-                        color=discord.Color.orange(),
-                        timestamp=datetime.utcnow()
-                    )
-                    await channel.send(embed=fallback_embed)
-                except:
-                    pass
+                # Einzeln senden, damit nur das ungültige Embed verloren geht
+                for embed in embeds:
+                    try:
+                        await channel.send(embed=embed)
+                        self._stats['logs_sent'] += 1
+                    except discord.HTTPException:
+                        try:
+                            fallback_embed = discord.Embed(
+                                title="⚠️ Log-Fehler",
+                                description="Originale Log-Nachricht konnte nicht angezeigt werden (zu lang oder ungültig)",
+                                color=discord.Color.orange(),
+                                timestamp=datetime.utcnow()
+                            )
+                            await channel.send(embed=fallback_embed)
+                        except:
+                            pass
             else:
                 logger.error(f"HTTP error sending log to guild {guild_id}: {e}")
         except Exception as e:
             logger.error(f"Unexpected error sending log to guild {guild_id}: {e}")
             self._stats['errors'] += 1
 
-        return False
-
     def _create_user_embed(self, title: str, user: discord.User, color: discord.Color,
                            extra_fields: Dict[str, str] = None, 
                            description: str = None) -> discord.Embed:
@@ -315,6 +903,7 @@ class LoggingCog(commands.Cog):
                 types = ["general", "moderation", "voice", "messages"]
                 for lt in types:
                     await self.db.set_log_channel(ctx.guild.id, channel.id, lt)
+                self.settings_cache.invalidate(ctx.guild.id, 'logging')
                 
                 embed = discord.Embed(
                     title="✅ Alle Log-Channels gesetzt",
@@ -324,7 +913,8 @@ class LoggingCog(commands.Cog):
                 )
             else:
                 await self.db.set_log_channel(ctx.guild.id, channel.id, log_type)
-                
+                self.settings_cache.invalidate(ctx.guild.id, 'logging', 'channel', log_type)
+
                 embed = discord.Embed(
                     title="✅ Log-Channel gesetzt",
                     description=f"**{log_type.title()}**-Logs werden nun in {channel.mention} gesendet.",
@@ -363,9 +953,13 @@ class LoggingCog(commands.Cog):
         try:
             if log_type == "all":
                 deleted_count = await self.db.remove_all_log_channels(ctx.guild.id)
+                self.settings_cache.invalidate(ctx.guild.id, 'logging')
+                self.dispatcher.discard(ctx.guild.id)
                 description = f"Alle Log-Channels wurden entfernt. ({deleted_count} Einträge)"
             else:
                 deleted_count = await self.db.remove_log_channel(ctx.guild.id, log_type)
+                self.settings_cache.invalidate(ctx.guild.id, 'logging', 'channel', log_type)
+                self.dispatcher.discard(ctx.guild.id, log_type)
                 if deleted_count > 0:
                     description = f"{log_type.title()}-Logging wurde deaktiviert."
                 else:
@@ -436,12 +1030,16 @@ class LoggingCog(commands.Cog):
             )
 
             # Cache Info
-            voice_cache_size = sum(len(vc) for vc in self._voice_cache.values())
+            voice_cache_size = len(self.voice_index)
+            dispatch = self.dispatcher.get_stats()
+            store = self.content_store.get_stats()
             embed.add_field(
                 name="🗄️ Cache Status", 
-                value=f"Edit Tasks: **{len(self._edit_tasks)}**\n" +
-                      f"Bulk Deletes: **{len(self._bulk_deletes)}**\n" +
-                      f"Voice Cache: **{voice_cache_size}**", 
+                value=f"Wartende Edits: **{len(self.edit_debouncer)}**\n" +
+                      f"Bulk Deletes: **{len(self._delete_bursts)}**\n" +
+                      f"Voice Cache: **{voice_cache_size}**\n" +
+                      f"Log-Queue: **{dispatch['pending']}** ({dispatch['batches']:,} Batches)\n" +
+                      f"Inhalts-Speicher: **{store['messages']:,}** Nachrichten", 
                 inline=True
             )
 
@@ -499,6 +1097,51 @@ class LoggingCog(commands.Cog):
             await ctx.respond(embed=embed, ephemeral=True)
             logger.error(f"Error in log_backup: {e}")
 
+    @logging.command(name="content-store", description="Speichert Nachrichteninhalte, um auch alte Nachrichten zu loggen")
+    @discord.default_permissions(administrator=True)
+    async def log_content_store(self, ctx,
+                                aktiv: discord.Option(bool, description="Inhalts-Speicher aktivieren")):
+        """Opt-in für den MessageContentStore"""
+        try:
+            if aktiv:
+                await self.executor.execute(
+                    self.db.db_path,
+                    "INSERT OR IGNORE INTO content_store_guilds (guild_id) VALUES (?)",
+                    (ctx.guild.id,)
+                )
+                self._content_store_guilds.add(ctx.guild.id)
+                description = (
+                    "Neue Nachrichten werden komprimiert zwischengespeichert "
+                    f"(max. {self.config['content_store_max_age'] // 3600}h), damit Löschungen und "
+                    "Bearbeitungen auch nach einem Neustart oder bei alten Nachrichten mit Inhalt geloggt werden."
+                )
+            else:
+                await self.executor.execute(
+                    self.db.db_path,
+                    "DELETE FROM content_store_guilds WHERE guild_id = ?",
+                    (ctx.guild.id,)
+                )
+                self._content_store_guilds.discard(ctx.guild.id)
+                self.content_store.discard_guild(ctx.guild.id)
+                description = "Der Inhalts-Speicher wurde deaktiviert und gespeicherte Inhalte verworfen."
+
+            embed = discord.Embed(
+                title="🗄️ Inhalts-Speicher " + ("aktiviert" if aktiv else "deaktiviert"),
+                description=description,
+                color=discord.Color.green() if aktiv else discord.Color.red()
+            )
+            embed.set_footer(text=f"Konfiguriert von {ctx.author}")
+            await ctx.respond(embed=embed, ephemeral=True)
+
+        except Exception as e:
+            embed = discord.Embed(
+                title="❌ Fehler",
+                description=f"Fehler beim Konfigurieren des Inhalts-Speichers:\n```{str(e)}```",
+                color=discord.Color.red()
+            )
+            await ctx.respond(embed=embed, ephemeral=True)
+            logger.error(f"Error in log_content_store: {e}")
+
     # =============================================================================
     # EVENT HANDLERS - Enhanced
     # =============================================================================
@@ -508,6 +1151,11 @@ class LoggingCog(commands.Cog):
         """Verbessertes Member Join Logging"""
         try:
             self._stats['events_processed'] += 1
+
+            # Während eines Join-Raids nur Zusammenfassungen (siehe _on_join_raid)
+            if self.join_shield.record(member):
+                self.join_shield.suppress()
+                return
             
             account_age = datetime.utcnow() - member.created_at
             age_days = account_age.days
@@ -561,6 +1209,40 @@ class LoggingCog(commands.Cog):
             logger.error(f"Error in on_member_join: {e}")
             self._stats['errors'] += 1
 
+    async def _on_join_raid(self, guild: discord.Guild, event: str, summary: dict):
+        """Loggt Beginn und Ende eines Join-Raids statt jedes einzelnen Beitritts"""
+        try:
+            histogram = "\n".join(
+                f"{label}: **{count}**" for label, count in summary['histogram'].items() if count
+            ) or "Keine Daten"
+
+            if event == "start":
+                embed = discord.Embed(
+                    title="🚨 Join-Raid erkannt",
+                    description=(
+                        f"**{summary['joins']}** Beitritte in {summary['window']:.0f} Sekunden. "
+                        "Einzelne Join-Logs, Welcome-Nachrichten und Autoroles werden bis zum Ende ausgesetzt."
+                    ),
+                    color=discord.Color.dark_red(),
+                    timestamp=datetime.utcnow()
+                )
+            else:
+                embed = discord.Embed(
+                    title="✅ Join-Raid beendet",
+                    description=(
+                        f"**{summary['joins']}** Beitritte in {self._format_duration(summary['duration'])}, "
+                        f"**{summary['deferred']}** zurückgestellte Mitglieder werden nachbearbeitet."
+                    ),
+                    color=discord.Color.green(),
+                    timestamp=datetime.utcnow()
+                )
+            embed.add_field(name="🎂 Konto-Alter", value=histogram, inline=False)
+
+            await self.send_log(guild.id, embed, "general")
+        except Exception as e:
+            logger.error(f"Error logging join raid: {e}")
+            self._stats['errors'] += 1
+
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
         """Verbessertes Member Leave Logging"""
@@ -608,151 +1290,330 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_message_delete(self, message: discord.Message):
-        """Stark verbessertes Message Delete Logging mit Bulk-Detection"""
+        """Message Delete Logging; schnelle Einzel-Löschungen werden zusammengefasst"""
         try:
             if message.author.bot or not message.guild:
                 return
 
             self._stats['events_processed'] += 1
             guild_id = message.guild.id
+            self.content_store.pop(message.id)
 
-            # Bulk Delete Detection
-            current_time = datetime.utcnow()
-            
-            if guild_id not in self._bulk_deletes:
-                self._bulk_deletes[guild_id] = {
-                    'messages': set(),
-                    'timestamp': current_time,
-                    'channels': set()
-                }
-
-            bulk_data = self._bulk_deletes[guild_id]
-            
-            # Reset wenn zu alt
-            if (current_time - bulk_data['timestamp']).total_seconds() > self.config['bulk_delete_window']:
-                bulk_data['messages'].clear()
-                bulk_data['channels'].clear()
-                bulk_data['timestamp'] = current_time
+            # Teil einer Bulk-Löschung? Dann nur in die Zusammenfassung aufnehmen
+            if self._track_delete(StoredMessage.from_message(message)):
+                return
 
-            bulk_data['messages'].add(message.id)
-            bulk_data['channels'].add(message.channel.id)
+            await self.send_log(guild_id, self._build_delete_embed(message), "messages")
 
-            # Kurz warten um weitere Deletes zu erfassen
-            await asyncio.sleep(0.3)
+        except Exception as e:
+            logger.error(f"Error in on_message_delete: {e}")
+            self._stats['errors'] += 1
 
-            # Bulk Delete Check
-            if len(bulk_data['messages']) >= self.config['bulk_delete_threshold']:
-                embed = discord.Embed(
-                    title="🗑️ Bulk-Löschung erkannt",
-                    description=f"**{len(bulk_data['messages'])}** Nachrichten wurden in kurzer Zeit gelöscht",
-                    color=discord.Color.dark_red(),
-                    timestamp=datetime.utcnow()
-                )
-                
-                # Channel Info
-                affected_channels = []
-                for ch_id in bulk_data['channels']:
-                    channel = self.bot.get_channel(ch_id)
-                    if channel:
-                        affected_channels.append(channel.mention)
-                
-                if affected_channels:
-                    embed.add_field(
-                        name="📍 Betroffene Channels", 
-                        value="\n".join(affected_channels[:5]), 
-                        inline=False
-                    )
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        """Füllt den Inhalts-Speicher für Server mit Opt-in"""
+        if not message.guild or message.guild.id not in self._content_store_guilds or message.author.bot:
+            return
+        if message.content or message.attachments:
+            self.content_store.add(message)
 
-                embed.add_field(name="⏱️ Zeitfenster", value=f"< {self.config['bulk_delete_window']}s", inline=True)
-                embed.add_field(name="🔍 Hinweis", value="Mögliche Moderator-Aktion oder Bot-Cleanup", inline=True)
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        """Löschungen nicht gecachter Nachrichten über den Inhalts-Speicher loggen"""
+        try:
+            # Gecachte Nachrichten behandelt on_message_delete
+            if payload.cached_message is not None or not payload.guild_id:
+                return
 
-                await self.send_log(guild_id, embed, "messages")
-                
-                # Cache zurücksetzen
-                bulk_data['messages'].clear()
-                bulk_data['channels'].clear()
+            stored = self.content_store.pop(payload.message_id)
+            if stored is None:
                 return
 
-            # Normale Delete-Behandlung
-            if message.id not in bulk_data['messages']:
-                return  # Bereits als Bulk verarbeitet
+            self._stats['events_processed'] += 1
+            if self._track_delete(stored):
+                return
 
-            embed = discord.Embed(
-                title="🗑️ Nachricht gelöscht",
-                color=discord.Color.red(),
-                timestamp=datetime.utcnow()
-            )
+            await self.send_log(payload.guild_id, self._build_stored_delete_embed(stored), "messages")
 
-            # Author Info
-            embed.add_field(
-                name="👤 Author", 
-                value=f"{message.author.mention}\n`{message.author}`", 
-                inline=True
+        except Exception as e:
+            logger.error(f"Error in on_raw_message_delete: {e}")
+            self._stats['errors'] += 1
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        """Hält den Inhalts-Speicher aktuell und loggt Edits nicht gecachter Nachrichten"""
+        try:
+            if payload.message_id not in self.content_store:
+                return
+            # Embed-Updates (Link-Vorschau) enthalten keinen Inhalt
+            content = payload.data.get('content')
+            if content is None:
+                return
+
+            stored = self.content_store.get(payload.message_id)
+            if stored is None or stored.content == content:
+                return
+
+            if payload.cached_message is None:
+                self._stats['events_processed'] += 1
+                await self._log_stored_edit(stored, content)
+            self.content_store.update_content(payload.message_id, content)
+
+        except Exception as e:
+            logger.error(f"Error in on_raw_message_edit: {e}")
+            self._stats['errors'] += 1
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        """Purges (Bulk-Delete API) erzeugen genau ein Zusammenfassungs-Log"""
+        try:
+            if not payload.guild_id:
+                return
+
+            self._stats['events_processed'] += 1
+            messages = [StoredMessage.from_message(message) for message in payload.cached_messages]
+            for message_id in payload.message_ids:
+                stored = self.content_store.pop(message_id)
+                # Nicht gecachte Nachrichten aus dem Inhalts-Speicher ergänzen
+                if stored is not None and all(message.id != message_id for message in payload.cached_messages):
+                    messages.append(stored)
+
+            await self._log_bulk_delete(
+                payload.guild_id,
+                {payload.channel_id},
+                len(payload.message_ids),
+                messages,
+                title="🗑️ Nachrichten gelöscht (Purge)"
             )
+
+        except Exception as e:
+            logger.error(f"Error in on_raw_bulk_message_delete: {e}")
+            self._stats['errors'] += 1
+
+    def _track_delete(self, message: StoredMessage) -> bool:
+        """
+        Zählt Einzel-Löschungen pro Server in einem gleitenden Zeitfenster.
+
+        Ab ``bulk_delete_threshold`` Löschungen innerhalb von ``bulk_delete_window``
+        Sekunden werden weitere Löschungen gesammelt und nach Ende des Fensters
+        als ein Log zusammengefasst (ein Timer pro Burst, kein Sleep pro Löschung).
+
+        Returns:
+            bool: True wenn die Löschung in die Zusammenfassung aufgenommen wurde
+        """
+        guild_id = message.guild_id
+        burst = self._delete_bursts.get(guild_id)
+        if burst is None:
+            burst = self._delete_bursts[guild_id] = DeleteBurst()
+
+        window = self.config['bulk_delete_window']
+        count = burst.record(time.monotonic(), window)
+        if not burst.active and count < self.config['bulk_delete_threshold']:
+            return False
+
+        burst.messages.append(message)
+        burst.channels.add(message.channel_id)
+        if not burst.active:
+            burst.started = datetime.utcnow()
+            burst.flush_handle = asyncio.get_running_loop().call_later(window, self._flush_delete_burst, guild_id)
+        return True
+
+    def _flush_delete_burst(self, guild_id: int):
+        """Timer-Callback: sendet die Zusammenfassung, sobald das Fenster ruhig ist"""
+        burst = self._delete_bursts.get(guild_id)
+        if burst is None:
+            return
+
+        # Weitere Löschungen im Fenster? Dann bis zum Ende des neuen Fensters verlängern
+        remaining = burst.times[-1] + self.config['bulk_delete_window'] - time.monotonic()
+        if remaining > 0:
+            burst.flush_handle = asyncio.get_running_loop().call_later(remaining, self._flush_delete_burst, guild_id)
+            return
+
+        del self._delete_bursts[guild_id]
+        asyncio.create_task(self._log_bulk_delete(
+            guild_id,
+            burst.channels,
+            len(burst.messages),
+            burst.messages,
+            title="🗑️ Bulk-Löschung erkannt",
+            started=burst.started
+        ))
+
+    async def _log_bulk_delete(self, guild_id: int, channel_ids: Set[int], count: int,
+                               messages: List[StoredMessage], title: str,
+                               started: Optional[datetime] = None):
+        """Erstellt das Zusammenfassungs-Log einer Bulk-Löschung"""
+        embed = discord.Embed(
+            title=title,
+            description=f"**{count}** Nachrichten wurden in kurzer Zeit gelöscht",
+            color=discord.Color.dark_red(),
+            timestamp=datetime.utcnow()
+        )
+
+        # Channel Info
+        affected_channels = []
+        for ch_id in channel_ids:
+            channel = self.bot.get_channel(ch_id)
+            affected_channels.append(channel.mention if channel else f"`{ch_id}`")
+
+        if affected_channels:
             embed.add_field(
-                name="📍 Channel", 
-                value=message.channel.mention, 
-                inline=True
+                name="📍 Betroffene Channels",
+                value="\n".join(affected_channels[:5]),
+                inline=False
             )
+
+        # Autoren der bekannten Nachrichten
+        if messages:
+            authors = Counter(message.author_id for message in messages)
             embed.add_field(
-                name="⏰ Erstellt", 
-                value=f"<t:{int(message.created_at.timestamp())}:R>", 
+                name="👥 Autoren",
+                value="\n".join(f"<@{author_id}>: **{amount}**" for author_id, amount in authors.most_common(5)),
                 inline=True
             )
+        if len(messages) < count:
+            embed.add_field(name="🗄️ Inhalt unbekannt", value=f"{count - len(messages)} Nachrichten", inline=True)
+
+        if started is not None:
+            duration = (datetime.utcnow() - started).total_seconds()
+            embed.add_field(name="⏱️ Zeitraum", value=f"{duration:.1f}s", inline=True)
+
+        file = None
+        if messages and self.config['bulk_delete_transcript']:
+            file = self._build_delete_transcript(guild_id, messages)
+            embed.set_footer(text="Inhalte der gelöschten Nachrichten im Anhang (gzip)")
+
+        await self.send_log(guild_id, embed, "messages", file=file)
+
+    def _build_delete_transcript(self, guild_id: int, messages: List[StoredMessage]) -> discord.File:
+        """Komprimiertes Transkript der gelöschten Nachrichten (.txt.gz)"""
+        lines = []
+        for message in sorted(messages, key=lambda m: m.id):
+            channel = self.bot.get_channel(message.channel_id) or message.channel_id
+            line = f"[{message.created_at:%Y-%m-%d %H:%M:%S}] #{channel} | {message.author_name} ({message.author_id}): {message.content}"
+            if message.attachments:
+                line += " [Anhänge: " + ", ".join(message.attachments) + "]"
+            lines.append(line)
 
-            # Content
-            if message.content:
-                embed.add_field(
-                    name="💬 Inhalt", 
-                    value=self._format_content_for_embed(message.content), 
-                    inline=False
-                )
+        data = gzip.compress("\n".join(lines).encode("utf-8"))
+        filename = f"deleted_{guild_id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.txt.gz"
+        return discord.File(io.BytesIO(data), filename=filename)
 
-            # Attachments
-            if message.attachments:
-                attachment_info = []
-                for att in message.attachments[:self.config['max_attachment_display']]:
-                    size_kb = att.size // 1024
-                    attachment_info.append(f"📎 `{att.filename}` ({size_kb} KB)")
-                
-                if len(message.attachments) > self.config['max_attachment_display']:
-                    attachment_info.append(f"... und {len(message.attachments) - self.config['max_attachment_display']} weitere")
-                
-                embed.add_field(
-                    name="📎 Anhänge", 
-                    value="\n".join(attachment_info), 
-                    inline=False
-                )
+    def _build_stored_delete_embed(self, stored: StoredMessage) -> discord.Embed:
+        """Log-Embed für eine gelöschte Nachricht aus dem Inhalts-Speicher"""
+        embed = discord.Embed(
+            title="🗑️ Nachricht gelöscht",
+            color=discord.Color.red(),
+            timestamp=datetime.utcnow()
+        )
+        embed.add_field(name="👤 Author", value=f"<@{stored.author_id}>\n`{stored.author_name}`", inline=True)
+        embed.add_field(name="📍 Channel", value=f"<#{stored.channel_id}>", inline=True)
+        embed.add_field(name="⏰ Erstellt", value=f"<t:{int(stored.created_at.timestamp())}:R>", inline=True)
 
-            # Embeds
-            if message.embeds:
-                embed.add_field(
-                    name="📋 Embeds", 
-                    value=f"{len(message.embeds)} Embed(s)", 
-                    inline=True
-                )
+        if stored.content:
+            embed.add_field(name="💬 Inhalt", value=self._format_content_for_embed(stored.content), inline=False)
 
-            # Reactions
-            if message.reactions:
-                reaction_count = sum(r.count for r in message.reactions)
-                embed.add_field(
-                    name="👍 Reaktionen", 
-                    value=f"{reaction_count} Reaktionen", 
-                    inline=True
-                )
+        if stored.attachments:
+            shown = stored.attachments[:self.config['max_attachment_display']]
+            attachment_info = [f"📎 `{filename}`" for filename in shown]
+            if len(stored.attachments) > len(shown):
+                attachment_info.append(f"... und {len(stored.attachments) - len(shown)} weitere")
+            embed.add_field(name="📎 Anhänge", value="\n".join(attachment_info), inline=False)
 
-            embed.set_author(name=message.author.display_name, icon_url=message.author.display_avatar.url)
-            embed.set_footer(text=f"Message ID: {message.id} | User ID: {message.author.id}")
+        embed.set_footer(text=f"Message ID: {stored.id} | User ID: {stored.author_id} | Aus dem Inhalts-Speicher")
+        return embed
+
+    async def _log_stored_edit(self, stored: StoredMessage, content: str):
+        """Edit-Log für eine nicht gecachte Nachricht aus dem Inhalts-Speicher"""
+        embed = discord.Embed(
+            title="✏️ Nachricht bearbeitet",
+            color=discord.Color.yellow(),
+            timestamp=datetime.utcnow()
+        )
+        jump_url = f"https://discord.com/channels/{stored.guild_id}/{stored.channel_id}/{stored.id}"
+        embed.add_field(name="👤 Author", value=f"<@{stored.author_id}>\n`{stored.author_name}`", inline=True)
+        embed.add_field(name="📍 Channel", value=f"<#{stored.channel_id}>", inline=True)
+        embed.add_field(name="🔗 Nachricht", value=f"[Zur Nachricht]({jump_url})", inline=True)
 
-            await self.send_log(guild_id, embed, "messages")
+        before_content = self._truncate_content(stored.content, 700)
+        after_content = self._truncate_content(content, 700)
+        embed.add_field(name="📝 Vorher", value=self._format_content_for_embed(before_content), inline=False)
+        embed.add_field(name="📝 Nachher", value=self._format_content_for_embed(after_content), inline=False)
+
+        embed.set_footer(text=f"Message ID: {stored.id} | User ID: {stored.author_id} | Aus dem Inhalts-Speicher")
+        await self.send_log(stored.guild_id, embed, "messages")
+
+    def _build_delete_embed(self, message: discord.Message) -> discord.Embed:
+        """Log-Embed für eine einzelne gelöschte Nachricht"""
+        embed = discord.Embed(
+            title="🗑️ Nachricht gelöscht",
+            color=discord.Color.red(),
+            timestamp=datetime.utcnow()
+        )
+
+        # Author Info
+        embed.add_field(
+            name="👤 Author", 
+            value=f"{message.author.mention}\n`{message.author}`", 
+            inline=True
+        )
+        embed.add_field(
+            name="📍 Channel", 
+            value=message.channel.mention, 
+            inline=True
+        )
+        embed.add_field(
+            name="⏰ Erstellt", 
+            value=f"<t:{int(message.created_at.timestamp())}:R>", 
+            inline=True
+        )
+
+        # Content
+        if message.content:
+            embed.add_field(
+                name="💬 Inhalt", 
+                value=self._format_content_for_embed(message.content), 
+                inline=False
+            )
+
+        # Attachments
+        if message.attachments:
+            attachment_info = []
+            for att in message.attachments[:self.config['max_attachment_display']]:
+                size_kb = att.size // 1024
+                attachment_info.append(f"📎 `{att.filename}` ({size_kb} KB)")
+            
+            if len(message.attachments) > self.config['max_attachment_display']:
+                attachment_info.append(f"... und {len(message.attachments) - self.config['max_attachment_display']} weitere")
             
-            # Message aus bulk cache entfernen
-            if message.id in bulk_data['messages']:
-                bulk_data['messages'].discard(message.id)
+            embed.add_field(
+                name="📎 Anhänge", 
+                value="\n".join(attachment_info), 
+                inline=False
+            )
 
-        except Exception as e:
-            logger.error(f"Error in on_message_delete: {e}")
-            self._stats['errors'] += 1
+        # Embeds
+        if message.embeds:
+            embed.add_field(
+                name="📋 Embeds", 
+                value=f"{len(message.embeds)} Embed(s)", 
+                inline=True
+            )
+
+        # Reactions
+        if message.reactions:
+            reaction_count = sum(r.count for r in message.reactions)
+            embed.add_field(
+                name="👍 Reaktionen", 
+                value=f"{reaction_count} Reaktionen", 
+                inline=True
+            )
+
+        embed.set_author(name=message.author.display_name, icon_url=message.author.display_avatar.url)
+        embed.set_footer(text=f"Message ID: {message.id} | User ID: {message.author.id}")
+
+        return embed
 
     @commands.Cog.listener()
     async def on_message_edit(self, before: discord.Message, after: discord.Message):
@@ -763,44 +1624,14 @@ class LoggingCog(commands.Cog):
                 return
 
             self._stats['events_processed'] += 1
-            message_id = before.id
 
-            # Bestehenden Task canceln
-            if message_id in self._edit_tasks:
-                self._edit_tasks[message_id].cancel()
-
-            # Neuen debounced Task erstellen
-            self._edit_tasks[message_id] = asyncio.create_task(
-                self._delayed_edit_log(before, after)
-            )
+            # Ein Heap-Eintrag pro Nachricht: erstes before, neuestes after
+            self.edit_debouncer.push(before, after)
 
         except Exception as e:
             logger.error(f"Error in on_message_edit: {e}")
             self._stats['errors'] += 1
 
-    async def _delayed_edit_log(self, before: discord.Message, after: discord.Message):
-        """Verzögertes Edit-Logging mit verbesserter Logik"""
-        try:
-            await asyncio.sleep(self.config['edit_debounce_time'])
-            
-            # Aktuellste Version der Nachricht holen
-            try:
-                fresh_message = await before.channel.fetch_message(before.id)
-                after = fresh_message  # Aktuellste Version verwenden
-            except (discord.NotFound, discord.Forbidden):
-                pass  # Nachricht wurde gelöscht oder keine Berechtigung
-
-            await self._log_message_edit(before, after)
-            
-        except asyncio.CancelledError:
-            pass  # Task wurde gecancelt
-        except Exception as e:
-            logger.error(f"Error in delayed edit log: {e}")
-        finally:
-            # Task aus Cache entfernen
-            if before.id in self._edit_tasks:
-                del self._edit_tasks[before.id]
-
     async def _log_message_edit(self, before: discord.Message, after: discord.Message):
         """Internes Message Edit Logging mit Diff-Anzeige"""
         try:
@@ -876,22 +1707,14 @@ class LoggingCog(commands.Cog):
     async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
         """Verbessertes Voice State Logging mit intelligenter Filterung"""
         try:
+            guild_id = member.guild.id
+            # Index auch für Bots pflegen, damit keine Einträge liegen bleiben
+            previous = self.voice_index.update(guild_id, member.id, after)
+
             if member.bot:
                 return
 
             self._stats['events_processed'] += 1
-            guild_id = member.guild.id
-
-            # Cache initialisieren
-            if guild_id not in self._voice_cache:
-                self._voice_cache[guild_id] = {}
-            
-            guild_cache = self._voice_cache[guild_id]
-            member_id = member.id
-
-            # Vorherigen State aus Cache holen oder setzen
-            cached_before = guild_cache.get(member_id)
-            guild_cache[member_id] = after
 
             # Event-Typ bestimmen
             event_type = None
@@ -972,12 +1795,15 @@ class LoggingCog(commands.Cog):
                     value=before.channel.mention, 
                     inline=True
                 )
-                # Session-Dauer berechnen wenn im Cache
-                if cached_before and cached_before.channel:
-                    # Schätze Join-Zeit (grober Wert)
+                # Session-Dauer aus dem Voice-Index
+                if previous is not None:
+                    _, flags, since = previous
+                    duration = self._format_duration(time.time() - since)
+                    if flags & VoicePresenceIndex.RECONCILED:
+                        duration = f"mind. {duration}"
                     embed.add_field(
-                        name="⏱️ Ungefähre Dauer", 
-                        value="Session beendet", 
+                        name="⏱️ Dauer", 
+                        value=duration, 
                         inline=True
                     )
 
@@ -1014,6 +1840,39 @@ class LoggingCog(commands.Cog):
             logger.error(f"Error in on_voice_state_update: {e}")
             self._stats['errors'] += 1
 
+    @staticmethod
+    def _format_duration(seconds: float) -> str:
+        seconds = int(seconds)
+        hours, rest = divmod(seconds, 3600)
+        minutes, seconds = divmod(rest, 60)
+        if hours:
+            return f"{hours}h {minutes}m"
+        if minutes:
+            return f"{minutes}m {seconds}s"
+        return f"{seconds}s"
+
+    async def _reconcile_voice_index(self):
+        """Einmaliger Abgleich aller Server nach Reconnect/Resume"""
+        total = 0
+        for guild in list(self.bot.guilds):
+            total += self.voice_index.reconcile(guild)
+            # Bei vielen Servern den Event-Loop zwischendurch freigeben
+            await asyncio.sleep(0)
+        logger.debug(f"Voice index reconciled: {total} members in voice")
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        await self._reconcile_voice_index()
+
+    @commands.Cog.listener()
+    async def on_resumed(self):
+        await self._reconcile_voice_index()
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.voice_index.remove_guild(guild.id)
+        self.join_shield.remove_guild(guild.id)
+
     # =============================================================================
     # MEMBER UPDATE EVENTS
     # =============================================================================
@@ -5,6 +5,7 @@ from discord import slash_command, option, SlashCommandGroup
 from discord.ext import commands
 from discord.ui import Container
 import ezcord
+from src.bot.core.db_executor import get_db_executor
 
 db = TempVCDatabase()
 
@@ -288,6 +289,7 @@ class KickUserModal(discord.ui.Modal):
 class TempVC(ezcord.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.executor = get_db_executor(bot)
     
     tempvc = SlashCommandGroup("tempvc", "Verwalte temporäre Voice-Channel Systeme")
     
@@ -521,7 +523,7 @@ class TempVC(ezcord.Cog):
             print(f"Error in voice state update: {e}")
 
     async def handle_creator_channel_join(self, member: discord.Member, channel: discord.VoiceChannel):
-        settings = db.get_tempvc_settings(member.guild.id)
+        settings = await self.executor.run(db.get_tempvc_settings, member.guild.id)
         if not settings:
             return
 
@@ -552,11 +554,11 @@ class TempVC(ezcord.Cog):
                 category=category,
                 overwrites=overwrites
             )
-            db.add_temp_channel(temp_channel.id, guild.id, member.id)
+            await self.executor.write(db.db_path, db.add_temp_channel, temp_channel.id, guild.id, member.id)
             await member.move_to(temp_channel)
 
             # Check if UI is enabled and send control panel
-            ui_settings = db.get_ui_settings(guild.id)
+            ui_settings = await self.executor.run(db.get_ui_settings, guild.id)
             if ui_settings and ui_settings[0]:  # UI enabled
                 ui_enabled, ui_prefix = ui_settings
                 
@@ -593,17 +595,17 @@ class TempVC(ezcord.Cog):
         if len(channel.members) > 0:
             return
 
-        if not db.is_temp_channel(channel.id):
+        if not await self.executor.run(db.is_temp_channel, channel.id):
             return
 
         try:
-            db.remove_temp_channel(channel.id)
+            await self.executor.write(db.db_path, db.remove_temp_channel, channel.id)
             await channel.delete(reason="Temp channel cleanup - channel empty")
 
         except discord.Forbidden:
             print(f"Missing permissions to delete channel {channel.id}")
         except discord.NotFound:
-            db.remove_temp_channel(channel.id)
+            await self.executor.write(db.db_path, db.remove_temp_channel, channel.id)
         except Exception as e:
             print(f"Error deleting temp channel {channel.id}: {e}")
 
@@ -18,6 +18,8 @@ import aiosqlite
 from datetime import datetime
 import ezcord
 from discord.ui import Container
+from src.bot.core.settings_cache import get_guild_cache
+from src.bot.core.join_pipeline import get_join_pipeline
 
 
 # Logger Setup
@@ -42,10 +44,10 @@ class WelcomeSystem(ezcord.Cog):
         Die Bot-Instanz
     db : WelcomeDatabase
         Datenbank-Handler für Welcome-Einstellungen
-    _settings_cache : dict
-        Cache für Server-Einstellungen
-    _cache_timeout : int
-        Cache-Timeout in Sekunden (Standard: 300)
+    settings_cache : GuildSettingsCache
+        Bot-weiter Cache für Server-Einstellungen
+    join_pipeline : JoinPipeline
+        Gemeinsame Join-Pipeline (Rollen, Welcome Message, DM)
     _rate_limit_cache : dict
         Rate-Limiting Cache für Welcome-Messages
     """
@@ -61,10 +63,15 @@ class WelcomeSystem(ezcord.Cog):
         """
         self.bot = bot
         self.db = WelcomeDatabase()
-        # Cache für bessere Performance
-        self._settings_cache = {}
-        self._cache_timeout = 300  # 5 Minuten Cache
+        # Geteilter Cache für bessere Performance
+        self.settings_cache = get_guild_cache(bot)
         self._rate_limit_cache = {}  # Rate Limiting
+        self.join_pipeline = get_join_pipeline(bot)
+        self.join_pipeline.register("welcome", self.contribute_join)
+    
+    def cog_unload(self):
+        """Meldet den Join-Contributor beim Entladen ab."""
+        self.join_pipeline.unregister("welcome")
     
     async def get_cached_settings(self, guild_id: int):
         """
@@ -82,20 +89,13 @@ class WelcomeSystem(ezcord.Cog):
         
         Notes
         -----
-        Cache wird nach 5 Minuten automatisch invalidiert.
+        Nutzt den bot-weiten Settings-Cache (TTL 5 Minuten). Gleichzeitige
+        Beitritte lösen so nur eine Datenbank-Abfrage pro Server aus.
         """
-        now = asyncio.get_event_loop().time()
-        
-        if guild_id in self._settings_cache:
-            cached_data, timestamp = self._settings_cache[guild_id]
-            if now - timestamp < self._cache_timeout:
-                return cached_data
-        
-        # Aus Datenbank laden
-        settings = await self.db.get_welcome_settings(guild_id)
-        if settings:
-            self._settings_cache[guild_id] = (settings, now)
-        return settings
+        return await self.settings_cache.get(
+            guild_id, ('welcome', 'settings'),
+            lambda: self.db.get_welcome_settings(guild_id)
+        )
 
     def invalidate_cache(self, guild_id: int):
         """
@@ -110,8 +110,7 @@ class WelcomeSystem(ezcord.Cog):
         -----
         Sollte nach jeder Einstellungsänderung aufgerufen werden.
         """
-        if guild_id in self._settings_cache:
-            del self._settings_cache[guild_id]
+        self.settings_cache.invalidate(guild_id, 'welcome')
     
     def check_rate_limit(self, guild_id: int) -> bool:
         """
@@ -281,114 +280,98 @@ class WelcomeSystem(ezcord.Cog):
         except Exception as e:
             logger.error(f"Fehler beim Senden der Welcome DM: {e}")
     
-    async def assign_auto_role(self, member: discord.Member, settings: dict):
+    async def contribute_join(self, plan):
         """
-        Vergibt automatische Rolle.
+        Trägt Auto-Role, Welcome Message und DM zur Join-Pipeline bei.
         
         Parameters
         ----------
-        member : discord.Member
-            Neues Mitglied
-        settings : dict
-            Server-Einstellungen mit auto_role_id
+        plan : JoinPlan
+            Gemeinsamer Plan des Beitritts (siehe ``src/bot/core/join_pipeline.py``)
         
         Notes
         -----
-        Prüft automatisch Berechtigungen und Rollen-Hierarchie.
+        Führt folgende Schritte aus (wenn aktiviert):
+        1. Einstellungen einmal aus dem Cache laden
+        2. Auto-Role vormerken (ein gemeinsames ``add_roles`` mit AutoRole)
+        3. Statistiken aktualisieren
+        4. Rate Limiting Check, danach Welcome Message (Channel) und
+           Welcome DM als parallele Aktionen vormerken
+        
+        Während eines Join-Raids verwirft die Pipeline die Nachrichten und
+        stellt die Auto-Role bis zum Raid-Ende zurück.
         """
-        try:
-            auto_role_id = settings.get('auto_role_id')
-            if not auto_role_id:
-                return
-            
-            role = member.guild.get_role(auto_role_id)
-            if not role:
-                logger.warning(f"Auto-Role {auto_role_id} nicht gefunden in {member.guild.name}")
-                return
-            
-            if role >= member.guild.me.top_role:
-                logger.warning(f"Auto-Role {role.name} ist höher als Bot-Rolle")
-                return
-            
-            await member.add_roles(role, reason="Welcome Auto-Role")
-            logger.info(f"Auto-Role {role.name} an {member} vergeben")
-            
-        except discord.Forbidden:
-            logger.error(f"Keine Berechtigung für Auto-Role")
-        except Exception as e:
-            logger.error(f"Auto-Role Fehler: {e}")
+        member = plan.member
+        settings = await self.get_cached_settings(member.guild.id)
+        
+        if not settings or not settings.get('enabled', True):
+            return
+        
+        auto_role_id = settings.get('auto_role_id')
+        if auto_role_id:
+            plan.add_roles([auto_role_id], "Welcome Auto-Role")
+        
+        # Statistiken aktualisieren
+        if settings.get('welcome_stats_enabled'):
+            await self.db.update_welcome_stats(member.guild.id, joins=1)
+        
+        if plan.raiding:
+            return
+        
+        # Rate Limiting prüfen (betrifft nur Nachrichten, nicht die Rolle)
+        if not self.check_rate_limit(member.guild.id):
+            logger.info(f"Rate Limit aktiv für {member.guild.name}")
+            return
+        
+        # Channel validieren
+        channel_id = settings.get('channel_id')
+        if not channel_id:
+            logger.warning(f"Kein Welcome Channel für {member.guild.name} gesetzt")
+            return
+        
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            logger.error(f"Welcome Channel {channel_id} nicht gefunden")
+            # Channel aus DB entfernen
+            await self.db.update_welcome_settings(member.guild.id, channel_id=None)
+            self.invalidate_cache(member.guild.id)
+            return
+        
+        # Permissions prüfen
+        perms = channel.permissions_for(member.guild.me)
+        if not perms.send_messages:
+            logger.error(f"Keine Send-Berechtigung in {channel.name}")
+            return
+        
+        plan.add_action(self.send_welcome_message(channel, member, settings, perms.embed_links))
+        if settings.get('join_dm_enabled'):
+            plan.add_action(self.send_welcome_dm(member, settings))
     
-    @commands.Cog.listener()
-    async def on_member_join(self, member: discord.Member):
+    async def send_welcome_message(self, channel, member, settings, embed_allowed: bool):
         """
-        Event wird ausgelöst, wenn ein neuer User dem Server beitritt.
+        Sendet die Welcome Message in den Channel.
         
         Parameters
         ----------
+        channel : discord.TextChannel
+            Welcome Channel
         member : discord.Member
             Neues Mitglied
-        
-        Notes
-        -----
-        Führt folgende Aktionen aus (wenn aktiviert):
-        1. Rate Limiting Check
-        2. Einstellungen aus Cache/DB laden
-        3. Auto-Role vergeben
-        4. Welcome Message senden (Channel)
-        5. Welcome DM senden
-        6. Statistiken aktualisieren
+        settings : dict
+            Server-Einstellungen
+        embed_allowed : bool
+            Bot darf im Channel Embeds senden
         """
         try:
-            # Rate Limiting prüfen
-            if not self.check_rate_limit(member.guild.id):
-                logger.info(f"Rate Limit aktiv für {member.guild.name}")
-                return
-            
-            settings = await self.get_cached_settings(member.guild.id)
-            
-            if not settings or not settings.get('enabled', True):
-                return
-            
-            # Channel validieren
-            channel_id = settings.get('channel_id')
-            if not channel_id:
-                logger.warning(f"Kein Welcome Channel für {member.guild.name} gesetzt")
-                return
-            
-            channel = self.bot.get_channel(channel_id)
-            if not channel:
-                logger.error(f"Welcome Channel {channel_id} nicht gefunden")
-                # Channel aus DB entfernen
-                await self.db.update_welcome_settings(member.guild.id, channel_id=None)
-                self.invalidate_cache(member.guild.id)
-                return
-            
-            # Permissions prüfen
-            perms = channel.permissions_for(member.guild.me)
-            if not perms.send_messages:
-                logger.error(f"Keine Send-Berechtigung in {channel.name}")
-                return
-            
-            # Auto-Role vergeben
-            await self.assign_auto_role(member, settings)
-            
-            # Welcome Message
             welcome_message = settings.get('welcome_message', 'Willkommen %mention% auf **%servername%**! 🎉')
             processed_message = self.replace_placeholders(welcome_message, member, member.guild)
             
             # Embed oder normale Nachricht
-            if settings.get('embed_enabled', False) and perms.embed_links:
+            if settings.get('embed_enabled', False) and embed_allowed:
                 await self.send_embed_welcome(channel, member, settings, processed_message)
             else:
                 msg = await channel.send(processed_message)
                 await self.handle_auto_delete(msg, settings)
-            
-            # Private Nachricht senden
-            await self.send_welcome_dm(member, settings)
-            
-            # Statistiken aktualisieren
-            if settings.get('welcome_stats_enabled'):
-                await self.db.update_welcome_stats(member.guild.id, joins=1)
                 
         except Exception as e:
             logger.exception(f"Welcome System Fehler für {member}: {e}")
@@ -3,16 +3,25 @@ from discord.ext import commands
 from discord import option
 from DevTools import AutoRoleDatabase
 from mx_handler import TranslationHandler as TH
+from src.bot.core.settings_cache import get_guild_cache
+from src.bot.core.join_pipeline import get_join_pipeline
 
 class AutoRole(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = AutoRoleDatabase()
+        self.settings_cache = get_guild_cache(bot)
+        self.join_pipeline = get_join_pipeline(bot)
+        self.join_pipeline.register("autorole", self.contribute_join)
     
     async def cog_load(self):
         """Wird aufgerufen, wenn der Cog geladen wird"""
         await self.db.init_db()
     
+    def cog_unload(self):
+        """Wird aufgerufen, wenn der Cog entladen wird"""
+        self.join_pipeline.unregister("autorole")
+    
     autorole = discord.SlashCommandGroup(
         name="autorole",
         description="Verwalte das Autorole-System",
@@ -50,6 +59,7 @@ class AutoRole(commands.Cog):
         
         # Füge die Autorole hinzu
         autorole_id = await self.db.add_autorole(ctx.guild.id, rolle.id)
+        self.settings_cache.invalidate(ctx.guild.id, "autorole")
         
         embed = discord.Embed(
             title=await TH.get_for_user(self.bot, ctx.author.id, "cog_autorole.messages.add_success.title"),
@@ -89,6 +99,7 @@ class AutoRole(commands.Cog):
             return
         
         await self.db.remove_autorole(autorole_id)
+        self.settings_cache.invalidate(ctx.guild.id, "autorole")
         
         embed = discord.Embed(
             title=await TH.get_for_user(self.bot, ctx.author.id, "cog_autorole.messages.remove_success.title"),
@@ -136,6 +147,7 @@ class AutoRole(commands.Cog):
         
         enabled = status == "aktivieren"
         await self.db.toggle_autorole(autorole_id, enabled)
+        self.settings_cache.invalidate(ctx.guild.id, "autorole")
         
         status_text = "enabled" if enabled else "disabled"
         embed = discord.Embed(
@@ -238,36 +250,20 @@ class AutoRole(commands.Cog):
         
         await ctx.respond(embed=embed)
     
-    @commands.Cog.listener()
-    async def on_member_join(self, member: discord.Member):
-        """Event: Wird ausgelöst, wenn ein neues Mitglied dem Server beitritt"""
-        
-        role_ids = await self.db.get_enabled_autoroles(member.guild.id)
-        
-        if not role_ids:
-            return
-        
-        roles_to_add = []
-        
-        for role_id in role_ids:
-            role = member.guild.get_role(role_id)
-            if role and role.position < member.guild.me.top_role.position:
-                roles_to_add.append(role)
+    async def get_enabled_autoroles(self, guild_id: int):
+        """Aktivierte Autoroles aus dem Cache (wird bei add/remove/toggle invalidiert)"""
+        return await self.settings_cache.get(
+            guild_id, ("autorole", "enabled"),
+            lambda: self.db.get_enabled_autoroles(guild_id)
+        )
+    
+    async def contribute_join(self, plan):
+        """Trägt die aktivierten Autoroles zur Join-Pipeline bei (ein add_roles pro Mitglied)"""
         
-        if not roles_to_add:
-            return
+        role_ids = await self.get_enabled_autoroles(plan.member.guild.id)
         
-        try:
-            audit_reason = TH.get("de", "cog_autorole.system.audit_reason")
-            await member.add_roles(*roles_to_add, reason=audit_reason)
-            
-            role_names = ", ".join([r.name for r in roles_to_add])
-            log_msg = TH.get("de", "cog_autorole.system.console_log", role_names=role_names, member_name=member.name)
-            print(log_msg)
-        except discord.Forbidden:
-            print(TH.get("de", "cog_autorole.system.error_forbidden"))
-        except discord.HTTPException as e:
-            print(TH.get("de", "cog_autorole.system.error_http", error=str(e)))
+        if role_ids:
+            plan.add_roles(role_ids, TH.get("de", "cog_autorole.system.audit_reason"))
 
 def setup(bot):
     bot.add_cog(AutoRole(bot))
\ No newline at end of file
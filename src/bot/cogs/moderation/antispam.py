@@ -1,6 +1,10 @@
 # Copyright (c) 2025 OPPRO.NET Network
-from collections import defaultdict
+from array import array
+from collections import OrderedDict, deque
 import asyncio
+import functools
+import re
+import time
 import discord
 from discord import SlashCommandGroup
 import ezcord
@@ -9,17 +13,307 @@ from datetime import timedelta
 
 
 from DevTools import AntiSpamDatabase as SpamDB
+from src.bot.core.settings_cache import get_guild_cache
+from src.bot.core.db_executor import get_db_executor
 
 antispam = SlashCommandGroup("antispam")
+
+
+class MessageRateTracker:
+    """Sliding-window message counter per (guild, user).
+
+    Each user gets a fixed ring of timestamps (``array('d')``) sized to
+    ``max_messages + 1``, plus the matching channel and message ids so a
+    violation can be purged without fetching history. The limit is exceeded
+    when the oldest of those timestamps is still inside the time frame, so
+    every check is O(1).
+    Users are kept in LRU order and dropped once they have been idle for
+    ``idle_timeout`` seconds, so memory follows active users only.
+    """
+
+    # time_frame is capped at 300 seconds by the setup commands
+    IDLE_TIMEOUT = 300.0
+    MAX_USERS = 200_000
+    # Idle entries checked per message (amortized eviction, no full sweeps)
+    EVICT_BATCH = 4
+
+    def __init__(self, idle_timeout: float = IDLE_TIMEOUT, max_users: int = MAX_USERS):
+        self.idle_timeout = idle_timeout
+        self.max_users = max_users
+        # (guild_id, user_id) -> [times, head, count, last_seen, channel_ids, message_ids]
+        self._users = OrderedDict()
+
+    def __len__(self):
+        return len(self._users)
+
+    def hit(self, guild_id, user_id, max_messages, time_frame, channel_id=0, message_id=0, now=None):
+        """Record a message and return True if the user exceeded the limit."""
+        now = time.monotonic() if now is None else now
+        key = (guild_id, user_id)
+        size = max_messages + 1
+
+        entry = self._users.get(key)
+        if entry is None or len(entry[0]) != size:
+            # New user or changed limit: start a fresh ring
+            entry = [array('d', bytes(8 * size)), 0, 0, now, array('q', bytes(8 * size)), array('q', bytes(8 * size))]
+            self._users[key] = entry
+        else:
+            self._users.move_to_end(key)
+
+        ring, head, count, _, channel_ids, message_ids = entry
+        ring[head] = now
+        channel_ids[head] = channel_id
+        message_ids[head] = message_id
+        head = (head + 1) % size
+        entry[1] = head
+        entry[2] = count = min(count + 1, size)
+        entry[3] = now
+
+        self._evict_idle(now)
+
+        # When the ring is full, ring[head] is the oldest of the last max_messages + 1
+        return count == size and now - ring[head] < time_frame
+
+    def recent_messages(self, guild_id, user_id, time_frame, now=None):
+        """Tracked messages of a user inside the time frame, grouped by channel.
+
+        Returns:
+            dict: channel_id -> [message_id, ...]
+        """
+        entry = self._users.get((guild_id, user_id))
+        if entry is None:
+            return {}
+        now = time.monotonic() if now is None else now
+        ring, head, count, _, channel_ids, message_ids = entry
+        size = len(ring)
+
+        grouped = {}
+        for offset in range(count):
+            slot = (head - 1 - offset) % size
+            if now - ring[slot] >= time_frame:
+                break
+            if message_ids[slot]:
+                grouped.setdefault(channel_ids[slot], []).append(message_ids[slot])
+        return grouped
+
+    def reset(self, guild_id, user_id):
+        """Forget a user's history (e.g. after a violation)."""
+        self._users.pop((guild_id, user_id), None)
+
+    def _evict_idle(self, now):
+        users = self._users
+        while len(users) > self.max_users:
+            users.popitem(last=False)
+        for _ in range(self.EVICT_BATCH):
+            if not users:
+                return
+            key, entry = next(iter(users.items()))
+            if now - entry[3] <= self.idle_timeout:
+                return
+            del users[key]
+
+
+class RaidCluster:
+    """A group of near-duplicate messages posted by different users."""
+
+    __slots__ = ('fingerprint', 'sample', 'users', 'messages', 'last_seen', 'scheduled', 'handled_users')
+
+    def __init__(self, fingerprint, sample, now):
+        self.fingerprint = fingerprint
+        self.sample = sample
+        self.users = set()
+        # channel_id -> [message_id, ...] not yet purged
+        self.messages = {}
+        self.last_seen = now
+        self.scheduled = False
+        self.handled_users = set()
+
+    def add(self, user_id, channel_id, message_id, now):
+        self.users.add(user_id)
+        self.messages.setdefault(channel_id, []).append(message_id)
+        self.last_seen = now
+
+    def drain(self):
+        """Return (new user ids, messages by channel) and reset the pending batch."""
+        users = self.users - self.handled_users
+        self.handled_users |= users
+        messages, self.messages = self.messages, {}
+        self.scheduled = False
+        return users, messages
+
+
+class RaidDetector:
+    """Streaming cross-user duplicate-content detector.
+
+    Normalized message content is reduced to a 64-bit simhash. An LSH table
+    with five 12-bit bands finds earlier messages within Hamming distance 4
+    (at least one band always matches). Buckets only hold messages from the
+    sliding window and are capped, so each message costs O(1) amortized.
+    Once ``MIN_USERS`` different users posted near-duplicates, a
+    ``RaidCluster`` is created and later matches are added to it.
+
+    Re-run ``scripts/bench_raid_detector.py`` after tuning the thresholds.
+    """
+
+    WINDOW = 30.0
+    MIN_USERS = 5
+    # Only new accounts / new members are fed into the detector
+    FRESH_ACCOUNT_DAYS = 30
+    FRESH_MEMBER_HOURS = 24
+    # Collect late raiders for this long, then respond once
+    BATCH_DELAY = 2.0
+    TIMEOUT_MINUTES = 10
+    MAX_DISTANCE = 4
+    # A confirmed cluster also absorbs slightly stronger variations
+    CLUSTER_DISTANCE = 8
+    MIN_CONTENT_LENGTH = 16
+    BUCKET_LIMIT = 128
+    BANDS = 5
+    _BAND_BITS = 12
+    _BAND_MASK = (1 << 12) - 1
+    _HASH_MASK = (1 << 64) - 1
+    _SPREAD = bytes.maketrans(b'01', b'\x00\x01')
+
+    # Mentions, URLs and numbers are what raiders vary to dodge duplicate checks
+    _NOISE = re.compile(r'<[@#][!&]?\d+>|https?://\S+|\d+')
+    _NON_WORD = re.compile(r'[\W_]+')
+
+    def __init__(self):
+        # guild_id -> [buckets, order, clusters]
+        self._guilds = {}
+
+    @classmethod
+    def normalize(cls, content):
+        """Lowercase and strip mentions, URLs, numbers, punctuation and 1-letter words."""
+        content = cls._NON_WORD.sub(' ', cls._NOISE.sub(' ', content.lower()))
+        return ' '.join(word for word in content.split() if len(word) > 1)
+
+    @classmethod
+    def simhash(cls, text):
+        """64-bit simhash over words and word bigrams (stable within one process).
+
+        Each feature hash is spread to one byte per bit, so summing the
+        features as big integers counts all 64 bit positions at once.
+        """
+        words = text.split()
+        features = (words + [f"{a} {b}" for a, b in zip(words, words[1:])])[:255]
+        mask = cls._HASH_MASK
+        spread = cls._SPREAD
+        total = sum(
+            int.from_bytes(format(hash(feature) & mask, '064b').encode().translate(spread), 'big')
+            for feature in features
+        )
+        majority = cls._majority_table(len(features) // 2)
+        return int(total.to_bytes(64, 'big').translate(majority), 2)
+
+    @classmethod
+    @functools.lru_cache(maxsize=256)
+    def _majority_table(cls, half):
+        return bytes(0x31 if count > half else 0x30 for count in range(256))
+
+    def observe(self, guild_id, user_id, channel_id, message_id, content, now=None):
+        """Record a message.
+
+        Returns:
+            RaidCluster | None: The cluster if it needs a (new) response batch
+        """
+        text = self.normalize(content)
+        if len(text) < self.MIN_CONTENT_LENGTH:
+            return None
+
+        now = time.monotonic() if now is None else now
+        table = self._guilds.get(guild_id)
+        if table is None:
+            table = self._guilds[guild_id] = [{}, deque(), []]
+        self._expire(table, now)
+        buckets, order, clusters = table
+
+        fingerprint = self.simhash(text)
+
+        # Known raid? Add to the existing cluster
+        for cluster in clusters:
+            if bin(cluster.fingerprint ^ fingerprint).count('1') <= self.CLUSTER_DISTANCE:
+                cluster.add(user_id, channel_id, message_id, now)
+                return self._needs_response(cluster)
+
+        entry = (now, fingerprint, user_id, channel_id, message_id)
+        keys = [(band, (fingerprint >> (band * self._BAND_BITS)) & self._BAND_MASK) for band in range(self.BANDS)]
+
+        matches = {}
+        for key in keys:
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = deque(maxlen=self.BUCKET_LIMIT)
+            for other in bucket:
+                if other[4] not in matches and bin(other[1] ^ fingerprint).count('1') <= self.MAX_DISTANCE:
+                    matches[other[4]] = other
+            bucket.append(entry)
+        order.append((now, keys))
+
+        users = {other[2] for other in matches.values()}
+        users.add(user_id)
+        if len(users) < self.MIN_USERS:
+            return None
+
+        cluster = RaidCluster(fingerprint, content[:200], now)
+        for other in matches.values():
+            cluster.add(other[2], other[3], other[4], now)
+        cluster.add(user_id, channel_id, message_id, now)
+        clusters.append(cluster)
+
+        # Clustered messages no longer need to be matched through the buckets
+        for key in keys:
+            buckets[key] = deque(
+                (other for other in buckets[key] if other[4] not in matches and other is not entry),
+                maxlen=self.BUCKET_LIMIT
+            )
+        return self._needs_response(cluster)
+
+    @staticmethod
+    def _needs_response(cluster):
+        if cluster.scheduled or not (cluster.users - cluster.handled_users or cluster.messages):
+            return None
+        cluster.scheduled = True
+        return cluster
+
+    def _expire(self, table, now):
+        buckets, order, clusters = table
+        horizon = now - self.WINDOW
+        while order and order[0][0] < horizon:
+            _, keys = order.popleft()
+            for key in keys:
+                bucket = buckets.get(key)
+                if bucket is None:
+                    continue
+                while bucket and bucket[0][0] < horizon:
+                    bucket.popleft()
+                if not bucket:
+                    del buckets[key]
+        if clusters:
+            table[2] = [cluster for cluster in clusters if cluster.last_seen >= horizon or cluster.scheduled]
+
+    def forget_guild(self, guild_id):
+        self._guilds.pop(guild_id, None)
+
+    def __len__(self):
+        return len(self._guilds)
+
+
 class AntiSpam(ezcord.Cog):
 
     def __init__(self, bot: ezcord.Bot):
         self.bot = bot
         self.db = SpamDB()
-        # Track user message timestamps per guild
-        self.user_messages = defaultdict(lambda: defaultdict(list))
+        self.cache = get_guild_cache(bot)
+        self.executor = get_db_executor(bot)
+        # Track recent message timestamps per (guild, user)
+        self.rate_tracker = MessageRateTracker()
+        # Detect near-identical messages from many (new) users
+        self.raid_detector = RaidDetector()
         # Track users currently in timeout to prevent duplicate actions
         self.users_in_timeout = set()
+        # Running handle_raid tasks (the event loop only keeps weak references)
+        self._raid_tasks = set()
 
     @ezcord.Cog.listener()
     async def on_message(self, message):
@@ -28,12 +322,12 @@ class AntiSpam(ezcord.Cog):
         if message.author.bot or not message.guild:
             return
 
-        # Check if user is whitelisted
-        if self.is_whitelisted(message.guild.id, message.author.id):
-            return
-
         # Get spam settings for this guild
-        settings = self.db.get_spam_settings(message.guild.id)
+        guild_id = message.guild.id
+        settings = await self.cache.get(
+            guild_id, ('antispam', 'settings'),
+            lambda: self.run_db(self.db.get_spam_settings, guild_id)
+        )
         if not settings:
             # If no settings are configured, don't process spam detection
             return
@@ -42,24 +336,27 @@ class AntiSpam(ezcord.Cog):
         if not settings.get('log_channel_id'):
             return
 
-        # Record this message timestamp
+        # Check if user is whitelisted
         user_id = message.author.id
-        guild_id = message.guild.id
-        current_time = datetime.now()
-
-        # Add current message to tracking
-        self.user_messages[guild_id][user_id].append(current_time)
-
-        # Clean old messages outside the time frame
-        time_threshold = current_time - timedelta(seconds=settings['time_frame'])
-        self.user_messages[guild_id][user_id] = [
-            timestamp for timestamp in self.user_messages[guild_id][user_id]
-            if timestamp > time_threshold
-        ]
+        whitelisted = await self.cache.get(
+            guild_id, ('antispam', 'whitelist', user_id),
+            lambda: self.run_db(self.is_whitelisted, guild_id, user_id)
+        )
+        if whitelisted:
+            return
 
-        # Check if user exceeded message limit
-        message_count = len(self.user_messages[guild_id][user_id])
-        if message_count > settings['max_messages']:
+        # Cross-user duplicate content (raids of fresh accounts)
+        if message.content and self.is_fresh_member(message.author):
+            cluster = self.raid_detector.observe(guild_id, user_id, message.channel.id, message.id, message.content)
+            if cluster is not None:
+                task = asyncio.create_task(self.handle_raid(message.guild, cluster, settings))
+                self._raid_tasks.add(task)
+                task.add_done_callback(self._raid_tasks.discard)
+                return
+
+        # Record this message and check if user exceeded message limit
+        if self.rate_tracker.hit(guild_id, user_id, settings['max_messages'], settings['time_frame'],
+                                 message.channel.id, message.id):
             await self.handle_spam_violation(message, settings)
 
     async def handle_spam_violation(self, message, settings):
@@ -76,10 +373,10 @@ class AntiSpam(ezcord.Cog):
 
         try:
             # Log the spam incident
-            self.db.log_spam(guild.id, user.id, message.content[:100])  # Limit message length
+            await self.run_db(self.db.log_spam, guild.id, user.id, message.content[:100])  # Limit message length
 
-            # Delete recent messages from this user
-            await self.delete_recent_messages(message.channel, user, limit=settings['max_messages'])
+            # Delete the tracked recent messages from this user (all channels)
+            await self.delete_recent_messages(guild, user, settings['time_frame'])
 
             # Apply timeout (5 minutes)
             timeout_duration = timedelta(minutes=5)
@@ -108,8 +405,7 @@ class AntiSpam(ezcord.Cog):
             await message.channel.send(embed=embed, delete_after=10)
 
             # Clear user's message tracking after violation
-            if guild.id in self.user_messages and user.id in self.user_messages[guild.id]:
-                self.user_messages[guild_id][user.id].clear()
+            self.rate_tracker.reset(guild.id, user.id)
 
             # Remove from timeout tracking after delay
             await asyncio.sleep(300)  # 5 minutes
@@ -119,6 +415,105 @@ class AntiSpam(ezcord.Cog):
             print(f"Error handling spam violation: {e}")
             self.users_in_timeout.discard(user_timeout_key)
 
+    @staticmethod
+    def is_fresh_member(member):
+        """New accounts or members who joined recently."""
+        now = discord.utils.utcnow()
+        if now - member.created_at < timedelta(days=RaidDetector.FRESH_ACCOUNT_DAYS):
+            return True
+        joined_at = getattr(member, 'joined_at', None)
+        return joined_at is not None and now - joined_at < timedelta(hours=RaidDetector.FRESH_MEMBER_HOURS)
+
+    async def handle_raid(self, guild, cluster, settings):
+        """Respond to a raid cluster with one batch: mass timeout plus purge."""
+        # Late raiders posting during the delay join this batch
+        await asyncio.sleep(RaidDetector.BATCH_DELAY)
+        user_ids, messages = cluster.drain()
+
+        try:
+            members = [member for member in map(guild.get_member, user_ids) if member is not None]
+            keys = {f"{guild.id}_{member.id}" for member in members}
+            self.users_in_timeout |= keys
+            self.bot.loop.call_later(300, self.users_in_timeout.difference_update, keys)
+
+            duration = timedelta(minutes=RaidDetector.TIMEOUT_MINUTES)
+            results = await asyncio.gather(
+                *(member.timeout_for(duration, reason="Anti-Spam: Raid (identische Nachrichten)") for member in members),
+                return_exceptions=True
+            )
+            timed_out = [member for member, result in zip(members, results) if not isinstance(result, Exception)]
+
+            deleted = await self.purge_messages(guild, messages)
+            for member in members:
+                self.rate_tracker.reset(guild.id, member.id)
+
+            await self.send_raid_log(guild, cluster, members, timed_out, deleted, settings)
+        except Exception as e:
+            print(f"Error handling raid: {e}")
+
+    async def purge_messages(self, guild, messages_by_channel):
+        """Bulk-delete tracked messages, one request per channel and 100 messages.
+
+        Returns:
+            int: Number of deleted messages
+        """
+        async def purge_channel(channel_id, message_ids):
+            channel = guild.get_channel_or_thread(channel_id)
+            if channel is None:
+                return 0
+            deleted = 0
+            for start in range(0, len(message_ids), 100):
+                chunk = [discord.Object(id=message_id) for message_id in message_ids[start:start + 100]]
+                try:
+                    await channel.delete_messages(chunk, reason="Anti-Spam")
+                    deleted += len(chunk)
+                except discord.NotFound:
+                    pass  # Already deleted
+                except (discord.Forbidden, discord.HTTPException):
+                    break
+            return deleted
+
+        results = await asyncio.gather(
+            *(purge_channel(channel_id, ids) for channel_id, ids in messages_by_channel.items() if ids),
+            return_exceptions=True
+        )
+        return sum(result for result in results if isinstance(result, int))
+
+    async def send_raid_log(self, guild, cluster, members, timed_out, deleted, settings):
+        """Send one summary log for a raid response."""
+        log_channel = guild.get_channel(settings.get('log_channel_id') or 0)
+        if not log_channel:
+            return
+
+        try:
+            embed = discord.Embed(
+                title=f"{emoji_warn} × Anti-Spam Raid erkannt",
+                description=f"**{len(cluster.handled_users)}** Benutzer haben nahezu identische Nachrichten gesendet.",
+                color=discord.Color.dark_red(),
+                timestamp=discord.utils.utcnow()
+            )
+            mentions = " ".join(member.mention for member in members[:30])
+            if len(members) > 30:
+                mentions += f" … (+{len(members) - 30})"
+            embed.add_field(
+                name=f"{emoji_member} × Benutzer (dieser Batch)",
+                value=mentions or "—",
+                inline=False
+            )
+            embed.add_field(
+                name=f"{emoji_moderator} × Aktion",
+                value=f"Timeout ({RaidDetector.TIMEOUT_MINUTES} Min): {len(timed_out)}/{len(members)}\nGelöscht: {deleted} Nachrichten",
+                inline=True
+            )
+            embed.add_field(
+                name=f"{emoji_annoattention} × Nachricht (Vorschau)",
+                value=f"```{cluster.sample[:100]}{'...' if len(cluster.sample) > 100 else ''}```",
+                inline=False
+            )
+            await log_channel.send(embed=embed)
+        except Exception as e:
+            print(f"Error sending raid log: {e}")
+
     async def send_spam_log(self, guild, user, message, settings, timeout_applied):
         """Send spam log to designated log channel."""
         log_channel_id = settings.get('log_channel_id')
@@ -167,26 +562,14 @@ class AntiSpam(ezcord.Cog):
         except Exception as e:
             print(f"Error sending spam log: {e}")
 
-    async def delete_recent_messages(self, channel, user, limit=5):
-        """Delete recent messages from a user."""
+    async def delete_recent_messages(self, guild, user, time_frame):
+        """Delete a user's recent messages from the rate tracker, without fetching history."""
         try:
-            messages_to_delete = []
-            async for msg in channel.history(limit=50):  # Check last 50 messages
-                if msg.author == user and len(messages_to_delete) < limit:
-                    messages_to_delete.append(msg)
-                if len(messages_to_delete) >= limit:
-                    break
-
-            for msg in messages_to_delete:
-                try:
-                    await msg.delete()
-                except discord.NotFound:
-                    pass  # Message already deleted
-                except discord.Forbidden:
-                    break  # No permission to delete
-
+            messages = self.rate_tracker.recent_messages(guild.id, user.id, time_frame)
+            return await self.purge_messages(guild, messages)
         except Exception as e:
             print(f"Error deleting messages: {e}")
+            return 0
 
     @antispam.command(name="setup", description="Richte das Anti-Spam-System ein.")
     async def setup_antispam(self, ctx, log_channel: discord.TextChannel, max_messages: int = 5, time_frame: int = 10):
@@ -209,7 +592,8 @@ class AntiSpam(ezcord.Cog):
                               ephemeral=True)
             return
 
-        self.db.set_spam_settings(ctx.guild.id, max_messages, time_frame, log_channel.id)
+        await self.run_db(self.db.set_spam_settings, ctx.guild.id, max_messages, time_frame, log_channel.id)
+        self.cache.invalidate(ctx.guild.id, 'antispam', 'settings')
 
         embed = discord.Embed(
             title=f"{emoji_yes} × Anti-Spam-System eingerichtet",
@@ -245,7 +629,7 @@ class AntiSpam(ezcord.Cog):
             return
 
         # Get current settings
-        current_settings = self.db.get_spam_settings(ctx.guild.id)
+        current_settings = await self.run_db(self.db.get_spam_settings, ctx.guild.id)
         if not current_settings:
             await ctx.respond(f"{emoji_no} × Anti-Spam-System wurde noch nicht eingerichtet. Verwende `/antispam setup` zuerst.",
                               ephemeral=True)
@@ -263,7 +647,8 @@ class AntiSpam(ezcord.Cog):
             await ctx.respond(f"{emoji_no} × Zeitrahmen muss zwischen 5 und 300 Sekunden liegen.", ephemeral=True)
             return
 
-        self.db.set_spam_settings(ctx.guild.id, new_max_messages, new_time_frame, current_settings['log_channel_id'])
+        await self.run_db(self.db.set_spam_settings, ctx.guild.id, new_max_messages, new_time_frame, current_settings['log_channel_id'])
+        self.cache.invalidate(ctx.guild.id, 'antispam', 'settings')
 
         embed = discord.Embed(
             title=f"{emoji_owner} × Anti-Spam Einstellungen aktualisiert",
@@ -285,7 +670,8 @@ class AntiSpam(ezcord.Cog):
                               ephemeral=True)
             return
 
-        self.db.set_log_channel(ctx.guild.id, log_channel.id)
+        await self.run_db(self.db.set_log_channel, ctx.guild.id, log_channel.id)
+        self.cache.invalidate(ctx.guild.id, 'antispam', 'settings')
 
         embed = discord.Embed(
             title=f"{emoji_owner} × Log-Channel aktualisiert",
@@ -297,7 +683,7 @@ class AntiSpam(ezcord.Cog):
     @antispam.command(name="view", description="Zeige aktuelle Anti-Spam-Einstellungen an.")
     async def view_settings(self, ctx):
         """Zeigt die aktuellen Anti-Spam-Einstellungen an."""
-        settings = self.db.get_spam_settings(ctx.guild.id)
+        settings = await self.run_db(self.db.get_spam_settings, ctx.guild.id)
 
         if settings and settings.get('log_channel_id'):
             log_channel = ctx.guild.get_channel(settings['log_channel_id'])
@@ -343,7 +729,7 @@ class AntiSpam(ezcord.Cog):
             await ctx.respond(f"{emoji_no} × Du benötigst die 'Server verwalten' Berechtigung für diesen Befehl.", ephemeral=True)
             return
 
-        logs = self.db.get_spam_logs(ctx.guild.id, limit)
+        logs = await self.run_db(self.db.get_spam_logs, ctx.guild.id, limit)
 
         if logs:
             embed = discord.Embed(
@@ -383,7 +769,7 @@ class AntiSpam(ezcord.Cog):
             await ctx.respond(f"{emoji_no} × Du benötigst Administrator-Rechte für diesen Befehl.", ephemeral=True)
             return
 
-        self.db.clear_spam_logs(ctx.guild.id)
+        await self.run_db(self.db.clear_spam_logs, ctx.guild.id)
 
         embed = discord.Embed(
             title=f"{emoji_yes} × Protokolle gelöscht",
@@ -399,7 +785,8 @@ class AntiSpam(ezcord.Cog):
             await ctx.respond(f"{emoji_no} × Du benötigst die 'Server verwalten' Berechtigung für diesen Befehl.", ephemeral=True)
             return
 
-        self.db.add_to_whitelist(ctx.guild.id, user.id)
+        await self.run_db(self.db.add_to_whitelist, ctx.guild.id, user.id)
+        self.cache.invalidate(ctx.guild.id, 'antispam', 'whitelist', user.id)
 
         embed = discord.Embed(
             title=f"{emoji_yes} × Zur Whitelist hinzugefügt",
@@ -416,8 +803,8 @@ class AntiSpam(ezcord.Cog):
             return
 
         # Remove settings to disable the system
-        with self.db.conn:
-            self.db.conn.execute('DELETE FROM spam_settings WHERE guild_id = ?', (ctx.guild.id,))
+        await self.run_db(self._delete_settings, ctx.guild.id)
+        self.cache.invalidate(ctx.guild.id, 'antispam', 'settings')
 
         embed = discord.Embed(
             title=f"{emoji_delete} × Anti-Spam-System deaktiviert",
@@ -430,6 +817,19 @@ class AntiSpam(ezcord.Cog):
         """Check if user is whitelisted."""
         return self.db.is_whitelisted(guild_id, user_id)
 
+    def _delete_settings(self, guild_id):
+        """Remove the spam settings of a guild (runs in the DB worker)."""
+        with self.db.conn:
+            self.db.conn.execute('DELETE FROM spam_settings WHERE guild_id = ?', (guild_id,))
+
+    async def run_db(self, func, *args):
+        """Run a blocking SpamDB call without blocking the event loop.
+
+        SpamDB shares one connection, so all calls go through the
+        serialized write queue of this database.
+        """
+        return await self.executor.write(self.db.db_path, func, *args)
+
 
 def setup(bot: ezcord.Bot):
     bot.add_cog(AntiSpam(bot))
\ No newline at end of file
@@ -3,16 +3,570 @@ import discord
 from discord.ext import commands, tasks
 from discord import SlashCommandGroup
 import logging
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from DevTools import StatsDB
 import asyncio
-from datetime import datetime, timedelta
+import time
+from datetime import date, datetime, timedelta
 import math
+from src.bot.core.db_executor import get_db_executor
 
 
 logger = logging.getLogger(__name__)
 
 
+class StatsRollups:
+    """
+    Pre-aggregated activity tables for the stats commands.
+
+    - ``message_activity_hourly``: per (user, guild, channel, hour)
+    - ``message_activity_daily``: per (guild, day, user)
+    - ``guild_leaderboard``: messages/words per (guild, user) over the last
+      ``LEADERBOARD_DAYS``, indexed by message count for top-k reads
+    - ``global_user_totals``: lifetime per-user totals (level, XP, messages,
+      words, voice, servers, streaks), indexed by XP for the global top-k
+    - ``global_user_guilds``: every (user, guild) pair seen, so the server
+      count is a primary key range count instead of a raw log scan
+
+    All tables are updated incrementally with each ingested batch.
+    ``compact()`` drops expired buckets, re-derives the leaderboard window
+    from the daily rollup and resyncs the global totals with
+    ``global_user_levels`` (voice XP is written there by StatsDB directly).
+    """
+
+    HOURLY_RETENTION_DAYS = 31
+    DAILY_RETENTION_DAYS = 90
+    LEADERBOARD_DAYS = 30
+
+    SCHEMA = [
+        '''CREATE TABLE IF NOT EXISTS message_activity_hourly (
+            user_id INTEGER NOT NULL,
+            guild_id INTEGER NOT NULL,
+            channel_id INTEGER NOT NULL,
+            hour TEXT NOT NULL,
+            messages INTEGER DEFAULT 0,
+            words INTEGER DEFAULT 0,
+            attachments INTEGER DEFAULT 0,
+            PRIMARY KEY (user_id, guild_id, channel_id, hour)
+        )''',
+        '''CREATE TABLE IF NOT EXISTS message_activity_daily (
+            guild_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            messages INTEGER DEFAULT 0,
+            words INTEGER DEFAULT 0,
+            PRIMARY KEY (guild_id, day, user_id)
+        )''',
+        '''CREATE TABLE IF NOT EXISTS guild_leaderboard (
+            guild_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            messages INTEGER DEFAULT 0,
+            words INTEGER DEFAULT 0,
+            PRIMARY KEY (guild_id, user_id)
+        )''',
+        '''CREATE TABLE IF NOT EXISTS global_user_totals (
+            user_id INTEGER PRIMARY KEY,
+            level INTEGER DEFAULT 1,
+            xp REAL DEFAULT 0,
+            messages INTEGER DEFAULT 0,
+            words INTEGER DEFAULT 0,
+            voice_minutes REAL DEFAULT 0,
+            servers INTEGER DEFAULT 0,
+            daily_streak INTEGER DEFAULT 0,
+            best_streak INTEGER DEFAULT 0,
+            first_seen TEXT
+        )''',
+        '''CREATE TABLE IF NOT EXISTS global_user_guilds (
+            user_id INTEGER NOT NULL,
+            guild_id INTEGER NOT NULL,
+            PRIMARY KEY (user_id, guild_id)
+        )''',
+        'CREATE INDEX IF NOT EXISTS idx_guild_leaderboard_rank ON guild_leaderboard(guild_id, messages DESC)',
+        'CREATE INDEX IF NOT EXISTS idx_global_totals_rank ON global_user_totals(xp DESC)',
+        'CREATE INDEX IF NOT EXISTS idx_activity_daily_day ON message_activity_daily(day)',
+        'CREATE INDEX IF NOT EXISTS idx_user_achievements_user ON user_achievements(user_id, unlocked_at)',
+    ]
+
+    def __init__(self, db: StatsDB):
+        self.db = db
+
+    def create_tables(self):
+        """Create the rollup tables and backfill them once from existing data (DB worker thread)."""
+        conn = self.db.conn
+        for sql in self.SCHEMA:
+            conn.execute(sql)
+
+        # One-time backfill from the raw message log
+        if conn.execute('SELECT 1 FROM message_activity_daily LIMIT 1').fetchone() is None:
+            conn.execute('DELETE FROM message_activity_hourly')
+            conn.execute('''
+                INSERT INTO message_activity_hourly (user_id, guild_id, channel_id, hour, messages, words, attachments)
+                SELECT user_id, guild_id, channel_id, strftime('%Y-%m-%d %H:00', timestamp),
+                       COUNT(*), COALESCE(SUM(word_count), 0), COALESCE(SUM(has_attachment), 0)
+                FROM messages
+                WHERE timestamp >= ?
+                GROUP BY user_id, guild_id, channel_id, strftime('%Y-%m-%d %H:00', timestamp)
+            ''', (self._day_cutoff(self.HOURLY_RETENTION_DAYS),))
+            conn.execute('''
+                INSERT INTO message_activity_daily (guild_id, day, user_id, messages, words)
+                SELECT guild_id, date(timestamp), user_id, COUNT(*), COALESCE(SUM(word_count), 0)
+                FROM messages
+                GROUP BY guild_id, date(timestamp), user_id
+            ''')
+            self._rebuild_leaderboard(conn.cursor())
+
+        if conn.execute('SELECT 1 FROM global_user_totals LIMIT 1').fetchone() is None:
+            conn.execute('''
+                INSERT OR IGNORE INTO global_user_guilds (user_id, guild_id)
+                SELECT DISTINCT user_id, guild_id FROM messages
+                UNION SELECT DISTINCT user_id, guild_id FROM daily_stats
+            ''')
+            self._sync_totals(conn.cursor())
+            conn.execute('''
+                UPDATE global_user_totals SET words = (
+                    SELECT COALESCE(SUM(words), 0) FROM message_activity_daily d
+                    WHERE d.user_id = global_user_totals.user_id
+                )
+            ''')
+        conn.commit()
+
+    @staticmethod
+    def _day_cutoff(days: int) -> str:
+        return time.strftime('%Y-%m-%d', time.gmtime(time.time() - days * 86400))
+
+    def apply(self, cursor, hourly: Dict[Tuple[int, int, int, str], List[int]]):
+        """
+        Add one batch of hourly counters to all rollups (runs inside the batch
+        transaction, after ``global_user_levels`` has been updated for it).
+        """
+        daily: Dict[Tuple[int, str, int], List[int]] = {}
+        board: Dict[Tuple[int, int], List[int]] = {}
+        user_words: Dict[int, int] = {}
+        for (user_id, guild_id, _, hour), (messages, words, _) in hourly.items():
+            day_counters = daily.setdefault((guild_id, hour[:10], user_id), [0, 0])
+            day_counters[0] += messages
+            day_counters[1] += words
+            board_counters = board.setdefault((guild_id, user_id), [0, 0])
+            board_counters[0] += messages
+            board_counters[1] += words
+            user_words[user_id] = user_words.get(user_id, 0) + words
+
+        cursor.executemany('''
+            INSERT INTO message_activity_hourly (user_id, guild_id, channel_id, hour, messages, words, attachments)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(user_id, guild_id, channel_id, hour) DO UPDATE SET
+                messages = messages + excluded.messages,
+                words = words + excluded.words,
+                attachments = attachments + excluded.attachments
+        ''', [(*key, *counters) for key, counters in hourly.items()])
+
+        cursor.executemany('''
+            INSERT INTO message_activity_daily (guild_id, day, user_id, messages, words)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(guild_id, day, user_id) DO UPDATE SET
+                messages = messages + excluded.messages,
+                words = words + excluded.words
+        ''', [(*key, *counters) for key, counters in daily.items()])
+
+        cursor.executemany('''
+            INSERT INTO guild_leaderboard (guild_id, user_id, messages, words)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(guild_id, user_id) DO UPDATE SET
+                messages = messages + excluded.messages,
+                words = words + excluded.words
+        ''', [(*key, *counters) for key, counters in board.items()])
+
+        cursor.executemany(
+            'INSERT OR IGNORE INTO global_user_guilds (user_id, guild_id) VALUES (?, ?)',
+            [(user_id, guild_id) for guild_id, user_id in board]
+        )
+        self._sync_totals(cursor, list(user_words))
+        cursor.executemany(
+            'UPDATE global_user_totals SET words = words + ? WHERE user_id = ?',
+            [(words, user_id) for user_id, words in user_words.items()]
+        )
+
+    def _sync_totals(self, cursor, user_ids: Optional[List[int]] = None):
+        """Copy level, XP and activity totals from ``global_user_levels`` (all users if ``user_ids`` is None)."""
+        sql = '''
+            INSERT INTO global_user_totals
+                (user_id, level, xp, messages, voice_minutes, servers, daily_streak, best_streak, first_seen)
+            SELECT l.user_id, l.global_level, l.global_xp, l.total_messages, l.total_voice_minutes,
+                   (SELECT COUNT(*) FROM global_user_guilds g WHERE g.user_id = l.user_id),
+                   l.daily_streak, l.best_streak, l.first_seen
+            FROM global_user_levels l
+            WHERE {}
+            ON CONFLICT(user_id) DO UPDATE SET
+                level = excluded.level,
+                xp = excluded.xp,
+                messages = excluded.messages,
+                voice_minutes = excluded.voice_minutes,
+                servers = excluded.servers,
+                daily_streak = excluded.daily_streak,
+                best_streak = excluded.best_streak,
+                first_seen = excluded.first_seen
+        '''
+        if user_ids is None:
+            cursor.execute(sql.format('1'))
+        else:
+            cursor.executemany(sql.format('l.user_id = ?'), [(user_id,) for user_id in user_ids])
+
+    def refresh_user(self, user_id: int):
+        """Resync one user's global totals, e.g. after StatsDB booked voice XP (DB worker thread)."""
+        conn = self.db.conn
+        cursor = conn.cursor()
+        try:
+            self._sync_totals(cursor, [user_id])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def _rebuild_leaderboard(self, cursor):
+        cursor.execute('DELETE FROM guild_leaderboard')
+        cursor.execute('''
+            INSERT INTO guild_leaderboard (guild_id, user_id, messages, words)
+            SELECT guild_id, user_id, SUM(messages), SUM(words)
+            FROM message_activity_daily
+            WHERE day >= ?
+            GROUP BY guild_id, user_id
+        ''', (self._day_cutoff(self.LEADERBOARD_DAYS),))
+
+    def compact(self):
+        """Drop expired buckets and slide the leaderboard window (DB worker thread)."""
+        conn = self.db.conn
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                'DELETE FROM message_activity_hourly WHERE hour < ?',
+                (self._day_cutoff(self.HOURLY_RETENTION_DAYS),)
+            )
+            cursor.execute(
+                'DELETE FROM message_activity_daily WHERE day < ?',
+                (self._day_cutoff(self.DAILY_RETENTION_DAYS),)
+            )
+            self._rebuild_leaderboard(cursor)
+            self._sync_totals(cursor)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def get_guild_leaderboard(self, guild_id: int, limit: int) -> List[Tuple[int, int, int]]:
+        """Top users of a guild as (user_id, messages, words)."""
+        return self.db.conn.execute('''
+            SELECT user_id, messages, words FROM guild_leaderboard
+            WHERE guild_id = ?
+            ORDER BY messages DESC
+            LIMIT ?
+        ''', (guild_id, limit)).fetchall()
+
+    def get_global_leaderboard(self, limit: int) -> List[Tuple[int, int, float, int, float]]:
+        """Top users by global XP as (user_id, level, xp, messages, voice_minutes)."""
+        return self.db.conn.execute('''
+            SELECT user_id, level, xp, messages, voice_minutes FROM global_user_totals
+            ORDER BY xp DESC
+            LIMIT ?
+        ''', (limit,)).fetchall()
+
+    def get_global_info(self, user_id: int) -> Optional[Dict]:
+        """Global level and totals of a user, same keys as ``StatsDB.get_global_user_info``."""
+        row = self.db.conn.execute('''
+            SELECT level, xp, messages, words, voice_minutes, servers, daily_streak, best_streak, first_seen
+            FROM global_user_totals WHERE user_id = ?
+        ''', (user_id,)).fetchone()
+        if row is None:
+            return None
+
+        level, xp, messages, words, voice_minutes, servers, streak, best_streak, first_seen = row
+        current_level_xp = self.db._xp_for_level(level)
+        return {
+            'level': level,
+            'xp': xp,
+            'xp_progress': xp - current_level_xp,
+            'xp_needed': self.db._xp_for_level(level + 1) - current_level_xp,
+            'total_messages': messages,
+            'total_words': words,
+            'total_voice_minutes': voice_minutes,
+            'total_servers': servers,
+            'daily_streak': streak,
+            'best_streak': best_streak,
+            'first_seen': first_seen,
+        }
+
+    def has_global_stats(self, user_id: int) -> bool:
+        """Whether a user has any global activity."""
+        return self.db.conn.execute(
+            'SELECT 1 FROM global_user_totals WHERE user_id = ?', (user_id,)
+        ).fetchone() is not None
+
+    def get_message_count(self, user_id: int, guild_id: int, hours: int) -> int:
+        """Messages of a user in a guild within the last ``hours``."""
+        since = time.strftime('%Y-%m-%d %H:00', time.gmtime(time.time() - hours * 3600))
+        row = self.db.conn.execute('''
+            SELECT COALESCE(SUM(messages), 0) FROM message_activity_hourly
+            WHERE user_id = ? AND guild_id = ? AND hour >= ?
+        ''', (user_id, guild_id, since)).fetchone()
+        return row[0]
+
+    def get_voice_minutes(self, user_id: int, guild_id: int, hours: int) -> float:
+        """Voice minutes of a user in a guild within the last ``hours`` (sessions only, no message scan)."""
+        # Session start times are SQLite CURRENT_TIMESTAMP values (UTC)
+        since = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(time.time() - hours * 3600))
+        row = self.db.conn.execute('''
+            SELECT COALESCE(SUM(duration_minutes), 0) FROM voice_sessions
+            WHERE user_id = ? AND guild_id = ? AND start_time > ?
+        ''', (user_id, guild_id, since)).fetchone()
+        return row[0]
+
+    def get_achievements(self, user_id: int) -> List[Dict]:
+        """Unlocked achievements of a user, oldest first."""
+        rows = self.db.conn.execute('''
+            SELECT achievement_name, description, icon, unlocked_at FROM user_achievements
+            WHERE user_id = ?
+            ORDER BY unlocked_at
+        ''', (user_id,)).fetchall()
+        return [
+            {'name': name, 'description': description, 'icon': icon, 'unlocked_at': unlocked_at}
+            for name, description, icon, unlocked_at in rows
+        ]
+
+
+class MessageIngestPipeline:
+    """
+    Buffered message ingestion for the stats database.
+
+    ``on_message`` only enqueues a small tuple. A background flusher writes
+    the queued messages in one transaction: raw rows via ``executemany``,
+    daily stats and global XP aggregated per user, and the
+    :class:`StatsRollups` counters.
+
+    When the queue is full, new messages are not stored as raw rows any
+    more but folded straight into the hourly counters, so leaderboards and
+    totals stay correct while the raw log is thinned out.
+    """
+
+    BATCH_SIZE = 500        # Flush early once this many messages are queued
+    FLUSH_INTERVAL = 5.0    # Seconds between regular flushes
+    MAX_QUEUE = 20000       # Above this, messages are only aggregated
+
+    def __init__(self, db: StatsDB, executor, rollups: StatsRollups):
+        self.db = db
+        self.executor = executor
+        self.rollups = rollups
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=self.MAX_QUEUE)
+        # (user_id, guild_id, channel_id, hour) -> [messages, words, attachments] for overflowed messages
+        self._overflow: Dict[Tuple[int, int, int, str], List[int]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self.metrics = {'queued': 0, 'aggregated': 0, 'written': 0, 'batches': 0, 'errors': 0}
+
+    def submit(self, user_id: int, guild_id: int, channel_id: int, message_id: int,
+               word_count: int, has_attachment: bool, message_type: str):
+        """Queue a message without touching the database."""
+        entry = (user_id, guild_id, channel_id, message_id, word_count, has_attachment, message_type, time.time())
+        try:
+            self.queue.put_nowait(entry)
+            self.metrics['queued'] += 1
+        except asyncio.QueueFull:
+            # Backpressure: keep the counters, drop the raw row
+            key = (user_id, guild_id, channel_id, self._hour_bucket(entry[7]))
+            counters = self._overflow.setdefault(key, [0, 0, 0])
+            counters[0] += 1
+            counters[1] += word_count
+            counters[2] += int(has_attachment)
+            self.metrics['aggregated'] += 1
+
+        # Flush early instead of waiting for the next interval
+        if self.queue.qsize() >= self.BATCH_SIZE and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_logged())
+
+    async def _flush_logged(self):
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing message batch: {e}")
+
+    def _take_batch(self) -> Tuple[list, dict]:
+        rows = []
+        while len(rows) < self.BATCH_SIZE * 4:
+            try:
+                rows.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        overflow, self._overflow = self._overflow, {}
+        return rows, overflow
+
+    async def flush(self):
+        """Write all queued messages in one transaction."""
+        while True:
+            rows, overflow = self._take_batch()
+            if not rows and not overflow:
+                return
+
+            # StatsDB shares one connection; its own methods hold this lock
+            async with self.db.lock:
+                try:
+                    level_ups = await self.executor.write(self.db.db_file, self._write_batch, rows, overflow)
+                except Exception:
+                    self.metrics['errors'] += 1
+                    raise
+                for user_id, new_level in level_ups:
+                    await self.db._check_level_achievements(user_id, new_level)
+                if level_ups:
+                    self.db.conn.commit()
+
+            if len(rows) < self.BATCH_SIZE * 4:
+                return
+
+    def flush_sync(self):
+        """
+        Blocking flush used on unload, when no flush can be awaited any more.
+
+        Batches go through the same serial writer as ``flush()``, so they run
+        after a batch that is still in flight instead of sharing the
+        connection with it. Returns only once the writer is idle, so the
+        connection can be closed afterwards.
+
+        Level-up achievements are skipped here: ``StatsDB._check_level_achievements``
+        is a coroutine on the event loop. The XP and level themselves are
+        written, and since the check awards every milestone up to the new
+        level, the user's next level-up catches up on anything missed.
+        """
+        while True:
+            rows, overflow = self._take_batch()
+            if not rows and not overflow:
+                # Barrier: also waits for an in-flight batch when nothing is left to write
+                self.executor.write_sync(self.db.db_file, lambda: None)
+                return
+            self.executor.write_sync(self.db.db_file, self._write_batch, rows, overflow)
+
+    @staticmethod
+    def _hour_bucket(timestamp: float) -> str:
+        return time.strftime('%Y-%m-%d %H:00', time.gmtime(timestamp))
+
+    @staticmethod
+    def _message_xp(word_count: int) -> float:
+        # Same formula as StatsDB._update_global_xp
+        return 1 + min(word_count * 0.1, 5)
+
+    def _write_batch(self, rows: list, overflow: dict) -> List[Tuple[int, int]]:
+        """Runs in the DB worker thread. Returns (user_id, new_level) for level-ups."""
+        hourly = {key: list(counters) for key, counters in overflow.items()}
+        daily: Dict[Tuple[int, int, date], int] = {}
+        # user_id -> [messages, xp]
+        global_gain: Dict[int, List[float]] = {}
+
+        for user_id, guild_id, channel_id, _, word_count, has_attachment, _, ts in rows:
+            key = (user_id, guild_id, channel_id, self._hour_bucket(ts))
+            counters = hourly.setdefault(key, [0, 0, 0])
+            counters[0] += 1
+            counters[1] += word_count
+            counters[2] += int(has_attachment)
+
+            day_key = (user_id, guild_id, date.fromtimestamp(ts))
+            daily[day_key] = daily.get(day_key, 0) + 1
+
+            gain = global_gain.setdefault(user_id, [0, 0.0])
+            gain[0] += 1
+            gain[1] += self._message_xp(word_count)
+
+        today = date.today()
+        for (user_id, guild_id, _, _), (messages, words, _) in overflow.items():
+            day_key = (user_id, guild_id, today)
+            daily[day_key] = daily.get(day_key, 0) + messages
+            gain = global_gain.setdefault(user_id, [0, 0.0])
+            gain[0] += messages
+            gain[1] += messages * self._message_xp(words / messages)
+
+        cursor = self.db.conn.cursor()
+        try:
+            cursor.executemany('''
+                INSERT INTO messages (user_id, guild_id, channel_id, message_id, timestamp, word_count, has_attachment, message_type)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (user_id, guild_id, channel_id, message_id,
+                 time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(ts)), word_count, has_attachment, message_type)
+                for user_id, guild_id, channel_id, message_id, word_count, has_attachment, message_type, ts in rows
+            ])
+
+            cursor.executemany('''
+                INSERT INTO daily_stats (user_id, guild_id, date, messages_count)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(user_id, guild_id, date) DO UPDATE SET
+                    messages_count = messages_count + excluded.messages_count
+            ''', [(*key, count) for key, count in daily.items()])
+
+            level_ups = self._apply_global_xp(cursor, global_gain, today)
+            # After the XP update, so the global totals pick up the new levels
+            self.rollups.apply(cursor, hourly)
+            self.db.conn.commit()
+        except Exception:
+            self.db.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+        self.metrics['written'] += len(rows)
+        self.metrics['batches'] += 1
+        return level_ups
+
+    def _apply_global_xp(self, cursor, global_gain: Dict[int, List[float]], today: date) -> List[Tuple[int, int]]:
+        """Batched version of StatsDB._update_global_xp, one row update per user."""
+        level_ups = []
+        updates = []
+        inserts = []
+
+        for user_id, (messages, xp_gain) in global_gain.items():
+            cursor.execute('''
+                SELECT global_level, global_xp, total_messages, last_daily_activity, daily_streak
+                FROM global_user_levels WHERE user_id = ?
+            ''', (user_id,))
+            user_data = cursor.fetchone()
+
+            if not user_data:
+                inserts.append((user_id, self.db._calculate_level(xp_gain), xp_gain, messages, 0, 1, today, 1, 1))
+                continue
+
+            current_level, current_xp, total_msg, last_daily, daily_streak = user_data
+            if last_daily:
+                last_date = datetime.strptime(last_daily, '%Y-%m-%d').date()
+                if today == last_date + timedelta(days=1):
+                    daily_streak += 1
+                elif today != last_date:
+                    daily_streak = 1
+            else:
+                daily_streak = 1
+
+            new_xp = current_xp + xp_gain
+            new_level = self.db._calculate_level(new_xp)
+
+            cursor.execute('SELECT COUNT(DISTINCT guild_id) FROM daily_stats WHERE user_id = ?', (user_id,))
+            server_count = cursor.fetchone()[0] or 1
+
+            updates.append((new_level, new_xp, total_msg + messages, server_count, datetime.now(),
+                            today, daily_streak, daily_streak, user_id))
+            if new_level > current_level:
+                level_ups.append((user_id, new_level))
+
+        cursor.executemany('''
+            UPDATE global_user_levels
+            SET global_level = ?, global_xp = ?, total_messages = ?, total_servers = ?, last_activity = ?,
+                last_daily_activity = ?, daily_streak = ?, best_streak = MAX(best_streak, ?)
+            WHERE user_id = ?
+        ''', updates)
+        cursor.executemany('''
+            INSERT INTO global_user_levels
+            (user_id, global_level, global_xp, total_messages, total_voice_minutes, total_servers,
+             last_daily_activity, daily_streak, best_streak)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', inserts)
+        return level_ups
+
+
 class EnhancedStatsCog(commands.Cog):
     """
     Enhanced Discord Cog for tracking user statistics with global level system.
@@ -22,15 +576,27 @@ class EnhancedStatsCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.db = StatsDB()
-        self.cleanup_task.start()
+        self.executor = get_db_executor(bot)
+        self.rollups = StatsRollups(self.db)
+        self.ingest = MessageIngestPipeline(self.db, self.executor, self.rollups)
         logger.info("Enhanced StatsCog initialized")
 
+    async def cog_load(self):
+        """Create the rollup tables on the DB worker, then start the background tasks."""
+        # Messages arriving before this only wait in the ingest queue
+        await self._run_locked(self.rollups.create_tables)
+        self.cleanup_task.start()
+        self.flush_messages.start()
+
     stats = SlashCommandGroup("stats", "Statistiken")
     gb = stats.create_subgroup("global")
 
     def cog_unload(self):
         """Called when the cog is unloaded."""
         self.cleanup_task.cancel()
+        self.flush_messages.cancel()
+        # Write whatever is still queued (after any in-flight batch) before closing the connection
+        self.ingest.flush_sync()
         self.db.close()
         logger.info("Enhanced StatsCog unloaded")
 
@@ -38,6 +604,23 @@ class EnhancedStatsCog(commands.Cog):
     async def cleanup_task(self):
         """Daily cleanup of old data."""
         await self.db.cleanup_old_data(days=90)
+        try:
+            await self._run_locked(self.rollups.compact)
+        except Exception as e:
+            logger.error(f"Error compacting stats rollups: {e}")
+
+    async def _run_locked(self, func, *args):
+        """Run a blocking call on the shared StatsDB connection without blocking the event loop."""
+        async with self.db.lock:
+            return await self.executor.write(self.db.db_file, func, *args)
+
+    @tasks.loop(seconds=MessageIngestPipeline.FLUSH_INTERVAL)
+    async def flush_messages(self):
+        """Write queued messages to the database."""
+        try:
+            await self.ingest.flush()
+        except Exception as e:
+            logger.error(f"Error flushing message batch: {e}")
 
     @cleanup_task.before_loop
     async def before_cleanup(self):
@@ -62,6 +645,7 @@ class EnhancedStatsCog(commands.Cog):
             # User left a voice channel
             if before.channel and not after.channel:
                 await self.db.end_voice_session(user_id, before.channel.id)
+                await self._run_locked(self.rollups.refresh_user, user_id)
                 logger.debug(f"User {member.display_name} left voice channel {before.channel.name}")
 
             # User joined a voice channel
@@ -73,6 +657,7 @@ class EnhancedStatsCog(commands.Cog):
             elif before.channel and after.channel and before.channel.id != after.channel.id:
                 await self.db.end_voice_session(user_id, before.channel.id)
                 await self.db.start_voice_session(user_id, guild_id, after.channel.id)
+                await self._run_locked(self.rollups.refresh_user, user_id)
                 logger.debug(f"User {member.display_name} switched from {before.channel.name} to {after.channel.name}")
 
         except Exception as e:
@@ -97,7 +682,7 @@ class EnhancedStatsCog(commands.Cog):
             elif message.stickers:
                 message_type = 'sticker'
 
-            await self.db.log_message(
+            self.ingest.submit(
                 user_id=message.author.id,
                 guild_id=message.guild.id,
                 channel_id=message.channel.id,
@@ -107,8 +692,6 @@ class EnhancedStatsCog(commands.Cog):
                 message_type=message_type
             )
 
-            logger.debug(f"Logged enhanced message {message.id} from {message.author.display_name}")
-
         except Exception as e:
             logger.error(f"Error logging enhanced message from {message.author.display_name}: {e}")
 
@@ -145,13 +728,16 @@ class EnhancedStatsCog(commands.Cog):
 
             hours, period_name = time_periods[zeitraum]
 
-            # Get regular stats
-            message_count, voice_minutes = await self.db.get_user_stats(
-                target_user.id, hours, ctx.guild.id
+            # Get regular stats (messages from the hourly rollup, voice from the sessions)
+            voice_minutes = await self._run_locked(
+                self.rollups.get_voice_minutes, target_user.id, ctx.guild.id, hours
+            )
+            message_count = await self._run_locked(
+                self.rollups.get_message_count, target_user.id, ctx.guild.id, hours
             )
 
             # Get global user info
-            global_info = await self.db.get_global_user_info(target_user.id)
+            global_info = await self._run_locked(self.rollups.get_global_info, target_user.id)
 
             # Format voice time
             voice_hours = int(voice_minutes // 60)
@@ -227,7 +813,7 @@ class EnhancedStatsCog(commands.Cog):
 
         try:
             target_user = user if user else ctx.author
-            global_info = await self.db.get_global_user_info(target_user.id)
+            global_info = await self._run_locked(self.rollups.get_global_info, target_user.id)
 
             if not global_info:
                 embed = discord.Embed(
@@ -284,7 +870,7 @@ class EnhancedStatsCog(commands.Cog):
             )
 
             # Recent achievements
-            achievements = global_info['achievements'][-3:]  # Last 3 achievements
+            achievements = (await self._run_locked(self.rollups.get_achievements, target_user.id))[-3:]
             if achievements:
                 achievement_text = "\n".join(
                     [f"{ach.get('icon', '🏆')} {ach.get('name', 'Unknown')}" for ach in achievements])
@@ -336,11 +922,11 @@ class EnhancedStatsCog(commands.Cog):
 
         try:
             if typ == "global":
-                leaderboard_data = await self.db.get_leaderboard(limit)
+                leaderboard_data = await self._run_locked(self.rollups.get_global_leaderboard, limit)
                 title = "🌍 Globale Rangliste"
                 description = "Top User nach globalem Level & XP"
             else:
-                leaderboard_data = await self.db.get_leaderboard(limit, ctx.guild.id)
+                leaderboard_data = await self._run_locked(self.rollups.get_guild_leaderboard, ctx.guild.id, limit)
                 title = f"🏢 {ctx.guild.name} Rangliste"
                 description = "Top User der letzten 30 Tage"
 
@@ -426,9 +1012,9 @@ class EnhancedStatsCog(commands.Cog):
 
         try:
             target_user = user if user else ctx.author
-            global_info = await self.db.get_global_user_info(target_user.id)
+            has_stats = await self._run_locked(self.rollups.has_global_stats, target_user.id)
 
-            if not global_info:
+            if not has_stats:
                 embed = discord.Embed(
                     title="🏆 Keine Erfolge",
                     description=f"{'Du hast' if target_user == ctx.author else f'{target_user.display_name} hat'} noch keine Erfolge freigeschaltet.",
@@ -437,7 +1023,7 @@ class EnhancedStatsCog(commands.Cog):
                 await ctx.followup.send(embed=embed)
                 return
 
-            achievements = global_info.get('achievements', [])
+            achievements = await self._run_locked(self.rollups.get_achievements, target_user.id)
 
             if not achievements:
                 embed = discord.Embed(
@@ -10,6 +10,10 @@ from .bot_setup import BotSetup
 from .cog_manager import CogManager
 from .database import DatabaseManager
 from .dashboard import DashboardTask
+from .settings_cache import GuildSettingsCache, get_guild_cache
+from .db_executor import DatabaseExecutor, get_db_executor
+from .join_shield import JoinRaidShield, get_join_shield
+from .join_pipeline import JoinPipeline, JoinPlan, get_join_pipeline
 from .utils import print_logo, format_uptime, truncate_text
 
 __all__ = [
@@ -19,6 +23,15 @@ __all__ = [
     'CogManager',
     'DatabaseManager',
     'DashboardTask',
+    'GuildSettingsCache',
+    'get_guild_cache',
+    'DatabaseExecutor',
+    'get_db_executor',
+    'JoinRaidShield',
+    'get_join_shield',
+    'JoinPipeline',
+    'JoinPlan',
+    'get_join_pipeline',
     'print_logo',
     'format_uptime',
     'truncate_text'
@@ -72,5 +72,8 @@ class BotSetup:
             'max_concurrent_tasks': performance.get('max_concurrent_tasks', 10),
             'task_timeout': performance.get('task_timeout_seconds', 30),
             'memory_limit': performance.get('memory_limit_mb', 512),
-            'enable_gc_optimization': performance.get('enable_gc_optimization', True)
+            'enable_gc_optimization': performance.get('enable_gc_optimization', True),
+            'settings_cache_ttl': performance.get('settings_cache_ttl_seconds', 300),
+            'settings_cache_max_guilds': performance.get('settings_cache_max_guilds', 5000),
+            'db_executor_workers': performance.get('db_executor_workers', 4)
         }
\ No newline at end of file
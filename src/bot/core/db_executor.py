@@ -0,0 +1,270 @@
+"""
+ManagerX - Database Executor
+============================
+
+Führt synchrone SQLite-Aufrufe der Cogs in einem begrenzten Thread-Pool
+aus, damit der Event-Loop (und damit der Gateway-Heartbeat) nicht blockiert.
+Schreibzugriffe laufen pro Datenbank über eine eigene serielle Queue.
+Pfad: src/bot/core/db_executor.py
+"""
+
+import asyncio
+import functools
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from logger import logger, Category
+
+
+class _QueueMetrics:
+    """Zähler für eine Ausführungs-Queue (Lese-Pool oder Write-Queue)"""
+
+    __slots__ = ('pending', 'submitted', 'completed', 'errors', 'total_latency', 'max_latency')
+
+    def __init__(self):
+        self.pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            'queue_depth': self.pending,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'errors': self.errors,
+            'avg_latency_ms': (self.total_latency / self.completed * 1000) if self.completed else 0.0,
+            'max_latency_ms': self.max_latency * 1000,
+        }
+
+
+class DatabaseExecutor:
+    """
+    Bot-weiter Executor für blockierende Datenbank-Aufrufe.
+
+    - ``run()``: Lesezugriffe im geteilten Thread-Pool
+    - ``write()``: Schreibzugriffe seriell pro Datenbank (ein Worker je ``db_key``)
+    - ``execute()`` / ``fetchone()`` / ``fetchall()``: rohes SQL über eine
+      Verbindung pro Thread, statt bei jedem Aufruf neu zu verbinden
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mx-db")
+        self._writers: Dict[str, ThreadPoolExecutor] = {}
+        self._writers_lock = threading.Lock()
+
+        # Eine SQLite-Verbindung pro Thread und Datenbank-Pfad
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        self._metrics: Dict[str, _QueueMetrics] = {'read': _QueueMetrics()}
+        self._closed = False
+
+    # =========================================================================
+    # AUSFÜHRUNG
+    # =========================================================================
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Führt einen (lesenden) blockierenden Aufruf im Thread-Pool aus.
+
+        Args:
+            func: Synchrone Funktion, z.B. ``self.db.get_guild_config``
+            *args, **kwargs: Argumente für ``func``
+
+        Returns:
+            Any: Rückgabewert von ``func``
+        """
+        return await self._submit(self._pool, 'read', func, args, kwargs)
+
+    async def write(self, db_key: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Führt einen schreibenden Aufruf in der Write-Queue der Datenbank aus.
+
+        Alle Schreibzugriffe mit demselben ``db_key`` laufen nacheinander,
+        dadurch gibt es keine "database is locked" Konflikte zwischen Threads.
+
+        Args:
+            db_key: Name oder Pfad der Datenbank, z.B. ``"levelsystem"``
+            func: Synchrone Funktion, z.B. ``self.db.add_xp``
+            *args, **kwargs: Argumente für ``func``
+
+        Returns:
+            Any: Rückgabewert von ``func``
+        """
+        return await self._submit(self._get_writer(db_key), db_key, func, args, kwargs)
+
+    def write_sync(self, db_key: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Führt einen Schreibzugriff blockierend über die Write-Queue aus.
+
+        Für Shutdown-Pfade (z.B. ``cog_unload``), in denen nicht mehr
+        gewartet werden kann. Der Aufruf läuft erst, nachdem alle bereits
+        eingereihten Schreibzugriffe mit demselben ``db_key`` fertig sind,
+        und teilt sich deren Verbindung daher nie gleichzeitig.
+
+        Args:
+            db_key: Name oder Pfad der Datenbank
+            func: Synchrone Funktion
+            *args, **kwargs: Argumente für ``func``
+
+        Returns:
+            Any: Rückgabewert von ``func``
+        """
+        if self._closed:
+            # Write-Queues wurden beim Shutdown bereits geleert
+            return func(*args, **kwargs)
+        return self._get_writer(db_key).submit(func, *args, **kwargs).result()
+
+    async def execute(self, db_path: str, sql: str, params: Sequence = (), many: bool = False) -> int:
+        """
+        Führt ein schreibendes SQL-Statement über die Write-Queue aus.
+
+        Args:
+            db_path: Pfad zur SQLite-Datenbank (dient auch als Queue-Schlüssel)
+            sql: SQL-Statement
+            params: Parameter bzw. Liste von Parametern bei ``many=True``
+            many: ``executemany`` statt ``execute`` verwenden
+
+        Returns:
+            int: Anzahl geänderter Zeilen
+        """
+        return await self.write(db_path, self._execute_sync, db_path, sql, params, many)
+
+    async def fetchone(self, db_path: str, sql: str, params: Sequence = ()) -> Optional[tuple]:
+        """Liest eine einzelne Zeile im Thread-Pool"""
+        return await self.run(self._fetch_sync, db_path, sql, params, False)
+
+    async def fetchall(self, db_path: str, sql: str, params: Sequence = ()) -> List[tuple]:
+        """Liest alle Zeilen im Thread-Pool"""
+        return await self.run(self._fetch_sync, db_path, sql, params, True)
+
+    async def _submit(self, executor: ThreadPoolExecutor, queue_name: str,
+                      func: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        if self._closed:
+            raise RuntimeError("DatabaseExecutor wurde bereits beendet")
+
+        metrics = self._metrics.setdefault(queue_name, _QueueMetrics())
+        metrics.pending += 1
+        metrics.submitted += 1
+        started = time.perf_counter()
+        call = functools.partial(func, *args, **kwargs) if kwargs else functools.partial(func, *args)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, call)
+        except Exception:
+            metrics.errors += 1
+            raise
+        finally:
+            # Latenz inkl. Wartezeit in der Queue
+            latency = time.perf_counter() - started
+            metrics.pending -= 1
+            metrics.completed += 1
+            metrics.total_latency += latency
+            if latency > metrics.max_latency:
+                metrics.max_latency = latency
+
+    def _get_writer(self, db_key: str) -> ThreadPoolExecutor:
+        writer = self._writers.get(db_key)
+        if writer is None:
+            with self._writers_lock:
+                writer = self._writers.get(db_key)
+                if writer is None:
+                    writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mx-db-write")
+                    self._writers[db_key] = writer
+        return writer
+
+    # =========================================================================
+    # VERBINDUNGEN (laufen im Worker-Thread)
+    # =========================================================================
+
+    def _connection(self, db_path: str) -> sqlite3.Connection:
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = {}
+            self._local.connections = connections
+
+        conn = connections.get(db_path)
+        if conn is None:
+            # Wird nur von diesem Worker benutzt; check_same_thread=False erlaubt close() beim Shutdown
+            conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            connections[db_path] = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _execute_sync(self, db_path: str, sql: str, params: Sequence, many: bool) -> int:
+        conn = self._connection(db_path)
+        try:
+            cursor = conn.executemany(sql, params) if many else conn.execute(sql, params)
+            conn.commit()
+            return cursor.rowcount
+        except Exception:
+            conn.rollback()
+            raise
+
+    def _fetch_sync(self, db_path: str, sql: str, params: Sequence, fetch_all: bool):
+        cursor = self._connection(db_path).execute(sql, params)
+        return cursor.fetchall() if fetch_all else cursor.fetchone()
+
+    # =========================================================================
+    # STATUS & SHUTDOWN
+    # =========================================================================
+
+    def get_stats(self) -> dict:
+        """
+        Gibt Queue-Tiefe und Latenzen pro Queue zurück.
+
+        Returns:
+            dict: ``{"read": {...}, "<db_key>": {...}}``
+        """
+        return {name: metrics.as_dict() for name, metrics in self._metrics.items()}
+
+    def shutdown(self, wait: bool = True):
+        """
+        Beendet alle Worker und schließt die Verbindungen.
+
+        Args:
+            wait: Auf laufende Aufrufe warten
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        # Write-Queues zuerst leeren, damit keine Schreibzugriffe verloren gehen
+        for writer in list(self._writers.values()):
+            writer.shutdown(wait=wait)
+        self._pool.shutdown(wait=wait)
+
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+        logger.info(Category.DATABASE, "Database Executor beendet")
+
+
+def get_db_executor(bot) -> DatabaseExecutor:
+    """
+    Gibt den bot-weiten Database Executor zurück und legt ihn bei Bedarf an.
+
+    Args:
+        bot: Bot-Instanz
+
+    Returns:
+        DatabaseExecutor: Geteilte Executor-Instanz
+    """
+    executor: Optional[DatabaseExecutor] = getattr(bot, 'db_executor', None)
+    if executor is None:
+        executor = DatabaseExecutor()
+        bot.db_executor = executor
+        logger.info(Category.DATABASE, "Database Executor initialisiert")
+    return executor
@@ -0,0 +1,225 @@
+"""
+ManagerX - Member Join Pipeline
+===============================
+
+Bündelt die Reaktionen der Cogs auf ``on_member_join``. Cogs registrieren
+einen Contributor, der Rollen-IDs und Aktionen (Nachrichten, DMs) zu einem
+gemeinsamen ``JoinPlan`` beiträgt. Die Pipeline vergibt alle Rollen mit
+einem einzigen ``add_roles`` und führt die Aktionen parallel aus.
+Pfad: src/bot/core/join_pipeline.py
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from logger import logger, Category
+
+from .join_shield import get_join_shield
+
+JoinContributor = Callable[["JoinPlan"], Awaitable[None]]
+
+
+class JoinPlan:
+    """
+    Gesammelte Rollen und Aktionen für einen Beitritt.
+
+    Attributes:
+        member: Beigetretenes Mitglied
+        raiding: Server ist im Raid-Modus (Aktionen werden verworfen,
+            Rollen bis zum Raid-Ende zurückgestellt)
+    """
+
+    __slots__ = ('member', 'raiding', 'role_ids', 'reasons', 'actions')
+
+    def __init__(self, member, raiding: bool = False):
+        self.member = member
+        self.raiding = raiding
+        self.role_ids: Set[int] = set()
+        self.reasons: List[str] = []
+        self.actions: List[Awaitable] = []
+
+    def add_roles(self, role_ids, reason: str):
+        """
+        Merkt Rollen zur Vergabe vor.
+
+        Args:
+            role_ids: Iterable von Rollen-IDs
+            reason: Audit-Log Grund des Cogs
+        """
+        before = len(self.role_ids)
+        self.role_ids.update(role_id for role_id in role_ids if role_id)
+        if len(self.role_ids) > before and reason not in self.reasons:
+            self.reasons.append(reason)
+
+    def add_action(self, action: Awaitable):
+        """
+        Fügt eine Aktion hinzu (Coroutine, z.B. Welcome-Nachricht oder DM).
+
+        Im Raid-Modus wird sie nicht ausgeführt, sondern nur gezählt.
+        """
+        self.actions.append(action)
+
+
+class JoinPipeline:
+    """
+    Einziger ``on_member_join`` Listener für Rollen und Begrüßungen.
+
+    Ablauf pro Beitritt:
+
+    1. Beitritt beim ``JoinRaidShield`` zählen
+    2. Alle Contributors parallel aufrufen (jeder liest seine Einstellungen
+       genau einmal aus dem Cache)
+    3. Alle Rollen mit einem ``add_roles`` vergeben und gleichzeitig die
+       Aktionen ausführen - im Raid-Modus werden die Rollen zurückgestellt
+       und die Aktionen verworfen
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.shield = get_join_shield(bot)
+        self._contributors: Dict[str, JoinContributor] = {}
+
+        self._stats = {
+            'joins': 0,
+            'role_calls': 0,
+            'roles_granted': 0,
+            'actions': 0,
+            'errors': 0,
+        }
+
+    def register(self, name: str, contributor: JoinContributor):
+        """
+        Registriert einen Contributor (ersetzt einen gleichnamigen, z.B. nach Cog-Reload).
+
+        Args:
+            name: Eindeutiger Name, z.B. ``"autorole"``
+            contributor: Async-Funktion, die den ``JoinPlan`` ergänzt
+        """
+        self._contributors[name] = contributor
+
+    def unregister(self, name: str):
+        """Entfernt einen Contributor (z.B. in ``cog_unload``)"""
+        self._contributors.pop(name, None)
+
+    # =========================================================================
+    # ABLAUF
+    # =========================================================================
+
+    async def on_member_join(self, member):
+        if not self._contributors:
+            return
+
+        self._stats['joins'] += 1
+        plan = JoinPlan(member, self.shield.record(member))
+
+        names = list(self._contributors)
+        results = await asyncio.gather(
+            *(self._contributors[name](plan) for name in names),
+            return_exceptions=True
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                self._stats['errors'] += 1
+                logger.error(Category.DISCORD_BOT, f"Join-Contributor '{name}' fehlgeschlagen: {result}")
+
+        if plan.raiding:
+            for action in plan.actions:
+                # Coroutine nie gestartet, schließen um "never awaited" Warnungen zu vermeiden
+                if asyncio.iscoroutine(action):
+                    action.close()
+            self.shield.suppress(len(plan.actions))
+
+            if plan.role_ids:
+                role_ids, reason = frozenset(plan.role_ids), self._reason(plan)
+                self.shield.defer(member, lambda current: self.grant_roles(current, role_ids, reason))
+            return
+
+        tasks = list(plan.actions)
+        if plan.role_ids:
+            tasks.append(self.grant_roles(member, plan.role_ids, self._reason(plan)))
+        if not tasks:
+            return
+
+        self._stats['actions'] += len(plan.actions)
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                self._stats['errors'] += 1
+                logger.error(Category.DISCORD_BOT, f"Join-Aktion für {member} fehlgeschlagen: {result}")
+
+    async def grant_roles(self, member, role_ids, reason: str) -> int:
+        """
+        Vergibt Rollen mit einem einzigen API-Aufruf.
+
+        Übersprungen werden unbekannte, verwaltete, bereits vergebene und
+        Rollen oberhalb der Bot-Rolle.
+
+        Args:
+            member: Mitglied
+            role_ids: Rollen-IDs
+            reason: Audit-Log Grund
+
+        Returns:
+            int: Anzahl vergebener Rollen
+        """
+        guild = member.guild
+        me = guild.me
+        if not me.guild_permissions.manage_roles:
+            logger.warning(Category.DISCORD_BOT, f"Keine Berechtigung für Join-Rollen auf {guild.name}")
+            return 0
+
+        current = {role.id for role in member.roles}
+        roles = []
+        for role_id in role_ids:
+            role = guild.get_role(role_id)
+            if role is None or role.managed or role.id in current:
+                continue
+            if role >= me.top_role:
+                logger.warning(Category.DISCORD_BOT, f"Join-Rolle {role.name} ist höher als Bot-Rolle")
+                continue
+            roles.append(role)
+
+        if not roles:
+            return 0
+
+        self._stats['role_calls'] += 1
+        await member.add_roles(*roles, reason=reason)
+        self._stats['roles_granted'] += len(roles)
+        return len(roles)
+
+    @staticmethod
+    def _reason(plan: JoinPlan) -> str:
+        # Audit-Log Gründe sind auf 512 Zeichen begrenzt
+        return " | ".join(plan.reasons)[:512]
+
+    def get_stats(self) -> dict:
+        """
+        Gibt Pipeline-Statistiken zurück.
+
+        Returns:
+            dict: Beitritte, Rollen-Aufrufe, Aktionen und Fehler
+        """
+        return {
+            **self._stats,
+            'contributors': list(self._contributors),
+        }
+
+
+def get_join_pipeline(bot) -> JoinPipeline:
+    """
+    Gibt die bot-weite Join-Pipeline zurück und legt sie bei Bedarf an.
+
+    Beim Anlegen wird ``on_member_join`` einmalig am Bot registriert.
+
+    Args:
+        bot: Bot-Instanz
+
+    Returns:
+        JoinPipeline: Geteilte Pipeline-Instanz
+    """
+    pipeline: Optional[JoinPipeline] = getattr(bot, 'join_pipeline', None)
+    if pipeline is None:
+        pipeline = JoinPipeline(bot)
+        bot.join_pipeline = pipeline
+        bot.add_listener(pipeline.on_member_join, 'on_member_join')
+        logger.info(Category.DISCORD_BOT, "Member Join Pipeline initialisiert")
+    return pipeline
@@ -0,0 +1,369 @@
+"""
+ManagerX - Join Raid Shield
+===========================
+
+Bot-weiter Detektor für Join-Raids. Zählt Beitritte pro Server in einem
+gleitenden Zeitfenster (inkl. Histogramm des Konto-Alters) und schaltet
+den Server oberhalb der Schwelle in den Raid-Modus. Cogs fragen den Status
+ab, statt pro Beitritt REST-Aufrufe (Welcome, DMs, Rollen, Logs) zu machen.
+Pfad: src/bot/core/join_shield.py
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from logger import logger, Category
+
+# Discord Epoch (2015-01-01) in Millisekunden, für das Konto-Alter aus der Snowflake
+DISCORD_EPOCH_MS = 1420070400000
+
+# Obergrenzen der Konto-Alter-Buckets in Sekunden: < 1h, < 1d, < 7d, < 30d, älter
+AGE_BUCKETS = (3600, 86400, 7 * 86400, 30 * 86400)
+AGE_LABELS = ("< 1 Stunde", "< 1 Tag", "< 7 Tage", "< 30 Tage", "älter")
+# Buckets bis einschließlich diesem Index gelten als "frisches" Konto (< 7 Tage)
+FRESH_BUCKET = 2
+
+JoinListener = Callable[[Any, str, dict], Awaitable[None]]
+DeferredAction = Callable[[Any], Awaitable[None]]
+
+
+def account_age_bucket(user_id: int, now: Optional[float] = None) -> int:
+    """
+    Bestimmt den Konto-Alter-Bucket direkt aus der User-ID (Snowflake).
+
+    Args:
+        user_id: Discord User ID
+        now: Unix-Zeitstempel, Standard ``time.time()``
+
+    Returns:
+        int: Index in ``AGE_BUCKETS`` bzw. ``len(AGE_BUCKETS)`` für ältere Konten
+    """
+    created = ((user_id >> 22) + DISCORD_EPOCH_MS) / 1000
+    age = (time.time() if now is None else now) - created
+    for index, limit in enumerate(AGE_BUCKETS):
+        if age < limit:
+            return index
+    return len(AGE_BUCKETS)
+
+
+class _GuildJoinState:
+    """Join-Fenster und Raid-Status eines Servers"""
+
+    __slots__ = ('guild', 'joins', 'seen', 'histogram', 'raid_since', 'last_trigger',
+                 'raid_joins', 'raid_histogram', 'deferred', 'end_handle')
+
+    def __init__(self, guild):
+        self.guild = guild
+        # (zeitpunkt, member_id, bucket) im aktuellen Fenster
+        self.joins: Deque[Tuple[float, int, int]] = deque()
+        self.seen: Dict[int, float] = {}
+        self.histogram = [0] * (len(AGE_BUCKETS) + 1)
+        self.raid_since: Optional[float] = None
+        self.last_trigger = 0.0
+        self.raid_joins = 0
+        self.raid_histogram = [0] * (len(AGE_BUCKETS) + 1)
+        # member_id -> zurückgestellte Aktionen, werden nach dem Raid nachgeholt
+        self.deferred: Dict[int, List[DeferredAction]] = {}
+        self.end_handle: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def raiding(self) -> bool:
+        return self.raid_since is not None
+
+
+class JoinRaidShield:
+    """
+    Erkennt Join-Bursts und hält pro Server den Raid-Modus.
+
+    - ``record(member)``: Beitritt zählen, gibt ``True`` im Raid-Modus zurück.
+      Mehrere Cogs dürfen denselben Beitritt melden, er zählt nur einmal.
+    - ``defer(member, action)``: Aktion (z.B. Autorole) bis Raid-Ende zurückstellen
+    - ``add_listener(callback)``: ``callback(guild, "start" | "end", summary)``
+
+    Der Raid-Modus beginnt, sobald im Fenster ``threshold`` Beitritte liegen
+    oder mindestens ``threshold // 2`` davon überwiegend (``fresh_ratio``)
+    frische Konten sind. Er endet ``cooldown`` Sekunden nach dem letzten
+    Beitritt, der die Schwelle noch erreicht hat.
+    """
+
+    def __init__(self, threshold: int = 10, window: float = 10.0, cooldown: float = 60.0,
+                 fresh_ratio: float = 0.6, max_deferred: int = 1000, release_delay: float = 0.5):
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self.fresh_ratio = fresh_ratio
+        self.max_deferred = max_deferred
+        self.release_delay = release_delay
+
+        self._guilds: Dict[int, _GuildJoinState] = {}
+        self._listeners: List[JoinListener] = []
+        self._records = 0
+
+        self._stats = {
+            'joins': 0,
+            'raids': 0,
+            'suppressed': 0,
+            'deferred': 0,
+            'released': 0,
+        }
+
+    # =========================================================================
+    # ERFASSUNG
+    # =========================================================================
+
+    def record(self, member, now: Optional[float] = None) -> bool:
+        """
+        Zählt einen Beitritt und aktualisiert den Raid-Status des Servers.
+
+        Args:
+            member: Beigetretenes Mitglied
+            now: Monotoner Zeitstempel (für Tests)
+
+        Returns:
+            bool: ``True`` wenn der Server im Raid-Modus ist
+        """
+        now = time.monotonic() if now is None else now
+        guild = member.guild
+        state = self._guilds.get(guild.id)
+        if state is None:
+            state = _GuildJoinState(guild)
+            self._guilds[guild.id] = state
+        state.guild = guild
+
+        self._expire(state, now)
+        if member.id in state.seen:
+            # Bereits von einem anderen Cog gemeldet
+            return state.raiding
+
+        bucket = account_age_bucket(member.id)
+        state.joins.append((now, member.id, bucket))
+        state.seen[member.id] = now
+        state.histogram[bucket] += 1
+        self._stats['joins'] += 1
+        self._records += 1
+        if self._records % 256 == 0:
+            self._sweep(now)
+
+        if self._is_burst(state):
+            state.last_trigger = now
+            if not state.raiding:
+                # Das gesamte Fenster zählt bereits zum Raid
+                self._start_raid(state, now)
+                return True
+
+        if state.raiding:
+            state.raid_joins += 1
+            state.raid_histogram[bucket] += 1
+        return state.raiding
+
+    def in_raid(self, guild_id: int) -> bool:
+        """Prüft ohne zu zählen, ob ein Server im Raid-Modus ist"""
+        state = self._guilds.get(guild_id)
+        return state is not None and state.raiding
+
+    def suppress(self, count: int = 1):
+        """Zählt unterdrückte Aktionen (Welcome, DM, Log) für die Statistik"""
+        self._stats['suppressed'] += count
+
+    def defer(self, member, action: DeferredAction) -> bool:
+        """
+        Stellt eine Aktion für ein Mitglied bis zum Raid-Ende zurück.
+
+        Beim Nachholen wird das Mitglied neu aus dem Server gelesen; wer
+        inzwischen gebannt wurde oder gegangen ist, wird übersprungen.
+
+        Args:
+            member: Mitglied
+            action: Async-Funktion, die das aktuelle Mitglied erhält
+
+        Returns:
+            bool: ``False`` wenn kein Raid läuft oder die Warteschlange voll ist
+        """
+        state = self._guilds.get(member.guild.id)
+        if state is None or not state.raiding:
+            return False
+        if member.id not in state.deferred and len(state.deferred) >= self.max_deferred:
+            return False
+
+        state.deferred.setdefault(member.id, []).append(action)
+        self._stats['deferred'] += 1
+        return True
+
+    def _is_burst(self, state: _GuildJoinState) -> bool:
+        count = len(state.joins)
+        if count >= self.threshold:
+            return True
+        if count < max(2, self.threshold // 2):
+            return False
+        fresh = sum(state.histogram[:FRESH_BUCKET + 1])
+        return fresh / count >= self.fresh_ratio
+
+    def _expire(self, state: _GuildJoinState, now: float):
+        cutoff = now - self.window
+        joins = state.joins
+        while joins and joins[0][0] < cutoff:
+            _, member_id, bucket = joins.popleft()
+            state.histogram[bucket] -= 1
+            state.seen.pop(member_id, None)
+
+    def _sweep(self, now: float):
+        """Entfernt Server ohne Beitritte im Fenster und ohne laufenden Raid"""
+        for guild_id, state in list(self._guilds.items()):
+            self._expire(state, now)
+            if not state.joins and not state.raiding and not state.deferred:
+                del self._guilds[guild_id]
+
+    # =========================================================================
+    # RAID-MODUS
+    # =========================================================================
+
+    def _start_raid(self, state: _GuildJoinState, now: float):
+        state.raid_since = now
+        state.raid_joins = len(state.joins)
+        state.raid_histogram = list(state.histogram)
+        self._stats['raids'] += 1
+        logger.warning(Category.SECURITY, f"Join-Raid erkannt auf {state.guild.name} ({state.guild.id})")
+
+        self._schedule_end(state, self.cooldown)
+        self._notify(state.guild, "start", {
+            'joins': len(state.joins),
+            'window': self.window,
+            'histogram': self._labelled(state.histogram),
+        })
+
+    def _schedule_end(self, state: _GuildJoinState, delay: float):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Ohne Event-Loop (z.B. Tests) endet der Raid nur über end_raid()
+            return
+        state.end_handle = loop.call_later(delay, self._check_end, state.guild.id)
+
+    def _check_end(self, guild_id: int):
+        state = self._guilds.get(guild_id)
+        if state is None or not state.raiding:
+            return
+
+        remaining = state.last_trigger + self.cooldown - time.monotonic()
+        if remaining > 0:
+            # Während des Cooldowns kamen weitere Bursts, Timer verlängern
+            self._schedule_end(state, remaining)
+            return
+        self.end_raid(guild_id)
+
+    def end_raid(self, guild_id: int):
+        """Beendet den Raid-Modus, meldet die Zusammenfassung und holt Aktionen nach"""
+        state = self._guilds.get(guild_id)
+        if state is None or not state.raiding:
+            return
+
+        if state.end_handle is not None:
+            state.end_handle.cancel()
+            state.end_handle = None
+
+        summary = {
+            'joins': state.raid_joins,
+            'duration': time.monotonic() - state.raid_since,
+            'histogram': self._labelled(state.raid_histogram),
+            'deferred': len(state.deferred),
+        }
+        state.raid_since = None
+        deferred, state.deferred = state.deferred, {}
+
+        logger.info(
+            Category.SECURITY,
+            f"Join-Raid auf {state.guild.name} beendet: {summary['joins']} Beitritte, "
+            f"{summary['deferred']} zurückgestellte Mitglieder"
+        )
+        self._notify(state.guild, "end", summary)
+        if deferred:
+            asyncio.ensure_future(self._release(state.guild, deferred))
+
+    async def _release(self, guild, deferred: Dict[int, List[DeferredAction]]):
+        """Holt zurückgestellte Aktionen gedrosselt nach"""
+        for member_id, actions in deferred.items():
+            if self.in_raid(guild.id):
+                # Neuer Raid gestartet: Rest wieder zurückstellen
+                state = self._guilds[guild.id]
+                state.deferred.setdefault(member_id, []).extend(actions)
+                continue
+
+            member = guild.get_member(member_id)
+            if member is None:
+                continue
+
+            for action in actions:
+                try:
+                    await action(member)
+                    self._stats['released'] += 1
+                except Exception as e:
+                    logger.error(Category.SECURITY, f"Zurückgestellte Join-Aktion fehlgeschlagen: {e}")
+            await asyncio.sleep(self.release_delay)
+
+    # =========================================================================
+    # LISTENER
+    # =========================================================================
+
+    def add_listener(self, callback: JoinListener):
+        """Registriert ``callback(guild, event, summary)`` für Raid-Start und -Ende"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: JoinListener):
+        """Entfernt einen Listener (z.B. in ``cog_unload``)"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, guild, event: str, summary: dict):
+        for callback in list(self._listeners):
+            try:
+                asyncio.ensure_future(callback(guild, event, summary))
+            except Exception as e:
+                logger.error(Category.SECURITY, f"Join-Shield Listener Fehler: {e}")
+
+    @staticmethod
+    def _labelled(histogram: List[int]) -> Dict[str, int]:
+        return dict(zip(AGE_LABELS, histogram))
+
+    # =========================================================================
+    # STATUS
+    # =========================================================================
+
+    def remove_guild(self, guild_id: int):
+        """Verwirft den Zustand eines Servers (z.B. bei on_guild_remove)"""
+        state = self._guilds.pop(guild_id, None)
+        if state is not None and state.end_handle is not None:
+            state.end_handle.cancel()
+
+    def get_stats(self) -> dict:
+        """
+        Gibt Join- und Raid-Statistiken zurück.
+
+        Returns:
+            dict: Zähler sowie aktuell beobachtete Server und laufende Raids
+        """
+        return {
+            **self._stats,
+            'guilds': len(self._guilds),
+            'active_raids': sum(1 for state in self._guilds.values() if state.raiding),
+        }
+
+
+def get_join_shield(bot) -> JoinRaidShield:
+    """
+    Gibt den bot-weiten Join-Raid-Shield zurück und legt ihn bei Bedarf an.
+
+    Args:
+        bot: Bot-Instanz
+
+    Returns:
+        JoinRaidShield: Geteilte Shield-Instanz
+    """
+    shield: Optional[JoinRaidShield] = getattr(bot, 'join_shield', None)
+    if shield is None:
+        shield = JoinRaidShield()
+        bot.join_shield = shield
+        logger.info(Category.SECURITY, "Join Raid Shield initialisiert")
+    return shield
@@ -0,0 +1,216 @@
+"""
+ManagerX - Guild Settings Cache
+===============================
+
+Bot-weiter In-Memory-Cache für Server-Einstellungen der Hot-Paths
+(on_message Listener). Einträge werden lazy geladen, beim Schreiben
+invalidiert und über TTL + LRU begrenzt.
+Pfad: src/bot/core/settings_cache.py
+"""
+
+import asyncio
+import inspect
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from logger import logger, Category
+
+# Markiert "nicht im Cache" (None ist ein gültiger, cachebarer Wert)
+_MISSING = object()
+
+
+class GuildSettingsCache:
+    """
+    Per-Guild Cache für Einstellungen aus den verschiedenen Datenbanken.
+
+    Schlüssel sind Tupel, deren erstes Element der Namespace des Cogs ist,
+    z.B. ``("levelsystem", "config")`` oder ``("antispam", "whitelist", user_id)``.
+    So kann ein Cog gezielt nur seine eigenen Einträge invalidieren.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_guilds: int = 5000, max_keys_per_guild: int = 1024):
+        self.ttl = ttl
+        self.max_guilds = max_guilds
+        self.max_keys_per_guild = max_keys_per_guild
+
+        # guild_id -> OrderedDict[key -> (value, geladen_um)]
+        self._guilds: "OrderedDict[int, OrderedDict[Tuple, Tuple[Any, float]]]" = OrderedDict()
+        # Laufende Loader, damit gleichzeitige Misses nur eine DB-Abfrage auslösen
+        self._pending: Dict[Tuple[int, Tuple], asyncio.Future] = {}
+
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'invalidations': 0,
+        }
+
+    async def get(self, guild_id: int, key: Tuple[Hashable, ...], loader: Callable[[], Any]) -> Any:
+        """
+        Gibt einen gecachten Wert zurück oder lädt ihn über ``loader``.
+
+        Args:
+            guild_id: Discord Server ID
+            key: Cache-Schlüssel (Namespace zuerst)
+            loader: Funktion ohne Argumente, sync oder async, die den Wert aus der DB liest
+
+        Returns:
+            Any: Gecachter oder frisch geladener Wert
+        """
+        value = self.peek(guild_id, key)
+        if value is not _MISSING:
+            self._stats['hits'] += 1
+            return value
+
+        self._stats['misses'] += 1
+        pending_key = (guild_id, key)
+        pending = self._pending.get(pending_key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[pending_key] = future
+        try:
+            value = loader()
+            if inspect.isawaitable(value):
+                value = await value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Exception wurde an den Aufrufer weitergegeben, Future nicht als "unbeachtet" melden
+            future.exception()
+            raise
+        else:
+            # Während des Ladens invalidiert? Dann nicht mit veraltetem Wert befüllen
+            if self._pending.get(pending_key) is future:
+                self.set(guild_id, key, value)
+            future.set_result(value)
+            return value
+        finally:
+            if self._pending.get(pending_key) is future:
+                del self._pending[pending_key]
+
+    def peek(self, guild_id: int, key: Tuple[Hashable, ...]) -> Any:
+        """
+        Liest einen Wert ohne Loader und ohne Statistik.
+
+        Returns:
+            Any: Wert oder ``_MISSING`` wenn nicht vorhanden/abgelaufen
+        """
+        entries = self._guilds.get(guild_id)
+        if entries is None:
+            return _MISSING
+
+        entry = entries.get(key)
+        if entry is None:
+            return _MISSING
+
+        value, loaded_at = entry
+        if time.monotonic() - loaded_at > self.ttl:
+            del entries[key]
+            return _MISSING
+
+        self._guilds.move_to_end(guild_id)
+        entries.move_to_end(key)
+        return value
+
+    def set(self, guild_id: int, key: Tuple[Hashable, ...], value: Any):
+        """
+        Schreibt einen Wert direkt in den Cache.
+
+        Args:
+            guild_id: Discord Server ID
+            key: Cache-Schlüssel
+            value: Zu cachender Wert
+        """
+        entries = self._guilds.get(guild_id)
+        if entries is None:
+            entries = OrderedDict()
+            self._guilds[guild_id] = entries
+            while len(self._guilds) > self.max_guilds:
+                self._guilds.popitem(last=False)
+                self._stats['evictions'] += 1
+        else:
+            self._guilds.move_to_end(guild_id)
+
+        entries[key] = (value, time.monotonic())
+        entries.move_to_end(key)
+        while len(entries) > self.max_keys_per_guild:
+            entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def invalidate(self, guild_id: int, *key_prefix: Hashable):
+        """
+        Invalidiert Einträge eines Servers.
+
+        Ohne ``key_prefix`` werden alle Einträge des Servers verworfen,
+        sonst nur Schlüssel die mit dem Prefix beginnen, z.B.
+        ``invalidate(guild_id, "antispam")``.
+
+        Args:
+            guild_id: Discord Server ID
+            key_prefix: Namespace bzw. Schlüssel-Anfang
+        """
+        self._stats['invalidations'] += 1
+        prefix_len = len(key_prefix)
+
+        # Laufende Loader verwerfen, damit sie keinen veralteten Wert eintragen
+        for pending_key in list(self._pending):
+            pending_guild, pending_cache_key = pending_key
+            if pending_guild == guild_id and pending_cache_key[:prefix_len] == key_prefix:
+                del self._pending[pending_key]
+
+        if not key_prefix:
+            self._guilds.pop(guild_id, None)
+            return
+
+        entries = self._guilds.get(guild_id)
+        if entries is None:
+            return
+
+        for key in [k for k in entries if k[:prefix_len] == key_prefix]:
+            del entries[key]
+
+        if not entries:
+            del self._guilds[guild_id]
+
+    def clear(self):
+        """Leert den gesamten Cache"""
+        self._guilds.clear()
+        self._pending.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Gibt Cache-Statistiken zurück.
+
+        Returns:
+            dict: Treffer, Fehlschläge, Verdrängungen und aktuelle Größe
+        """
+        total = self._stats['hits'] + self._stats['misses']
+        return {
+            **self._stats,
+            'guilds': len(self._guilds),
+            'entries': sum(len(entries) for entries in self._guilds.values()),
+            'hit_rate': (self._stats['hits'] / total) if total else 0.0,
+        }
+
+
+def get_guild_cache(bot) -> GuildSettingsCache:
+    """
+    Gibt den bot-weiten Settings-Cache zurück und legt ihn bei Bedarf an.
+
+    Args:
+        bot: Bot-Instanz
+
+    Returns:
+        GuildSettingsCache: Geteilte Cache-Instanz
+    """
+    cache: Optional[GuildSettingsCache] = getattr(bot, 'guild_cache', None)
+    if cache is None:
+        cache = GuildSettingsCache()
+        bot.guild_cache = cache
+        logger.info(Category.DATABASE, "Guild Settings Cache initialisiert")
+    return cache